@@ -0,0 +1,132 @@
+"""
+Shared fixtures for the benchmark suite.
+
+The helper and launcher are not packages, so their folders are put on
+sys.path. Speech is replaced with a no-op so only parsing, formatting and
+scanning are measured, and the launcher benchmarks run against synthetic
+BeamNG user folders with a given number of .pc vehicle configs.
+"""
+
+import json
+import os
+import sys
+import zipfile
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "helper"))
+sys.path.insert(0, os.path.join(ROOT, "launcher"))
+
+import config  # noqa: E402
+import speech  # noqa: E402
+
+# Number of .pc files in the synthetic mod trees
+TREE_SIZES = (10, 1000, 10000)
+
+CONFIGS_PER_VEHICLE = 20
+
+# Zipped mods: .pc files per archive, and other files (textures, meshes) per .pc
+CONFIGS_PER_ARCHIVE = 50
+FILES_PER_CONFIG = 5
+
+
+def make_packet(msg_type, payload):
+    """Build a UDP packet like the mod does."""
+    payload = payload.encode("utf-8")
+    return b"BNBA" + bytes([msg_type, len(payload) >> 8, len(payload) & 0xFF]) + payload
+
+
+def make_game_settings(path):
+    """Write a game-settings.cs with the audio channels among other preferences."""
+    lines = [f'$pref::Video::Setting{i} = "{i}";\n' for i in range(150)]
+    lines += [f'$pref::SFX::AudioChannel{name} = "0.800000";\n'
+              for name in ("Master", "Music", "Effects", "Ui", "Gui", "Environment", "Ambience",
+                           "Messages", "Power", "Collision", "Surface", "Transmission",
+                           "ForcedInduction", "Suspension")]
+    path.parent.mkdir(parents=True)
+    path.write_text("".join(lines), encoding="utf-8")
+
+
+def make_user_folder(root, pc_files):
+    """
+    Create a BeamNG user folder (<root>/<version>/mods, settings) with
+    pc_files configs spread over vehicles in unpacked mods and the tuning folder.
+    """
+    version = root / "0.32"
+    mods = version / "mods"
+    config_data = json.dumps({"format": 2, "model": "pickup", "parts": {"pickup_engine": "pickup_engine_v8"}})
+    for n in range(pc_files):
+        vehicle = n // CONFIGS_PER_VEHICLE
+        if n % 10 == 9:
+            folder = mods / "temp_tuning" / "vehicles" / f"vehicle{vehicle}"
+        else:
+            folder = mods / "unpacked" / f"mod{vehicle // 5}" / "vehicles" / f"vehicle{vehicle}"
+        if n % CONFIGS_PER_VEHICLE in (0, 9):
+            folder.mkdir(parents=True, exist_ok=True)
+            (folder / "info.json").write_text("{}")
+        (folder / f"config{n}.pc").write_text(config_data)
+
+    make_game_settings(version / "settings" / "game-settings.cs")
+    (root / "0.31").mkdir()  # Older version folder without mods or settings
+    return root
+
+
+def make_zip_mods(folder, pc_files):
+    """Create zipped mods in folder holding pc_files configs between them."""
+    folder.mkdir(parents=True, exist_ok=True)
+    config_data = json.dumps({"format": 2, "model": "pickup", "parts": {"pickup_engine": "pickup_engine_v8"}})
+    for start in range(0, pc_files, CONFIGS_PER_ARCHIVE):
+        with zipfile.ZipFile(folder / f"mod{start // CONFIGS_PER_ARCHIVE}.zip", "w", zipfile.ZIP_DEFLATED) as zf:
+            for n in range(start, min(start + CONFIGS_PER_ARCHIVE, pc_files)):
+                vehicle = f"vehicles/vehicle{n // CONFIGS_PER_VEHICLE}"
+                zf.writestr(f"{vehicle}/config{n}.pc", config_data)
+                for i in range(FILES_PER_CONFIG):
+                    zf.writestr(f"{vehicle}/art/texture{n}_{i}.dds", b"")
+    return folder
+
+
+@pytest.fixture(autouse=True)
+def quiet(monkeypatch):
+    """Benchmark without speaking or debug output."""
+    monkeypatch.setattr(speech, "speak", lambda text, interrupt=None, voice=None: True)
+    monkeypatch.setattr(config, "DEBUG_MODE", False)
+
+
+@pytest.fixture(scope="session")
+def user_folders(tmp_path_factory):
+    """Synthetic BeamNG user folders by number of .pc files (created on first use)."""
+    folders = {}
+
+    def get(pc_files):
+        if pc_files not in folders:
+            folders[pc_files] = make_user_folder(tmp_path_factory.mktemp(f"beamng{pc_files}"), pc_files)
+        return folders[pc_files]
+    return get
+
+
+@pytest.fixture
+def make_launcher(monkeypatch, tmp_path, user_folders):
+    """
+    Create a silent launcher whose BeamNG user folder has a given number of
+    .pc files. Launchers are cleaned up (speech thread stopped, index
+    refresh finished) when the test ends.
+    """
+    import accessible_launcher
+    launchers = []
+
+    def make(pc_files):
+        monkeypatch.setattr(accessible_launcher, "BEAMNG_USER_PATH", user_folders(pc_files))
+        monkeypatch.setattr(accessible_launcher, "CONFIG_INDEX_FILE", tmp_path / f"config_index{pc_files}.json")
+        launcher = accessible_launcher.AccessibleLauncher()
+        launchers.append(launcher)
+        launcher.speak = lambda text, interrupt=True: None
+        launcher.tolk_ready.wait()
+        return launcher
+    yield make
+
+    for launcher in launchers:
+        launcher.cleanup()
+        index = launcher.get_config_index()
+        if index is not None and index.thread is not None:
+            index.thread.join()
@@ -0,0 +1,102 @@
+"""
+Benchmarks for the helper's packet hot path: UDPListener._process_packet
+for every message type and each _handle_* formatter on its own, and
+route guidance on a road network larger than west_coast_usa's.
+"""
+
+import itertools
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+import config  # noqa: E402
+import guidance  # noqa: E402
+import sessions  # noqa: E402
+import udp_listener  # noqa: E402
+from conftest import make_packet  # noqa: E402
+
+SNAPSHOT = "1|Main Menu|3|Freeroam|Garage|Options|Scenarios|Time Trials|Campaigns|Quit"
+
+# A 10 x 10 block street grid (about 1,100 road segments), as sent once per mission
+ROAD_GRAPH = guidance.grid_city_payload()
+
+# Message type -> (handler name, representative payload)
+PAYLOADS = {
+    config.MSG_TYPE_MENU: ("_handle_menu", "Freeroam|2|7"),
+    config.MSG_TYPE_VEHICLE: ("_handle_vehicle", "72.5|3200|3|0.1|asphalt"),
+    config.MSG_TYPE_ALERT: ("_handle_alert", "Vehicle damaged|high"),
+    config.MSG_TYPE_DIALOG: ("_handle_dialog", "Quit|Are you sure you want to quit?|Yes, No"),
+    config.MSG_TYPE_STATUS: ("_handle_status", "Loading complete"),
+    config.MSG_TYPE_MENU_ITEMS: ("_handle_menu_snapshot", SNAPSHOT),
+    config.MSG_TYPE_EARCON: ("_handle_earcon", "list_boundary"),
+    config.MSG_TYPE_HELLO: ("_handle_hello", "driver"),
+    config.MSG_TYPE_MENU_FOCUS: ("_handle_menu_focus", "4|1"),
+    config.MSG_TYPE_STATE: ("_handle_state", "traffic|12"),
+    config.MSG_TYPE_PHRASE: ("_handle_phrase", "\x0epickup\x1fchase"),
+    config.MSG_TYPE_ROAD_GRAPH: ("_handle_road_graph", ROAD_GRAPH),
+    config.MSG_TYPE_POSITION: ("_handle_position", "150.0|101.0|0.0|1.000|0.000|60"),
+}
+
+TYPE_IDS = {msg_type: handler[len("_handle_"):] for msg_type, (handler, _) in PAYLOADS.items()}
+
+
+@pytest.fixture
+def listener():
+    """A listener (not bound to a socket) with a session that has a menu open and a road graph."""
+    listener = udp_listener.UDPListener()
+    session = sessions.Session(None)
+    listener._handle_menu_snapshot(SNAPSHOT, session)
+    listener._handle_road_graph(ROAD_GRAPH, session)
+    return listener, session
+
+
+@pytest.mark.parametrize("msg_type", list(PAYLOADS), ids=TYPE_IDS.get)
+def test_process_packet(benchmark, listener, msg_type):
+    listener, session = listener
+    packet = make_packet(msg_type, PAYLOADS[msg_type][1])
+    listener._process_packet(packet, session)  # Steady state: payload and format caches warm
+    benchmark(listener._process_packet, packet, session)
+
+
+@pytest.mark.parametrize("msg_type", list(PAYLOADS), ids=TYPE_IDS.get)
+def test_handler(benchmark, listener, msg_type):
+    listener, session = listener
+    name, payload = PAYLOADS[msg_type]
+    getattr(listener, name)(payload, session)
+    benchmark(getattr(listener, name), payload, session)
+
+
+def test_process_packet_uncached(benchmark, listener):
+    """A packet never seen before (payload cache miss)."""
+    listener, session = listener
+    # More distinct packets than the payload cache holds, so every one is decoded
+    packets = itertools.cycle([make_packet(config.MSG_TYPE_STATUS, f"Checkpoint {n} of 100000")
+                               for n in range(100000)])
+    benchmark(lambda: listener._process_packet(next(packets), session))
+
+
+# A 100 x 100 block street grid with nodes every 20 m: about 100,000 road segments
+CITY_BLOCKS = 100
+
+
+@pytest.fixture(scope="module")
+def city_payload():
+    return guidance.grid_city_payload(blocks=CITY_BLOCKS)
+
+
+def test_road_graph_index(benchmark, city_payload):
+    graph = benchmark.pedantic(guidance.load_graph, args=(city_payload,), rounds=3)
+    assert graph.segment_count > 100000
+
+
+def test_guidance_update(benchmark, city_payload):
+    guide = guidance.Guide(guidance.load_graph(city_payload))
+    positions = itertools.cycle([(50.0 + (n * 7.3) % 9000, 5001.0) for n in range(5000)])
+
+    def update():
+        x, y = next(positions)
+        guide.update(x, y, 0.0, 1.0, 0.0, 80.0)
+    benchmark(update)
+    if benchmark.stats:  # None with --benchmark-disable
+        assert benchmark.stats.stats.median < 0.001, "position updates must stay sub-millisecond"
@@ -0,0 +1,66 @@
+"""
+Benchmarks for the launcher's file scanning and settings parsing on
+synthetic BeamNG user folders.
+"""
+
+import pytest
+
+pytest.importorskip("pytest_benchmark")
+
+from config_index import ConfigIndex  # noqa: E402
+from conftest import CONFIGS_PER_ARCHIVE, TREE_SIZES, make_zip_mods  # noqa: E402
+
+
+@pytest.mark.parametrize("pc_files", TREE_SIZES)
+def test_find_tunable_configs(benchmark, make_launcher, pc_files):
+    """Opening a config menu: revalidate the index and list it."""
+    launcher = make_launcher(pc_files)
+    launcher.find_tunable_configs()  # First run scans everything
+    configs = benchmark.pedantic(launcher.find_tunable_configs, rounds=20)
+    assert len(configs) == pc_files
+
+
+@pytest.mark.parametrize("pc_files", TREE_SIZES)
+def test_config_index_cold_scan(benchmark, make_launcher, tmp_path, pc_files):
+    """Building the index without a saved one (first run)."""
+    roots = make_launcher(pc_files).get_config_index().roots
+
+    def scan():
+        index = ConfigIndex(tmp_path / "cold_index.json", roots)
+        index.refresh()
+        return index.configs()
+    configs = benchmark.pedantic(scan, rounds=3)
+    assert len(configs) == pc_files
+
+
+@pytest.mark.parametrize("pc_files", TREE_SIZES)
+def test_config_index_archive_scan(benchmark, tmp_path, pc_files):
+    """Listing zipped mods without a saved index (central directories, in parallel)."""
+    mods = make_zip_mods(tmp_path / "mods", pc_files)
+
+    def scan():
+        index = ConfigIndex(tmp_path / "archive_index.json", [], [mods])
+        index.refresh()
+        return index.configs()
+    configs = benchmark.pedantic(scan, rounds=3)
+    assert len(configs) == pc_files
+
+
+def test_load_zipped_config(benchmark, make_launcher, tmp_path):
+    """Reading one config from a zipped mod."""
+    launcher = make_launcher(TREE_SIZES[0])
+    mods = make_zip_mods(tmp_path / "mods", CONFIGS_PER_ARCHIVE)
+    archive = mods / "mod0.zip"
+    config = benchmark(launcher.load_pc_config, archive, "vehicles/vehicle1/config25.pc")
+    assert config["model"] == "pickup"
+
+
+def test_load_game_settings(benchmark, make_launcher):
+    launcher = make_launcher(TREE_SIZES[0])
+    settings = benchmark(launcher.load_game_settings)
+    assert settings["AudioChannelMaster"] == 0.8
+
+
+def test_save_audio_setting(benchmark, make_launcher):
+    launcher = make_launcher(TREE_SIZES[0])
+    assert benchmark(launcher.save_audio_setting, "AudioChannelMusic", 0.5)
@@ -0,0 +1,259 @@
+"""
+BeamNG Blind Accessibility Helper - Utterance Audio Cache
+
+Renders SAPI utterances to WAV (PCM) audio once and keeps them in a
+size-bounded LRU cache, in memory and optionally on disk, so repeated
+phrases play back instantly instead of being synthesized again.
+
+The synthesizer is pluggable: any callable renderer(text, voice, rate)
+returning WAV bytes can be used, e.g. SilenceRenderer on systems without SAPI.
+"""
+
+import io
+import os
+import hashlib
+import threading
+import wave
+from collections import OrderedDict, deque
+
+import config
+
+
+def pcm_to_wav(pcm, sample_rate=22050, channels=1, sample_width=2):
+    """Wrap raw PCM samples in a WAV container."""
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(channels)
+        wav.setsampwidth(sample_width)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buf.getvalue()
+
+
+class SapiRenderer:
+    """Renders text to WAV bytes through the SAPI driver thread (see sapi_driver.py)."""
+
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __call__(self, text, voice, rate):
+        return self.driver.render(text, voice, rate)
+
+
+class SilenceRenderer:
+    """Stand-in renderer producing silence sized like real speech (for testing)."""
+
+    def __init__(self, sample_rate=22050):
+        self.sample_rate = sample_rate
+        self.calls = 0
+
+    def __call__(self, text, voice, rate):
+        self.calls += 1
+        words = max(1, len(text.split()))
+        seconds = words * 60.0 / (rate or config.SPEECH_RATE)
+        frames = int(seconds * self.sample_rate)
+        return pcm_to_wav(b"\x00\x00" * frames, self.sample_rate)
+
+
+class WinsoundPlayer:
+    """Plays WAV bytes through winsound (Windows only)."""
+
+    def __init__(self):
+        import winsound
+        self.winsound = winsound
+
+    def play(self, audio):
+        # winsound cannot play from memory asynchronously, so this blocks;
+        # PlaybackQueue calls it from its own thread
+        self.winsound.PlaySound(audio, self.winsound.SND_MEMORY | self.winsound.SND_NODEFAULT)
+
+    def stop(self):
+        self.winsound.PlaySound(None, 0)
+
+
+class PlaybackQueue:
+    """
+    Renders (through the cache) and plays utterances on a background
+    thread, so speaking from the cache returns immediately too.
+    """
+
+    def __init__(self, cache, player):
+        self.cache = cache
+        self.player = player
+        self.queue = deque()
+        self.generation = 0  # Bumped by stop() so an utterance rendered meanwhile is not played
+        self.condition = threading.Condition()
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+
+    def submit(self, text, voice=None, rate=None, interrupt=False):
+        """Queue an utterance (interrupt drops queued ones and stops playback)."""
+        if interrupt:
+            self.stop()
+        with self.condition:
+            self.queue.append((text, voice, rate))
+            self.condition.notify()
+
+    def stop(self):
+        """Drop queued utterances and stop playback."""
+        with self.condition:
+            self.queue.clear()
+            self.generation += 1
+        self.player.stop()
+
+    def backlog_seconds(self):
+        """Estimated seconds of speech waiting to be played."""
+        return sum(max(1, len(text.split())) * 60.0 / (rate or config.SPEECH_RATE)
+                   for text, _, rate in list(self.queue))
+
+    def close(self):
+        """Stop playback and end the thread."""
+        self.running = False
+        self.stop()
+        with self.condition:
+            self.condition.notify()
+        self.thread.join(timeout=2.0)
+
+    def _loop(self):
+        while self.running:
+            with self.condition:
+                while self.running and not self.queue:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                text, voice, rate = self.queue.popleft()
+                generation = self.generation
+
+            try:
+                audio = self.cache.render(text, voice, rate)
+                if audio and generation == self.generation:
+                    self.player.play(audio)
+            except Exception as e:
+                print(f"[AudioCache] Playback error: {e}")
+
+
+class UtteranceCache:
+    """Size-bounded LRU cache of rendered utterances, keyed by text+voice+rate."""
+
+    def __init__(self, renderer, max_bytes=None, cache_dir=None):
+        self.renderer = renderer
+        self.max_bytes = max_bytes if max_bytes is not None else config.AUDIO_CACHE_MAX_BYTES
+        self.cache_dir = cache_dir
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+        if self.cache_dir:
+            os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(text, voice, rate):
+        """Build the cache key for an utterance."""
+        raw = f"{voice or ''}\x00{rate or 0}\x00{text}".encode("utf-8")
+        return hashlib.sha1(raw).hexdigest()
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, key + ".wav")
+
+    def _store(self, key, audio):
+        """Insert into the memory LRU, evicting least recently used entries."""
+        if len(audio) > self.max_bytes:
+            return
+        with self.lock:
+            old = self.entries.pop(key, None)
+            if old is not None:
+                self.size -= len(old)
+            self.entries[key] = audio
+            self.size += len(audio)
+            while self.size > self.max_bytes and self.entries:
+                _, evicted = self.entries.popitem(last=False)
+                self.size -= len(evicted)
+
+    def get(self, text, voice=None, rate=None):
+        """Return cached audio for an utterance, or None."""
+        key = self.make_key(text, voice, rate)
+
+        with self.lock:
+            audio = self.entries.get(key)
+            if audio is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return audio
+
+        if self.cache_dir:
+            try:
+                with open(self._disk_path(key), "rb") as f:
+                    audio = f.read()
+            except OSError:
+                audio = None
+            if audio:
+                self._store(key, audio)
+                with self.lock:
+                    self.hits += 1
+                return audio
+
+        return None
+
+    def render(self, text, voice=None, rate=None):
+        """Return audio for an utterance, synthesizing it on a cache miss."""
+        audio = self.get(text, voice, rate)
+        if audio is not None:
+            return audio
+
+        with self.lock:
+            self.misses += 1
+
+        audio = self.renderer(text, voice, rate)
+        if not audio:
+            return None
+
+        key = self.make_key(text, voice, rate)
+        self._store(key, audio)
+
+        if self.cache_dir:
+            try:
+                with open(self._disk_path(key), "wb") as f:
+                    f.write(audio)
+            except OSError as e:
+                if config.DEBUG_MODE:
+                    print(f"[AudioCache] Could not write disk cache: {e}")
+
+        return audio
+
+    def contains(self, text, voice=None, rate=None):
+        """Check whether an utterance is cached in memory."""
+        with self.lock:
+            return self.make_key(text, voice, rate) in self.entries
+
+    def clear(self):
+        """Drop all in-memory entries."""
+        with self.lock:
+            self.entries.clear()
+            self.size = 0
+
+    def stats(self):
+        """Return cache statistics."""
+        with self.lock:
+            return {
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing utterance cache with stand-in renderer...")
+    renderer = SilenceRenderer()
+    cache = UtteranceCache(renderer, max_bytes=200 * 1024)
+
+    for _ in range(3):
+        for text in ("Play, 1 of 5", "Options, 2 of 5", "AI enabled, traffic mode"):
+            cache.render(text, "test-voice", 200)
+
+    print(f"Renderer calls: {renderer.calls}")
+    print(f"Stats: {cache.stats()}")
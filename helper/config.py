@@ -5,12 +5,37 @@ BeamNG Blind Accessibility Helper - Configuration
 # UDP Configuration
 UDP_IP = "127.0.0.1"
 UDP_PORT = 4445
-BUFFER_SIZE = 4096
+BUFFER_SIZE = 65535  # Largest UDP datagram, so packets are never truncated on receive
+PAYLOAD_CACHE_SIZE = 1024  # Distinct packets whose decoded payload is kept for reuse
+PAYLOAD_CACHE_MAX_PACKET = 512  # Larger packets (menu snapshots, dialogs) are decoded every time
+
+# TCP stream transport for large payloads (small events stay on UDP)
+TCP_ENABLED = True
+TCP_PORT = 4446
+TCP_MAX_FRAME = 16 * 1024 * 1024  # Frames claiming more than this are treated as corrupt
+
+# Sources - several game instances may send to one helper. Each sender gets
+# its own session, named by the session ID in its HELLO message.
+SESSION_IDLE_TIMEOUT = 300.0  # Seconds without packets before a session is evicted
+SESSION_EVICT_INTERVAL = 10.0  # Seconds between idle session checks
+SESSION_QUEUE_LIMIT = 64  # Packets queued per session before the oldest are dropped
+MENU_RESYNC_INTERVAL = 0.5  # Seconds between requests for a missed menu snapshot
+SESSION_OUTPUTS = {
+    # Output route per session ID, e.g.:
+    # "spectator": {"prefix": "Spectator: ", "interrupt": False, "voice": None, "mute": False},
+}
 
 # Screen Reader Configuration
 SCREEN_READER = "auto"  # "nvda", "jaws", "sapi", "auto"
 INTERRUPT_SPEECH = True
 SPEECH_RATE = 200  # Words per minute for SAPI fallback
+SCREEN_READER_RATE = 300  # Assumed screen reader words per minute (load shedding estimates only)
+SPEECH_STARTUP_BUFFER = 20  # Utterances kept while the speech backend is still initializing
+
+# SAPI utterance cache (pre-rendered audio for repeated phrases)
+SAPI_AUDIO_CACHE = True
+AUDIO_CACHE_MAX_BYTES = 32 * 1024 * 1024  # In-memory cache size limit
+AUDIO_CACHE_DIR = None  # Set to a folder path to also keep rendered audio on disk
 
 # Message Type Constants (must match Lua protocol)
 MSG_TYPE_MENU = 0x01
@@ -18,11 +43,99 @@ MSG_TYPE_VEHICLE = 0x02
 MSG_TYPE_ALERT = 0x03
 MSG_TYPE_DIALOG = 0x04
 MSG_TYPE_STATUS = 0x05
+MSG_TYPE_MENU_ITEMS = 0x06
+MSG_TYPE_EARCON = 0x07
+MSG_TYPE_HELLO = 0x08
+MSG_TYPE_MENU_FOCUS = 0x09
+MSG_TYPE_STATE = 0x0A
+MSG_TYPE_PHRASE = 0x0B
+MSG_TYPE_ROAD_GRAPH = 0x0C
+MSG_TYPE_POSITION = 0x0D
+MSG_TYPE_MENU_RESYNC = 0x0E  # Helper -> game: resend the menu snapshot
+MSG_FLAG_TRACE = 0x80  # Set on the type byte when the payload starts with a trace header
+
+# End-to-end tracing (see tracing.py; enable with --trace <file>)
+TRACE_MAX_EVENTS = 500000  # Oldest trace events are dropped beyond this
+
+# Pronunciation lexicon (spoken forms for internal IDs, units and abbreviations)
+LEXICON_ENABLED = True
+LEXICON_CATALOG_PATH = None  # Launcher file with the catalogs (None = ../launcher/accessible_launcher.py)
+LEXICON_CATALOGS = ("VEHICLES", "MAPS", "ENGINES")
+LEXICON_ENTRIES = {}  # Extra entries, e.g. {"etkk": "E T K K-Series"}
+
+# Load shedding when speech falls behind (see load_shedding.py)
+LOAD_SHEDDING_ENABLED = True
+LOAD_SHED_LAG_TARGET = 1.0            # Seconds behind that counts as pressure 1.0
+LOAD_SHED_THRESHOLDS = (1.0, 2.0, 4.0)  # Pressure entering terse / shedding / fast speech
+LOAD_SHED_EXIT_RATIO = 0.5            # Leave a level below this fraction of its threshold...
+LOAD_SHED_RECOVERY_TIME = 2.0         # ...sustained for this many seconds
+LOAD_SHED_RATE_BOOST = 1.4            # SAPI rate multiplier at the fast speech level
+LOAD_SHED_SAMPLE_INTERVAL = 0.1       # Seconds between speech backlog samples
+
+# Live world state (answers status queries without asking the game)
+WORLD_STATE_ALERT_HISTORY = 10  # Recent alerts kept for the "last alerts" hotkey
+
+# Global hotkeys (Windows only) answered from the helper's local state
+HOTKEYS_ENABLED = True
+HOTKEY_STATUS = "ctrl+alt+s"      # Speak vehicle, AI, traffic, level and menu status
+HOTKEY_ALERTS = "ctrl+alt+l"      # Repeat the most recent alerts
+HOTKEY_MENU_READ = "ctrl+alt+m"   # Read all items of the current menu
+HOTKEY_MENU_JUMP = ""  # Modifiers plus a letter: next menu item starting with it, e.g. "ctrl+alt+shift" ("" = off; registers 26 hotkeys)
+
+# Speculative pre-synthesis of neighbouring menu items (SAPI utterance cache only)
+PREFETCH_MENU_NEIGHBOURS = True
+PREFETCH_DISTANCE = 1  # Items on each side of the focused item to pre-render
+
+# Earcons - short non-verbal sounds (requires numpy and sounddevice)
+EARCONS_ENABLED = True
+EARCON_SINK = "sounddevice"  # "sounddevice", "null", or "file:<path.wav>"
+EARCON_VOLUME = 0.8
+EARCON_DIR = None  # Folder of <name>.wav files (22050 Hz, 16-bit) overriding built-in tones
 
 # Verbosity
 ANNOUNCE_VEHICLE_TELEMETRY = False  # Set True to hear speed/rpm updates
 TELEMETRY_INTERVAL = 2.0  # Seconds between telemetry announcements
 
+# Telemetry history store (main.py --telemetry, see telemetry_store.py; requires numpy)
+TELEMETRY_STORE_DIR = None       # Folder recordings are written to (None = off)
+TELEMETRY_CHUNK_ROWS = 65536     # Rows preallocated each time the column files grow
+TELEMETRY_WRITE_INTERVAL = 0.25  # Seconds between batched writes on the writer thread
+TELEMETRY_FLUSH_INTERVAL = 5.0   # Seconds between flushes of the files and row count to disk
+TELEMETRY_QUEUE_LIMIT = 20000    # Samples waiting for the writer (oldest dropped beyond this)
+TELEMETRY_MAX_GAP = 1.0          # Longest interval between samples counted by duration queries
+
+# Route guidance from the level's road graph (see guidance.py; requires numpy)
+GUIDANCE_ENABLED = True
+GUIDANCE_CELL_SIZE = 50.0         # Grid index cell size in meters
+GUIDANCE_SEARCH_RADIUS = 50.0     # Farthest road segment considered for a position
+GUIDANCE_MAX_HEIGHT = 6.0         # Segments further above/below are other levels (bridges)
+GUIDANCE_HEADING_PENALTY = 10.0   # Meters added to segments across the heading (junctions)
+GUIDANCE_OFF_ROAD_MARGIN = 5.0    # Meters beyond the road edge that count as off road
+GUIDANCE_MIN_SPEED = 5.0          # km/h below which nothing ahead is announced
+GUIDANCE_LEAD_TIME = 8.0          # Seconds of driving looked ahead...
+GUIDANCE_MIN_LOOKAHEAD = 60.0     # ...but at least this many meters...
+GUIDANCE_MAX_LOOKAHEAD = 400.0    # ...and at most this many
+GUIDANCE_MAX_STEPS = 200          # Road nodes followed ahead per update
+GUIDANCE_CURVE_ANGLE = 45.0       # Bend in degrees announced as a curve
+GUIDANCE_STRAIGHT_ANGLE = 30.0    # Junction exits within this angle are "straight"
+GUIDANCE_DRIFT_ANGLE = 25.0       # Heading this far off the road direction is announced
+
+# Garbage collector (see gc_control.py)
+GC_FREEZE_AFTER_STARTUP = True  # Exclude startup objects from collections (gc.freeze)
+GC_DEFER_TO_IDLE = True         # Raise thresholds while busy, collect while idle
+GC_DEFERRED_THRESHOLDS = (20000, 50, 100)  # Automatic thresholds while deferring
+GC_IDLE_INTERVAL = 5.0          # Seconds between idle collections
+
+# Profiling mode (main.py --profile, see profiler.py)
+PROFILE_INTERVAL = 0.005            # Seconds between stack samples
+PROFILE_MEMORY = False              # Also trace allocations (--profile-memory; slows every allocation)
+PROFILE_SNAPSHOT_INTERVAL = 30.0    # Seconds between tracemalloc snapshots
+PROFILE_TRACEMALLOC_FRAMES = 1      # Frames kept per allocation traceback (more costs more per allocation)
+PROFILE_TOP = 25                    # Entries per report section
+
+# Startup benchmark (main.py --startup-benchmark, see startup_bench.py)
+STARTUP_SPEECH_BUDGET = 1.0  # Seconds from process start to the first speech
+
 # Logging
 DEBUG_MODE = True
 LOG_FILE = "beamng_accessibility.log"
@@ -0,0 +1,324 @@
+"""
+BeamNG Blind Accessibility Helper - Earcon Engine
+
+Plays short non-verbal sounds (earcons) for frequent events such as menu
+wrap, list boundary, AI on/off, traffic spawned and surface changes.
+
+Earcons are preloaded into memory as NumPy buffers and overlaid by a
+block-based mixer running on its own thread, so they never block speech.
+The audio sink is pluggable:
+1. sounddevice output stream (real playback)
+2. WAV file sink (headless recording)
+3. Null sink (headless tests)
+"""
+
+import os
+import threading
+import wave
+
+import config
+
+# numpy is imported on first use (_load_numpy), not at module import: it is
+# the slowest import in the helper and is not needed before init()
+np = None
+
+SAMPLE_RATE = 22050
+BLOCK_SIZE = 512  # Frames mixed per block (~23 ms)
+
+# Built-in earcons: name -> list of (frequency Hz, duration s) tones
+EARCON_TONES = {
+    "menu_wrap": [(880, 0.05), (660, 0.05)],
+    "list_boundary": [(220, 0.08)],
+    "ai_on": [(523, 0.07), (784, 0.09)],
+    "ai_off": [(784, 0.07), (523, 0.09)],
+    "traffic_spawned": [(392, 0.06), (494, 0.06), (587, 0.08)],
+    "surface_change": [(330, 0.06)],
+    "surface_asphalt": [(440, 0.06)],
+    "surface_dirt": [(294, 0.08)],
+    "surface_gravel": [(262, 0.05), (262, 0.05)],
+    "surface_grass": [(349, 0.08)],
+    "surface_sand": [(247, 0.1)],
+    "surface_mud": [(196, 0.1)],
+    "surface_ice": [(1047, 0.06)],
+    "surface_snow": [(932, 0.08)],
+}
+
+
+def _load_numpy():
+    """Import numpy on first use. Returns False if it is not installed."""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            return False
+        np = numpy
+    return True
+
+
+def synthesize_tones(tones, sample_rate=SAMPLE_RATE, gain=0.4):
+    """Render a sequence of sine tones with short fades into a float32 buffer."""
+    parts = []
+    fade = int(0.005 * sample_rate)
+    for frequency, duration in tones:
+        frames = int(duration * sample_rate)
+        t = np.arange(frames, dtype=np.float32) / sample_rate
+        tone = np.sin(2.0 * np.pi * frequency * t).astype(np.float32) * gain
+        if frames > 2 * fade:
+            ramp = np.linspace(0.0, 1.0, fade, dtype=np.float32)
+            tone[:fade] *= ramp
+            tone[-fade:] *= ramp[::-1]
+        parts.append(tone)
+    return np.concatenate(parts) if parts else np.zeros(0, dtype=np.float32)
+
+
+def load_wav(path, sample_rate=SAMPLE_RATE):
+    """Load a mono/stereo 16-bit WAV file as a mono float32 buffer."""
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: only 16-bit WAV files are supported")
+        if wav.getframerate() != sample_rate:
+            raise ValueError(f"{path}: expected {sample_rate} Hz, got {wav.getframerate()} Hz")
+        data = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+        if wav.getnchannels() > 1:
+            data = data.reshape(-1, wav.getnchannels()).mean(axis=1)
+    return (data.astype(np.float32) / 32768.0)
+
+
+class NullSink:
+    """Discards audio (headless tests)."""
+
+    realtime = False
+
+    def __init__(self):
+        self.frames_written = 0
+
+    def write(self, block):
+        self.frames_written += len(block)
+
+    def close(self):
+        pass
+
+
+class WaveFileSink:
+    """Writes mixed audio to a 16-bit mono WAV file."""
+
+    realtime = False
+
+    def __init__(self, path, sample_rate=SAMPLE_RATE):
+        self.wav = wave.open(path, "wb")
+        self.wav.setnchannels(1)
+        self.wav.setsampwidth(2)
+        self.wav.setframerate(sample_rate)
+        self.frames_written = 0
+
+    def write(self, block):
+        self.wav.writeframes((block * 32767.0).astype(np.int16).tobytes())
+        self.frames_written += len(block)
+
+    def close(self):
+        self.wav.close()
+
+
+class SoundDeviceSink:
+    """Plays mixed audio through a sounddevice output stream."""
+
+    realtime = True
+
+    def __init__(self, sample_rate=SAMPLE_RATE, block_size=BLOCK_SIZE):
+        import sounddevice
+        self.stream = sounddevice.OutputStream(
+            samplerate=sample_rate, channels=1, dtype="float32",
+            blocksize=block_size, latency="low",
+        )
+        self.stream.start()
+
+    def write(self, block):
+        self.stream.write(block.reshape(-1, 1))
+
+    def close(self):
+        self.stream.stop()
+        self.stream.close()
+
+
+class Mixer:
+    """Block-based mixer overlaying any number of playing earcons."""
+
+    def __init__(self, sink, block_size=BLOCK_SIZE):
+        self.sink = sink
+        self.block_size = block_size
+        self.voices = []  # [buffer, position, gain]
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+        self.mix_buffer = np.zeros(block_size, dtype=np.float32)
+
+    def start(self):
+        """Start the mixer thread."""
+        self.running = True
+        self.thread = threading.Thread(target=self._mix_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the mixer thread and close the sink."""
+        with self.condition:
+            self.running = False
+            self.condition.notify()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+        self.sink.close()
+
+    def play(self, buffer, gain=1.0):
+        """Start playing a buffer (returns immediately)."""
+        with self.condition:
+            self.voices.append([buffer, 0, gain])
+            self.condition.notify()
+
+    def is_idle(self):
+        """Check whether nothing is playing."""
+        with self.condition:
+            return not self.voices
+
+    def mix_block(self):
+        """Mix the next block of all active voices (condition must be held)."""
+        out = self.mix_buffer
+        out.fill(0.0)
+        finished = False
+
+        for voice in self.voices:
+            buffer, position, gain = voice
+            chunk = buffer[position:position + self.block_size]
+            out[:len(chunk)] += chunk * gain
+            voice[1] = position + len(chunk)
+            if voice[1] >= len(buffer):
+                finished = True
+
+        if finished:
+            self.voices = [v for v in self.voices if v[1] < len(v[0])]
+
+        np.clip(out, -1.0, 1.0, out=out)
+        return out
+
+    def _mix_loop(self):
+        """Mix and write blocks while anything is playing."""
+        while True:
+            with self.condition:
+                while self.running and not self.voices:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                block = self.mix_block().copy()
+
+            try:
+                self.sink.write(block)
+            except Exception as e:
+                if config.DEBUG_MODE:
+                    print(f"[Earcons] Sink error: {e}")
+
+
+class EarconEngine:
+    """Preloaded earcon buffers plus the mixer that plays them."""
+
+    def __init__(self, sink, sound_dir=None):
+        self.buffers = {}
+        for name, tones in EARCON_TONES.items():
+            self.buffers[name] = synthesize_tones(tones)
+
+        # Custom sounds override the built-in tones ("<name>.wav")
+        if sound_dir and os.path.isdir(sound_dir):
+            for filename in os.listdir(sound_dir):
+                name, ext = os.path.splitext(filename)
+                if ext.lower() != ".wav":
+                    continue
+                try:
+                    self.buffers[name] = load_wav(os.path.join(sound_dir, filename))
+                except Exception as e:
+                    print(f"[Earcons] Could not load {filename}: {e}")
+
+        self.mixer = Mixer(sink)
+        self.mixer.start()
+
+    def play(self, name, gain=None):
+        """Play an earcon by name. Returns False if it is unknown."""
+        buffer = self.buffers.get(name)
+        if buffer is None:
+            return False
+        self.mixer.play(buffer, config.EARCON_VOLUME if gain is None else gain)
+        return True
+
+    def has(self, name):
+        """Check whether an earcon exists."""
+        return name in self.buffers
+
+    def close(self):
+        """Stop playback."""
+        self.mixer.stop()
+
+
+# Singleton engine
+_engine = None
+
+
+def _create_sink(kind):
+    """Create the configured audio sink."""
+    if kind == "null":
+        return NullSink()
+    if kind.startswith("file:"):
+        return WaveFileSink(kind[len("file:"):])
+    return SoundDeviceSink()
+
+
+def init(sink=None):
+    """Initialize the earcon engine."""
+    global _engine
+
+    if not _load_numpy():
+        print("[Earcons] numpy not available, earcons disabled")
+        return False
+
+    try:
+        _engine = EarconEngine(sink or _create_sink(config.EARCON_SINK), config.EARCON_DIR)
+        print(f"[Earcons] Initialized with {len(_engine.buffers)} earcons")
+        return True
+    except ImportError:
+        print("[Earcons] sounddevice not available, earcons disabled")
+    except Exception as e:
+        print(f"[Earcons] Initialization error: {e}")
+
+    _engine = None
+    return False
+
+
+def play(name):
+    """Play an earcon if the engine is running."""
+    if _engine is None:
+        return False
+    return _engine.play(name)
+
+
+def has(name):
+    """Check whether an earcon exists."""
+    return _engine is not None and _engine.has(name)
+
+
+def cleanup():
+    """Stop the earcon engine."""
+    global _engine
+
+    if _engine:
+        _engine.close()
+        _engine = None
+        print("[Earcons] Stopped")
+
+
+# Test function
+if __name__ == "__main__":
+    import time
+    print("Testing earcon engine...")
+    if init():
+        for earcon_name in ("menu_wrap", "ai_on", "traffic_spawned", "surface_dirt"):
+            print(f"Playing {earcon_name}")
+            play(earcon_name)
+            time.sleep(0.4)
+        cleanup()
@@ -0,0 +1,81 @@
+"""
+BeamNG Blind Accessibility Helper - Garbage Collector Control
+
+Python's cyclic garbage collector runs whenever enough container objects
+have been allocated, so it can pause the receive or worker threads at any
+moment, and every full collection walks all long-lived objects (modules,
+launcher catalogs, the lexicon trie, caches).
+
+After startup everything allocated so far is moved to the permanent
+generation with gc.freeze(), so collections no longer scan it. With
+config.GC_DEFER_TO_IDLE the automatic thresholds are raised, so
+collections are rare while packets are flowing, and the young generations
+are collected when the listener has been idle instead.
+"""
+
+import gc
+import time
+
+import config
+
+_saved_threshold = None
+_last_idle_collect = 0.0
+
+
+def freeze():
+    """Collect once, then exclude all surviving startup objects from future collections."""
+    gc.collect()
+    gc.freeze()
+    if config.DEBUG_MODE:
+        print(f"[GC] Froze {gc.get_freeze_count()} startup objects")
+
+
+def defer_to_idle():
+    """Raise the automatic collection thresholds; collect_idle() does the routine work."""
+    global _saved_threshold
+    if _saved_threshold is None:
+        _saved_threshold = gc.get_threshold()
+    gc.set_threshold(*config.GC_DEFERRED_THRESHOLDS)
+
+
+def collect_idle(now=None):
+    """Collect the young generations while idle (at most every GC_IDLE_INTERVAL)."""
+    global _last_idle_collect
+    if _saved_threshold is None:
+        return 0
+
+    now = now or time.time()
+    if now - _last_idle_collect < config.GC_IDLE_INTERVAL:
+        return 0
+    _last_idle_collect = now
+    return gc.collect(1)
+
+
+def init():
+    """Apply the configured GC policy (call once startup is complete)."""
+    if config.GC_FREEZE_AFTER_STARTUP:
+        freeze()
+    if config.GC_DEFER_TO_IDLE:
+        defer_to_idle()
+
+
+def cleanup():
+    """Restore the default GC behaviour."""
+    global _saved_threshold
+    if _saved_threshold is not None:
+        gc.set_threshold(*_saved_threshold)
+        _saved_threshold = None
+    gc.unfreeze()
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing GC control...")
+    config.DEBUG_MODE = True
+    init()
+    print(f"Thresholds: {gc.get_threshold()}, frozen: {gc.get_freeze_count()}")
+    junk = [[i] for i in range(10000)]
+    del junk
+    print(f"Idle collection found {collect_idle()} unreachable objects, counts {gc.get_count()}")
+    cleanup()
+    print(f"Restored thresholds: {gc.get_threshold()}")
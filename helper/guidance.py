@@ -0,0 +1,415 @@
+"""
+BeamNG Blind Accessibility Helper - Route Guidance
+
+The mod sends the level's road graph once per mission (ROAD_GRAPH) and
+then the player's position and heading a few times per second
+(POSITION). The road segments are indexed in a uniform grid, so each
+position update only tests the segments in the surrounding cells, with
+one vectorized point-to-segment distance over all of them.
+
+From the nearest segment and the driving direction the road is followed
+ahead through plain road nodes to the next feature, which is announced
+once: a junction (with the ways it offers), a curve, or the end of the
+road. Leaving the road, returning to it and driving against a one-way
+road are announced as well.
+
+Payload formats:
+    ROAD_GRAPH  level \\x1d x,y,z,radius;... \\x1d a,b,oneWay;...
+                (edges refer to nodes by position; oneWay 0 = two-way,
+                1 = traffic flows a to b, 2 = b to a)
+    POSITION    x|y|z|dirX|dirY|km/h
+"""
+
+import math
+import time
+
+import config
+
+# numpy is imported when the first road graph arrives, not at module import
+np = None
+
+GRAPH_SEPARATOR = "\x1d"
+KEY_OFFSET = 1 << 20  # Grid cell coordinates are shifted to be non-negative in the key
+KEY_STRIDE = 1 << 21
+
+
+def _load_numpy():
+    """Import numpy on first use. Returns False if it is not installed."""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            return False
+        np = numpy
+    return True
+
+
+def _turn_angle(ax, ay, bx, by):
+    """Signed angle in degrees from direction a to direction b (positive = left)."""
+    return math.degrees(math.atan2(ax * by - ay * bx, ax * bx + ay * by))
+
+
+def _distance_text(meters):
+    """Spoken distance, rounded to 10 meters."""
+    return f"{max(10, int(round(meters / 10.0)) * 10)} meters"
+
+
+class RoadGraph:
+    """Road nodes and segments with a uniform grid index over the segments."""
+
+    def __init__(self, level, nodes, edges, cell_size=None):
+        self.level = level
+        self.xy = np.ascontiguousarray(nodes[:, :2], dtype=np.float64)
+        self.z = np.ascontiguousarray(nodes[:, 2], dtype=np.float64)
+        self.radius = np.ascontiguousarray(nodes[:, 3], dtype=np.float64)
+
+        edges = edges.astype(np.int64).reshape(-1, 3)
+        valid = (edges[:, 0] != edges[:, 1]) & (edges[:, :2] >= 0).all(axis=1) & (edges[:, :2] < len(nodes)).all(axis=1)
+        edges = edges[valid]
+        self.edge_a = edges[:, 0]
+        self.edge_b = edges[:, 1]
+        self.one_way = edges[:, 2].astype(np.int8)
+
+        self.seg_start = self.xy[self.edge_a]
+        self.seg_vec = self.xy[self.edge_b] - self.seg_start
+        self.seg_len2 = np.maximum((self.seg_vec ** 2).sum(axis=1), 1e-9)
+        self.seg_len = np.sqrt(self.seg_len2)
+
+        # Adjacency for following the road ahead: node -> [(edge, other node), ...]
+        self.links = [[] for _ in range(len(nodes))]
+        for edge, (a, b) in enumerate(zip(self.edge_a.tolist(), self.edge_b.tolist())):
+            self.links[a].append((edge, b))
+            self.links[b].append((edge, a))
+
+        self.cell_size = cell_size or config.GUIDANCE_CELL_SIZE
+        self.cells = self._build_grid()
+
+    @classmethod
+    def parse(cls, payload):
+        """Build a graph from a ROAD_GRAPH payload (None if it is malformed or empty)."""
+        try:
+            level, nodes, edges = payload.split(GRAPH_SEPARATOR)
+            nodes = np.array(nodes.replace(";", ",").split(","), dtype=np.float64).reshape(-1, 4)
+            edges = np.array(edges.replace(";", ",").split(","), dtype=np.int64) if edges else np.zeros(0)
+        except ValueError:
+            return None
+        if not len(nodes) or len(edges) % 3:
+            return None
+        return cls(level, nodes, edges)
+
+    def _build_grid(self):
+        """Map each grid cell to the segments whose bounding box overlaps it."""
+        ends = self.seg_start + self.seg_vec
+        low = np.floor(np.minimum(self.seg_start, ends) / self.cell_size).astype(np.int64)
+        high = np.floor(np.maximum(self.seg_start, ends) / self.cell_size).astype(np.int64)
+        spans = high - low + 1
+        counts = spans[:, 0] * spans[:, 1]
+
+        # One entry per (segment, covered cell)
+        segments = np.repeat(np.arange(len(counts)), counts)
+        first = np.repeat(np.cumsum(counts) - counts, counts)
+        offsets = np.arange(len(segments)) - first
+        cx = low[segments, 0] + offsets % spans[segments, 0]
+        cy = low[segments, 1] + offsets // spans[segments, 0]
+        keys = (cx + KEY_OFFSET) * KEY_STRIDE + (cy + KEY_OFFSET)
+
+        order = np.argsort(keys, kind="stable")
+        keys = keys[order]
+        segments = segments[order].astype(np.int32)
+        unique, starts = np.unique(keys, return_index=True)
+        stops = np.append(starts[1:], len(keys))
+        return {key: segments[start:stop]
+                for key, start, stop in zip(unique.tolist(), starts.tolist(), stops.tolist())}
+
+    @property
+    def segment_count(self):
+        return len(self.edge_a)
+
+    def candidates(self, x, y, radius):
+        """Segments in the grid cells within radius of a point (may repeat)."""
+        size = self.cell_size
+        cx, cy = int(x // size), int(y // size)
+        rings = max(1, int(math.ceil(radius / size)))
+        cells = self.cells
+        parts = []
+        for gx in range(cx - rings, cx + rings + 1):
+            base = (gx + KEY_OFFSET) * KEY_STRIDE + KEY_OFFSET
+            for gy in range(cy - rings, cy + rings + 1):
+                part = cells.get(base + gy)
+                if part is not None:
+                    parts.append(part)
+        if not parts:
+            return None
+        return parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+    def nearest(self, x, y, z=None, heading=None, radius=None):
+        """
+        Nearest segment to a point: (edge, distance, t) with t the position
+        along the segment from node a (0) to node b (1), or None if no
+        segment is within the search radius. Segments more than
+        GUIDANCE_MAX_HEIGHT above or below z (bridges, tunnels) are skipped.
+
+        With a heading (unit x, y), segments across it count as up to
+        GUIDANCE_HEADING_PENALTY meters further away, so at a junction the
+        road being driven wins over the crossing one.
+        """
+        ids = self.candidates(x, y, radius or config.GUIDANCE_SEARCH_RADIUS)
+        if ids is None:
+            return None
+
+        start = self.seg_start[ids]
+        vec = self.seg_vec[ids]
+        px = x - start[:, 0]
+        py = y - start[:, 1]
+        t = np.clip((px * vec[:, 0] + py * vec[:, 1]) / self.seg_len2[ids], 0.0, 1.0)
+        dx = px - vec[:, 0] * t
+        dy = py - vec[:, 1] * t
+        dist2 = dx * dx + dy * dy
+        if z is not None:
+            za = self.z[self.edge_a[ids]]
+            height = za + (self.z[self.edge_b[ids]] - za) * t
+            dist2[np.abs(height - z) > config.GUIDANCE_MAX_HEIGHT] = np.inf
+
+        score = dist2
+        if heading is not None:
+            along = np.abs(vec[:, 0] * heading[0] + vec[:, 1] * heading[1]) / self.seg_len[ids]
+            score = np.sqrt(dist2) + (1.0 - along) * config.GUIDANCE_HEADING_PENALTY
+
+        best = int(np.argmin(score))
+        if not np.isfinite(dist2[best]):
+            return None
+        return int(ids[best]), math.sqrt(dist2[best]), float(t[best])
+
+    def direction(self, edge, towards):
+        """Unit direction of a segment when driven towards node `towards`."""
+        dx, dy = self.seg_vec[edge] / self.seg_len[edge]
+        if towards == self.edge_a[edge]:
+            return -dx, -dy
+        return dx, dy
+
+    def enters(self, edge, node):
+        """Whether an edge may be driven away from node (one-way roads only one way)."""
+        one_way = self.one_way[edge]
+        if not one_way:
+            return True
+        start = self.edge_a[edge] if one_way == 1 else self.edge_b[edge]
+        return start == node
+
+    def ahead(self, edge, node, distance, limit):
+        """
+        Follow the road from `edge` arriving at `node` (distance meters ahead)
+        through plain road nodes to the next feature within limit meters.
+
+        Returns (kind, node, distance, edge in, turn) with kind "junction",
+        "dead_end" or "curve" (turn = total bend in degrees), or None.
+        """
+        hx, hy = self.direction(edge, node)
+        for _ in range(config.GUIDANCE_MAX_STEPS):
+            if distance > limit:
+                return None
+            links = self.links[node]
+            if len(links) == 1:
+                return "dead_end", node, distance, edge, 0.0
+            if len(links) > 2:
+                return "junction", node, distance, edge, 0.0
+
+            here = node
+            edge, node = links[1] if links[0][0] == edge else links[0]
+            dx, dy = self.direction(edge, node)
+            bend = _turn_angle(hx, hy, dx, dy)
+            if abs(bend) >= config.GUIDANCE_CURVE_ANGLE:
+                return "curve", here, distance, edge, bend
+            distance += self.seg_len[edge]
+        return None
+
+    def exits(self, edge, node):
+        """Ways out of a junction reached over edge: [(turn degrees, edge), ...], left first."""
+        hx, hy = self.direction(edge, node)
+        ways = []
+        for out, other in self.links[node]:
+            if out == edge or not self.enters(out, node):
+                continue
+            dx, dy = self.direction(out, other)
+            ways.append((_turn_angle(hx, hy, dx, dy), out))
+        return sorted(ways, reverse=True)
+
+
+def describe_turn(angle):
+    """Spoken name of a turn angle (positive = left)."""
+    size = abs(angle)
+    if size < config.GUIDANCE_STRAIGHT_ANGLE:
+        return "straight"
+    side = "left" if angle > 0 else "right"
+    return f"sharp {side}" if size > 110 else side
+
+
+def describe_exits(exits):
+    """Spoken list of the ways out of a junction, e.g. "left, straight or right"."""
+    names = []
+    for angle, _ in exits:
+        if abs(angle) <= 150:
+            name = describe_turn(angle)
+            if name not in names:
+                names.append(name)
+    if not names:
+        return ""
+    if len(names) == 1:
+        return names[0]
+    return ", ".join(names[:-1]) + " or " + names[-1]
+
+
+class Guide:
+    """Turns position updates on one road graph into guidance announcements."""
+
+    def __init__(self, graph):
+        self.graph = graph
+        self.on_road = True
+        self.wrong_way = False
+        self.last_feature = None  # (kind, node) last announced
+        self.edge = None          # Segment the vehicle is on
+        self.heading_error = 0.0  # Degrees between heading and the road direction
+        self.drifting = None      # Side announced for heading_error ("left"/"right")
+        self.feature = None       # Next feature ahead, as returned by RoadGraph.ahead
+
+    def update(self, x, y, z, dir_x, dir_y, speed):
+        """Process a position update. Returns the text to announce, or None."""
+        graph = self.graph
+        norm = math.hypot(dir_x, dir_y)
+        moving = norm > 1e-6 and speed >= config.GUIDANCE_MIN_SPEED
+        if moving:
+            dir_x /= norm
+            dir_y /= norm
+        found = graph.nearest(x, y, z, (dir_x, dir_y) if moving else None)
+        if found is not None:
+            edge, distance, t = found
+            a, b = graph.edge_a[edge], graph.edge_b[edge]
+            width = graph.radius[a] + (graph.radius[b] - graph.radius[a]) * t
+            if distance > width + config.GUIDANCE_OFF_ROAD_MARGIN:
+                found = None
+
+        if found is None:
+            self.edge = None
+            self.feature = None
+            self.drifting = None
+            if self.on_road:
+                self.on_road = False
+                return "Off road"
+            return None
+
+        messages = []
+        if not self.on_road:
+            self.on_road = True
+            self.last_feature = None
+            messages.append("Back on road")
+
+        self.edge = edge
+        if not moving:
+            return ". ".join(messages) or None
+
+        # Drive towards the segment end the heading points to
+        ux, uy = graph.seg_vec[edge] / graph.seg_len[edge]
+        if dir_x * ux + dir_y * uy >= 0:
+            node, remaining = b, (1.0 - t) * graph.seg_len[edge]
+        else:
+            node, remaining = a, t * graph.seg_len[edge]
+        rx, ry = graph.direction(edge, node)
+        self.heading_error = _turn_angle(rx, ry, dir_x, dir_y)
+        drift = abs(self.heading_error)
+        if drift >= config.GUIDANCE_DRIFT_ANGLE:
+            side = "left" if self.heading_error > 0 else "right"
+            if side != self.drifting:
+                self.drifting = side
+                messages.append(f"Drifting {side}")
+        elif drift < config.GUIDANCE_DRIFT_ANGLE / 2:
+            self.drifting = None
+
+        wrong_way = not graph.enters(edge, a if node == b else b)
+        if wrong_way != self.wrong_way:
+            self.wrong_way = wrong_way
+            if wrong_way:
+                messages.append("Wrong way, one way road")
+
+        lookahead = min(max(config.GUIDANCE_MIN_LOOKAHEAD, speed / 3.6 * config.GUIDANCE_LEAD_TIME),
+                        config.GUIDANCE_MAX_LOOKAHEAD)
+        self.feature = graph.ahead(edge, node, remaining, lookahead)
+        if self.feature is not None:
+            kind, feature_node, distance, edge_in, turn = self.feature
+            if (kind, feature_node) != self.last_feature:
+                self.last_feature = (kind, feature_node)
+                text = self._describe(kind, feature_node, distance, edge_in, turn)
+                if text:
+                    messages.append(text)
+
+        return ". ".join(messages) or None
+
+    def _describe(self, kind, node, distance, edge, turn):
+        where = _distance_text(distance)
+        if kind == "dead_end":
+            return f"Road ends in {where}"
+        if kind == "curve":
+            side = "left" if turn > 0 else "right"
+            sharp = "Sharp " if abs(turn) > 90 else ""
+            return f"{sharp}{side} curve in {where}".capitalize()
+        ways = describe_exits(self.graph.exits(edge, node))
+        return f"Junction in {where}, {ways}" if ways else f"Junction in {where}"
+
+
+def load_graph(payload):
+    """Build a RoadGraph from a ROAD_GRAPH payload (None if unavailable or invalid)."""
+    if not _load_numpy():
+        print("[Guidance] numpy not available, route guidance disabled")
+        return None
+
+    started = time.time()
+    graph = RoadGraph.parse(payload)
+    if graph is None:
+        print("[Guidance] Invalid road graph")
+        return None
+    print(f"[Guidance] {graph.level}: {len(graph.xy)} nodes, {graph.segment_count} road segments "
+          f"indexed in {(time.time() - started) * 1000:.0f} ms")
+    return graph
+
+
+def grid_city_payload(blocks=10, spacing=100.0, step=20.0, level="grid_city"):
+    """ROAD_GRAPH payload of a synthetic city: a blocks x blocks street grid with nodes every step meters."""
+    nodes = {}
+    edges = []
+
+    def node(x, y):
+        key = (round(x, 1), round(y, 1))
+        if key not in nodes:
+            nodes[key] = len(nodes)
+        return nodes[key]
+
+    per_block = int(spacing // step)
+    for line in range(blocks + 1):
+        for along in range(blocks * per_block):
+            for ax, ay, bx, by in ((along * step, line * spacing, (along + 1) * step, line * spacing),
+                                   (line * spacing, along * step, line * spacing, (along + 1) * step)):
+                edges.append((node(ax, ay), node(bx, by)))
+
+    node_text = ";".join(f"{x:.1f},{y:.1f},0.0,4.0" for x, y in nodes)
+    edge_text = ";".join(f"{a},{b},0" for a, b in edges)
+    return GRAPH_SEPARATOR.join((level, node_text, edge_text))
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing route guidance...")
+    graph = load_graph(grid_city_payload(blocks=60))
+    guide = Guide(graph)
+
+    # Drive east along the street at y = 100 towards the junction at x = 300
+    for x in range(130, 320, 10):
+        text = guide.update(float(x), 101.0, 0.0, 1.0, 0.0, 50.0)
+        if text:
+            print(f"  x={x}: {text}")
+    print(f"  Off the road: {guide.update(250.0, 150.0, 0.0, 1.0, 0.0, 50.0)}")
+
+    rounds = 2000
+    started = time.perf_counter()
+    for i in range(rounds):
+        guide.update(50.0 + (i * 7.3) % 5000, 1001.0, 0.0, 1.0, 0.0, 80.0)
+    elapsed = (time.perf_counter() - started) / rounds
+    print(f"Position update: {elapsed * 1e6:.0f} us on {graph.segment_count} segments")
@@ -0,0 +1,158 @@
+"""
+BeamNG Blind Accessibility Helper - Global Hotkeys
+
+Registers system-wide hotkeys (Windows RegisterHotKey via ctypes) that
+query the helper's local state, so status and menu review commands are
+answered immediately without a round trip to the game.
+
+Hotkeys are registered on a dedicated thread, which also runs the Windows
+message loop that receives them. On other platforms hotkeys are disabled.
+"""
+
+import sys
+import threading
+
+import config
+
+# RegisterHotKey modifiers
+MOD_ALT = 0x0001
+MOD_CONTROL = 0x0002
+MOD_SHIFT = 0x0004
+MOD_WIN = 0x0008
+MOD_NOREPEAT = 0x4000
+
+WM_HOTKEY = 0x0312
+WM_QUIT = 0x0012
+
+_MODIFIERS = {
+    "alt": MOD_ALT,
+    "ctrl": MOD_CONTROL,
+    "control": MOD_CONTROL,
+    "shift": MOD_SHIFT,
+    "win": MOD_WIN,
+}
+
+
+def parse_hotkey(spec):
+    """
+    Parse a hotkey like "ctrl+alt+s" into (modifiers, virtual key code).
+    Raises ValueError for unknown keys.
+    """
+    modifiers = 0
+    key = None
+    for part in spec.lower().replace(" ", "").split("+"):
+        if part in _MODIFIERS:
+            modifiers |= _MODIFIERS[part]
+        elif len(part) == 1 and part.isalnum():
+            key = ord(part.upper())  # VK codes for A-Z / 0-9 match ASCII
+        elif len(part) > 1 and part[0] == "f" and part[1:].isdigit():
+            key = 0x70 + int(part[1:]) - 1  # VK_F1..VK_F24
+        else:
+            raise ValueError(f"Unknown key '{part}' in hotkey '{spec}'")
+    if key is None:
+        raise ValueError(f"Hotkey '{spec}' has no key")
+    return modifiers, key
+
+
+class HotkeyManager:
+    """Owns the hotkey thread and dispatches hotkeys to callbacks."""
+
+    def __init__(self):
+        self.bindings = []  # (spec, callback)
+        self.callbacks = {}  # Hotkey ID -> callback
+        self.thread = None
+        self.thread_id = None
+        self.ready = threading.Event()
+
+    def add(self, spec, callback):
+        """Add a hotkey binding (before start)."""
+        self.bindings.append((spec, callback))
+
+    def start(self):
+        """Register the hotkeys and start the message loop thread."""
+        if sys.platform != "win32":
+            print("[Hotkeys] Global hotkeys are only available on Windows")
+            return False
+
+        self.thread = threading.Thread(target=self._message_loop, daemon=True)
+        self.thread.start()
+        self.ready.wait(timeout=2.0)
+        return bool(self.callbacks)
+
+    def stop(self):
+        """Unregister the hotkeys and stop the message loop."""
+        if self.thread_id is not None:
+            import ctypes
+            ctypes.windll.user32.PostThreadMessageW(self.thread_id, WM_QUIT, 0, 0)
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+        self.thread_id = None
+
+    def _message_loop(self):
+        """Register hotkeys on this thread and dispatch WM_HOTKEY messages."""
+        import ctypes
+        from ctypes import wintypes
+
+        user32 = ctypes.windll.user32
+        self.thread_id = ctypes.windll.kernel32.GetCurrentThreadId()
+
+        for hotkey_id, (spec, callback) in enumerate(self.bindings, start=1):
+            try:
+                modifiers, key = parse_hotkey(spec)
+            except ValueError as e:
+                print(f"[Hotkeys] {e}")
+                continue
+            if user32.RegisterHotKey(None, hotkey_id, modifiers | MOD_NOREPEAT, key):
+                self.callbacks[hotkey_id] = callback
+            else:
+                print(f"[Hotkeys] Could not register {spec} (in use by another program?)")
+
+        print(f"[Hotkeys] Registered {len(self.callbacks)} hotkeys")
+        self.ready.set()
+
+        msg = wintypes.MSG()
+        try:
+            while user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                if msg.message != WM_HOTKEY:
+                    continue
+                callback = self.callbacks.get(msg.wParam)
+                if callback:
+                    try:
+                        callback()
+                    except Exception as e:
+                        print(f"[Hotkeys] Error handling hotkey: {e}")
+        finally:
+            for hotkey_id in self.callbacks:
+                user32.UnregisterHotKey(None, hotkey_id)
+            self.callbacks = {}
+
+
+# Singleton manager
+_manager = None
+
+
+def start(listener):
+    """Register the configured hotkeys against the UDP listener's local state."""
+    global _manager
+
+    _manager = HotkeyManager()
+    _manager.add(config.HOTKEY_STATUS, listener.announce_status)
+    _manager.add(config.HOTKEY_ALERTS, listener.announce_alerts)
+    _manager.add(config.HOTKEY_MENU_READ, listener.review_menu)
+
+    # Jump to the next menu item starting with a letter
+    if config.HOTKEY_MENU_JUMP:
+        for letter in "abcdefghijklmnopqrstuvwxyz":
+            _manager.add(f"{config.HOTKEY_MENU_JUMP}+{letter}",
+                         lambda letter=letter: listener.jump_menu(letter))
+
+    return _manager.start()
+
+
+def stop():
+    """Unregister all hotkeys."""
+    global _manager
+    if _manager:
+        _manager.stop()
+        _manager = None
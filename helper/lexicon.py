@@ -0,0 +1,264 @@
+"""
+BeamNG Blind Accessibility Helper - Pronunciation Lexicon
+
+Normalizes text before it is spoken, so screen readers do not spell out
+internal IDs (etk800, sample_gavril_engine_v8, west_coast_usa), units or
+abbreviations. All entries are compiled into a character trie and each
+utterance is rewritten in a single left-to-right pass, taking the longest
+entry that matches at a word boundary. Any underscores left over are
+spoken as spaces. Results are cached per input string.
+
+Friendly names are seeded from the catalogs in the accessible launcher
+(VEHICLES, MAPS, ENGINES), parsed with ast so the launcher and its
+dependencies are never imported. Catalog IDs that are plain words
+(pickup, van, nine) would also match ordinary speech, so they are only
+used for typed vehicle/level phrase arguments (see friendly_vehicle and
+friendly_level), not for free text.
+"""
+
+import ast
+import os
+import re
+from functools import lru_cache
+
+import config
+
+DEFAULT_CATALOG_PATH = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "launcher", "accessible_launcher.py")
+
+# Units: only replaced right after a number ("72km/h", "72 km/h")
+UNITS = {
+    "km/h": "kilometers per hour",
+    "kph": "kilometers per hour",
+    "mph": "miles per hour",
+    "m/s": "meters per second",
+    "rpm": "RPM",
+    "hp": "horsepower",
+    "kW": "kilowatts",
+    "Nm": "newton meters",
+    "psi": "PSI",
+    "kg": "kilograms",
+}
+
+# Units that are also ordinary words or key names ("Hold L", "5 L"): only
+# replaced when written straight after the number ("4.1L")
+ATTACHED_UNITS = {
+    "L": "liter",
+}
+
+# Abbreviations and internal names replaced anywhere they form a whole word
+ABBREVIATIONS = {
+    "engineswap_sample": "engine swap",
+    "transmissionswap_sample": "transmission swap",
+    "turboswap_sample": "turbo swap",
+    "scswap_sample": "supercharger swap",
+    "ecuswap_sample": "ECU swap",
+    "internalsswap_sample": "engine internals swap",
+    "radiatorswap_sample": "radiator swap",
+    "jbeam": "J beam",
+    "dohc": "D O H C",
+    "sohc": "S O H C",
+}
+
+_TERMINAL = ""  # Trie key marking the end of an entry
+_PARENTHETICAL = re.compile(r"\s*\([^)]*\)")
+
+
+def _is_word_char(char):
+    return char.isalnum() or char == "_"
+
+
+def load_catalogs(path, names):
+    """
+    Read (friendly name, ID) pairs from dict literals in a Python file
+    without importing it. Returns {catalog name: {id: friendly name}}.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    catalogs = {}
+    for node in tree.body:
+        if not isinstance(node, ast.Assign) or len(node.targets) != 1:
+            continue
+        target = node.targets[0]
+        if not isinstance(target, ast.Name) or target.id not in names:
+            continue
+        try:
+            value = ast.literal_eval(node.value)
+        except ValueError:
+            continue
+
+        entries = {}
+        for entry in value.values():
+            if isinstance(entry, tuple) and len(entry) >= 2 and entry[1]:
+                friendly = _PARENTHETICAL.sub("", entry[0]).strip()
+                entries.setdefault(entry[1], friendly)  # First entry wins (base model before mods)
+        catalogs[target.id] = entries
+    return catalogs
+
+
+class Lexicon:
+    """Trie of spoken replacements applied in one pass per utterance."""
+
+    def __init__(self):
+        self.root = {}
+        self.unit_root = {}
+        self.attached_unit_root = {}
+        self.vehicles = {}
+        self.levels = {}
+        self.entries = 0
+
+    def add(self, key, spoken, unit=False, attached=False):
+        """Add an entry (units only match right after a number, attached units with no space)."""
+        node = self.attached_unit_root if attached else self.unit_root if unit else self.root
+        for char in key:
+            node = node.setdefault(char, {})
+        node[_TERMINAL] = spoken
+        self.entries += 1
+
+    def add_catalogs(self, catalogs):
+        """Add launcher catalogs. Plain-word IDs only go to the typed-argument maps."""
+        for name, entries in catalogs.items():
+            # Spoken forms are normalized once here (e.g. "4.5L" -> "4.5 liter")
+            entries = {item_id: self.normalize(friendly) for item_id, friendly in entries.items()}
+            if name == "VEHICLES":
+                self.vehicles.update(entries)
+            elif name == "MAPS":
+                self.levels.update(entries)
+            for item_id, friendly in entries.items():
+                if not item_id.isalpha():
+                    self.add(item_id, friendly)
+
+    def _match(self, root, text, start):
+        """Longest entry starting at start and ending at a word boundary: (end, spoken)."""
+        node = root
+        best = None
+        length = len(text)
+        i = start
+        while i < length:
+            node = node.get(text[i])
+            if node is None:
+                break
+            i += 1
+            if _TERMINAL in node and (i == length or not _is_word_char(text[i])
+                                      or not _is_word_char(text[i - 1])):
+                best = (i, node[_TERMINAL])
+        return best
+
+    def normalize(self, text):
+        """Rewrite text in a single pass."""
+        out = []
+        length = len(text)
+        i = 0
+        previous = ""  # Last non-space character copied
+        while i < length:
+            char = text[i]
+            at_boundary = i == 0 or not _is_word_char(text[i - 1])
+
+            match = None
+            if at_boundary and char in self.root:
+                match = self._match(self.root, text, i)
+            if match is None and previous.isdigit():
+                if char in self.unit_root and (at_boundary or text[i - 1].isdigit()):
+                    match = self._match(self.unit_root, text, i)
+                if match is None and char in self.attached_unit_root and text[i - 1].isdigit():
+                    match = self._match(self.attached_unit_root, text, i)
+                if match and text[i - 1].isdigit():
+                    out.append(" ")
+
+            if match:
+                i, spoken = match
+                out.append(spoken)
+                previous = spoken[-1:]
+                continue
+
+            out.append(" " if char == "_" else char)
+            if not char.isspace():
+                previous = char
+            i += 1
+        return "".join(out)
+
+
+def build(catalog_path=None):
+    """Build the lexicon from the built-in tables, launcher catalogs and config."""
+    lexicon = Lexicon()
+    for key, spoken in UNITS.items():
+        lexicon.add(key, spoken, unit=True)
+    for key, spoken in ATTACHED_UNITS.items():
+        lexicon.add(key, spoken, attached=True)
+    for key, spoken in ABBREVIATIONS.items():
+        lexicon.add(key, spoken)
+
+    path = catalog_path or config.LEXICON_CATALOG_PATH or DEFAULT_CATALOG_PATH
+    try:
+        lexicon.add_catalogs(load_catalogs(path, config.LEXICON_CATALOGS))
+    except (OSError, SyntaxError) as e:
+        print(f"[Lexicon] Could not read launcher catalogs: {e}")
+
+    for key, spoken in config.LEXICON_ENTRIES.items():
+        lexicon.add(key, spoken)
+    return lexicon
+
+
+# Singleton lexicon, built on first use
+_lexicon = None
+
+
+def get_lexicon():
+    """Get the lexicon, building it on first use."""
+    global _lexicon
+    if _lexicon is None:
+        _lexicon = build()
+        if config.DEBUG_MODE:
+            print(f"[Lexicon] {_lexicon.entries} entries")
+    return _lexicon
+
+
+@lru_cache(maxsize=1024)
+def _normalize_cached(text):
+    return get_lexicon().normalize(text)
+
+
+def normalize(text):
+    """Normalize an utterance for speech (cached per input string)."""
+    if not text or not config.LEXICON_ENABLED:
+        return text
+    return _normalize_cached(text)
+
+
+def friendly_vehicle(vehicle_id):
+    """Spoken name for a vehicle model ID (e.g. "pickup" -> "Gavril D-Series")."""
+    if not config.LEXICON_ENABLED:
+        return vehicle_id
+    return get_lexicon().vehicles.get(vehicle_id) or normalize(vehicle_id)
+
+
+def friendly_level(level_id):
+    """Spoken name for a level ID (e.g. "west_coast_usa" -> "West Coast USA")."""
+    if not config.LEXICON_ENABLED:
+        return level_id
+    return get_lexicon().levels.get(level_id) or normalize(level_id)
+
+
+def reload():
+    """Rebuild the lexicon and drop cached results (including rendered phrases)."""
+    global _lexicon
+    import phrases  # Imported here: phrases imports this module
+    _lexicon = None
+    _normalize_cached.cache_clear()
+    phrases.cache_clear()
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing lexicon...")
+    for sample in ("Vehicle spawned: etk800",
+                   "Engine sample_gavril_engine_v8 in engineswap_sample",
+                   "Level loaded: west_coast_usa",
+                   "Speed 72km/h, 5000 rpm, 4.1L engine",
+                   "Traffic spawned, 3 vehicles: 2 sunburst, 1 pickup",
+                   "Hold L to look back",
+                   "Press 5 L to save"):
+        print(f"  {sample!r} -> {normalize(sample)!r}")
+    print(f"  pickup -> {friendly_vehicle('pickup')!r}, italy -> {friendly_level('italy')!r}")
+    print(f"  Cache: {_normalize_cached.cache_info()}")
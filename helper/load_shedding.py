@@ -0,0 +1,208 @@
+"""
+BeamNG Blind Accessibility Helper - Load Shedding
+
+When speech falls behind (a slow screen reader, a burst of events), every
+message would still be spoken in full and speech would drift further and
+further behind the game. The overload controller measures how far behind
+the helper is and sheds work in steps:
+
+    Level 0  Normal
+    Level 1  Terse templates (short phrases, menu items without position)
+    Level 2  Also drop status and telemetry speech, merge queued menu updates
+    Level 3  Also raise the SAPI speech rate (utterances already in the
+             utterance cache keep playing at the normal rate)
+
+Pressure is the larger of the queueing lag (time from receiving a packet
+to processing it) and the estimated time to drain the backlog, relative
+to config.LOAD_SHED_LAG_TARGET. The drain time is the larger of the
+queued packets times the average estimated spoken duration of an
+utterance (speak calls return at once, so their duration says nothing),
+and the speech still to be said by the SAPI driver or the screen reader
+(speech.backlog_seconds, sampled every config.LOAD_SHED_SAMPLE_INTERVAL).
+Levels rise as soon as pressure crosses their threshold and fall one step
+at a time once pressure has stayed below the exit threshold for
+config.LOAD_SHED_RECOVERY_TIME.
+"""
+
+import math
+import threading
+import time
+from collections import deque
+
+import config
+import speech
+
+NORMAL = 0
+TERSE = 1
+SHED = 2
+FAST = 3
+
+LEVEL_NAMES = ("normal", "terse", "shedding", "fast speech")
+
+SMOOTHING_TIME = 0.5  # Seconds for the lag/speech averages to settle
+
+
+class OverloadController:
+    """Tracks speech pressure and decides what to shed."""
+
+    def __init__(self, enabled=None):
+        self.enabled = config.LOAD_SHEDDING_ENABLED if enabled is None else enabled
+        self.level = NORMAL
+        self.pressure = 0.0
+        self.lag = 0.0            # Smoothed queueing lag (seconds)
+        self.speech_time = 0.0    # Smoothed estimated spoken duration of one utterance (seconds)
+        self.backlog = 0
+        self.speech_backlog = 0.0  # Last speech.backlog_seconds() sample
+        self.speech_sampled = 0.0  # When it was taken
+        self.last_sample = time.time()
+        self.below_since = None   # When pressure dropped below the current exit threshold
+        self.lock = threading.Lock()
+
+        # Metrics
+        self.level_since = self.last_sample
+        self.time_in_level = [0.0] * len(LEVEL_NAMES)
+        self.transitions = deque(maxlen=100)  # (time, old level, new level, pressure)
+        self.shed = {}  # Reason -> count
+
+    def _smooth(self, average, value, now):
+        """Time-based exponential moving average."""
+        alpha = 1.0 - math.exp(-max(now - self.last_sample, 0.001) / SMOOTHING_TIME)
+        return average + (value - average) * alpha
+
+    def observe(self, lag, backlog, now=None):
+        """Record one processed packet: its queueing lag and the packets still queued."""
+        if not self.enabled:
+            return
+        now = now or time.time()
+        if now - self.speech_sampled >= config.LOAD_SHED_SAMPLE_INTERVAL:
+            # Sampled outside the lock and not on every packet
+            self.speech_sampled = now
+            self.speech_backlog = speech.backlog_seconds()
+        with self.lock:
+            self.lag = self._smooth(self.lag, lag, now)
+            self.backlog = backlog
+            self.last_sample = now
+            self._update(now)
+
+    def observe_idle(self, now=None):
+        """A session queue drained: nothing is waiting."""
+        self.observe(0.0, 0, now)
+
+    def observe_speech(self, seconds):
+        """Record the estimated spoken duration of an utterance (see speech.estimate_seconds)."""
+        if not self.enabled:
+            return
+        with self.lock:
+            self.speech_time += (seconds - self.speech_time) * 0.2
+
+    def _update(self, now):
+        """Recompute pressure and move between levels (lock must be held)."""
+        drain = max(self.backlog * self.speech_time, self.speech_backlog)
+        self.pressure = max(self.lag, drain) / config.LOAD_SHED_LAG_TARGET
+
+        thresholds = config.LOAD_SHED_THRESHOLDS
+        target = NORMAL
+        for level, threshold in enumerate(thresholds, start=1):
+            if self.pressure >= threshold:
+                target = level
+
+        if target > self.level:
+            self._set_level(target, now)
+            self.below_since = None
+            return
+
+        if self.level == NORMAL:
+            return
+
+        # Recover one level at a time after a quiet period (hysteresis)
+        exit_threshold = thresholds[self.level - 1] * config.LOAD_SHED_EXIT_RATIO
+        if self.pressure >= exit_threshold:
+            self.below_since = None
+        elif self.below_since is None:
+            self.below_since = now
+        elif now - self.below_since >= config.LOAD_SHED_RECOVERY_TIME:
+            self._set_level(self.level - 1, now)
+            self.below_since = now if self.level > NORMAL else None
+
+    def _set_level(self, level, now):
+        """Switch level, apply the speech rate and record metrics."""
+        old = self.level
+        self.time_in_level[old] += now - self.level_since
+        self.level_since = now
+        self.level = level
+        self.transitions.append((now, old, level, self.pressure))
+        print(f"[LoadShed] {LEVEL_NAMES[old]} -> {LEVEL_NAMES[level]} "
+              f"(pressure {self.pressure:.1f}, lag {self.lag:.2f}s, backlog {self.backlog})")
+
+        if (old >= FAST) != (level >= FAST):
+            speech.set_rate(config.SPEECH_RATE * config.LOAD_SHED_RATE_BOOST if level >= FAST else None)
+
+    # Policy queries (read without the lock; a stale level for one packet is harmless)
+
+    def terse(self):
+        """Use terse templates."""
+        return self.level >= TERSE
+
+    def drops_status(self):
+        """Drop status and telemetry speech."""
+        return self.level >= SHED
+
+    def merges_menus(self):
+        """Skip menu updates that are superseded by a queued one."""
+        return self.level >= SHED
+
+    def record_shed(self, reason):
+        """Count a shed message for the metrics."""
+        with self.lock:
+            self.shed[reason] = self.shed.get(reason, 0) + 1
+
+    def stats(self):
+        """Metrics summary."""
+        with self.lock:
+            now = time.time()
+            time_in_level = list(self.time_in_level)
+            time_in_level[self.level] += now - self.level_since
+            return {
+                "level": LEVEL_NAMES[self.level],
+                "pressure": round(self.pressure, 2),
+                "transitions": len(self.transitions),
+                "seconds_per_level": {LEVEL_NAMES[i]: round(t, 1) for i, t in enumerate(time_in_level)},
+                "shed": dict(self.shed),
+            }
+
+
+# Singleton controller
+_controller = None
+
+
+def get_controller():
+    """Get the singleton overload controller."""
+    global _controller
+    if _controller is None:
+        _controller = OverloadController()
+    return _controller
+
+
+def cleanup():
+    """Report shedding metrics and restore the speech rate."""
+    global _controller
+    if _controller:
+        if _controller.transitions:
+            print(f"[LoadShed] {_controller.stats()}")
+        if _controller.level >= FAST:
+            speech.set_rate(None)
+        _controller = None
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing load shedding...")
+    controller = OverloadController(enabled=True)
+    start = time.time() - 10.0
+    controller.last_sample = controller.level_since = start
+    controller.observe_speech(0.8)
+    for step in range(20):
+        controller.observe(lag=0.2 * step, backlog=step, now=start + 0.1 * step)
+    for step in range(80):
+        controller.observe_idle(now=start + 2.0 + 0.1 * step)
+    print(controller.stats())
@@ -18,7 +18,15 @@ import argparse
 
 import config
 import speech
+import earcons
 import udp_listener
+import stream_listener
+import hotkeys
+import load_shedding
+import tracing
+import profiler
+import gc_control
+import telemetry_store
 
 
 def print_banner():
@@ -33,6 +41,8 @@ def print_config():
     """Print current configuration."""
     print(f"Configuration:")
     print(f"  UDP Address: {config.UDP_IP}:{config.UDP_PORT}")
+    if config.TCP_ENABLED:
+        print(f"  TCP Address: {config.UDP_IP}:{config.TCP_PORT}")
     print(f"  Screen Reader: {config.SCREEN_READER}")
     print(f"  Interrupt Speech: {config.INTERRUPT_SPEECH}")
     print(f"  Debug Mode: {config.DEBUG_MODE}")
@@ -61,27 +71,73 @@ def main():
         help=f"UDP port to listen on (default: {config.UDP_PORT})"
     )
     parser.add_argument(
-        "--debug", action="store_true", default=config.DEBUG_MODE,
+        "--tcp-port", type=int, default=config.TCP_PORT,
+        help=f"TCP port for large payloads (default: {config.TCP_PORT})"
+    )
+    parser.add_argument(
+        "--debug", action="store_true", default=None,
         help="Enable debug output"
     )
+    parser.add_argument(
+        "--trace", metavar="FILE",
+        help="Record end-to-end latency spans and write them to FILE as Chrome trace JSON"
+    )
+    parser.add_argument(
+        "--profile", nargs="?", const=".", metavar="DIR",
+        help="Sample the helper and write profile reports to DIR (default: current folder) "
+             "on exit and on SIGUSR1 / Ctrl+Break"
+    )
+    parser.add_argument(
+        "--profile-memory", action="store_true",
+        help="With --profile, also trace allocations with tracemalloc (adds overhead to every allocation)"
+    )
+    parser.add_argument(
+        "--telemetry", metavar="DIR", default=config.TELEMETRY_STORE_DIR,
+        help="Record the vehicle telemetry history of each session to DIR (requires numpy)"
+    )
     parser.add_argument(
         "--test", action="store_true",
         help="Run a quick speech test and exit"
     )
+    parser.add_argument(
+        "--startup-benchmark", action="store_true",
+        help="Report import and initialization time per module and time-to-first-speech, then exit"
+    )
     args = parser.parse_args()
 
+    if args.startup_benchmark:
+        import startup_bench
+        sys.exit(startup_bench.main([]))
+
     # Apply command line overrides
     config.UDP_PORT = args.port
-    config.DEBUG_MODE = args.debug
+    config.TCP_PORT = args.tcp_port
+    if args.debug:
+        config.DEBUG_MODE = True
+    elif args.profile:
+        config.DEBUG_MODE = False  # Debug prints would dominate the profile
+    if args.profile_memory:
+        config.PROFILE_MEMORY = True
 
     print_banner()
     print_config()
 
-    # Initialize speech system
+    if args.trace:
+        tracing.start(args.trace)
+    if args.profile:
+        profiler.start(args.profile)
+
+    # Initialize speech system (in the background, earcons load meanwhile)
     print("Initializing speech system...")
-    if not speech.init():
+    speech.init_async()
+
+    if config.EARCONS_ENABLED:
+        earcons.init()
+
+    if not speech.wait_ready():
         print("ERROR: Failed to initialize speech system!")
         print("Make sure NVDA is running or pyttsx3 is installed.")
+        earcons.cleanup()
         sys.exit(1)
 
     screen_reader = speech.get_screen_reader()
@@ -100,25 +156,54 @@ def main():
     # Set up shutdown handler
     def shutdown():
         print("Shutting down...")
+        hotkeys.stop()
+        stream_listener.stop()
         udp_listener.stop()
+        telemetry_store.stop()
+        tracing.stop()
+        profiler.stop()
+        gc_control.cleanup()
+        load_shedding.cleanup()
+        earcons.cleanup()
         speech.cleanup()
         print("Goodbye!")
 
     setup_signal_handlers(shutdown)
 
+    if args.telemetry:
+        telemetry_store.start(args.telemetry)
+
     # Start UDP listener
     print("Starting UDP listener...")
     if not udp_listener.start():
         print("ERROR: Failed to start UDP listener!")
+        telemetry_store.stop()
+        earcons.cleanup()
         speech.cleanup()
         sys.exit(1)
 
+    # Start TCP stream listener for large payloads (optional)
+    if config.TCP_ENABLED:
+        print("Starting TCP stream listener...")
+        if not stream_listener.start(udp_listener.get_listener().sessions):
+            print("WARNING: TCP stream listener failed, large payloads will be truncated")
+
+    # Register status and menu review hotkeys (optional)
+    if config.HOTKEYS_ENABLED:
+        hotkeys.start(udp_listener.get_listener())
+
+    # Startup objects are long-lived; keep them out of garbage collections
+    gc_control.init()
+
     # Announce startup
     speech.speak(f"BeamNG Blind Accessibility helper started. Using {screen_reader}.")
 
     print()
     print("=" * 60)
     print("  Helper is running. Waiting for BeamNG...")
+    if config.HOTKEYS_ENABLED:
+        print(f"  {config.HOTKEY_STATUS}: status, {config.HOTKEY_ALERTS}: last alerts,")
+        print(f"  {config.HOTKEY_MENU_READ}: read menu")
     print("  Press Ctrl+C to stop.")
     print("=" * 60)
     print()
@@ -0,0 +1,152 @@
+"""
+BeamNG Blind Accessibility Helper - Menu Model
+
+Local copy of the game's current menu. The mod sends a snapshot of the
+menu (name, focused item and item texts) once when a menu opens or its
+items change, then only the focused item on each keypress. Item IDs are
+their 1-based positions in the snapshot.
+
+Snapshots are numbered, and each focus delta names the snapshot it
+refers to. A delta for a newer snapshot than the model holds means a
+snapshot was lost, arrived late (over TCP, behind a delta sent by UDP) or
+predates a helper restart; the model is then stale and the helper asks
+the mod to send the snapshot again (MSG_TYPE_MENU_RESYNC), which
+announces the focused item. Deltas for an older snapshot are ignored.
+
+Because the whole menu is held here, review commands (read all items,
+jump to the next item starting with a letter) are answered locally with
+no round trip to the game.
+
+Snapshot payload:  "seq|menuName|focusedId|item1|item2|...|itemN"
+Focus payload:     "focusedId|seq"
+"""
+
+# apply_focus result for a delta the model cannot answer (snapshot needed)
+STALE = "stale"
+
+
+class MenuModel:
+    """The items and focus of one source's current menu."""
+
+    def __init__(self):
+        self.name = ""
+        self.items = []
+        self.index = 0  # Focused item ID (0 = none)
+        self.seq = None  # Number of the snapshot held (None = none received)
+        self.snapshots = 0
+
+    def load_snapshot(self, payload):
+        """Replace the model from a snapshot payload. Returns True if valid."""
+        parts = payload.split('|')
+        if len(parts) < 3:
+            return False
+
+        try:
+            seq = int(parts[0])
+            index = int(parts[2])
+        except ValueError:
+            return False
+
+        self.seq = seq
+        self.name = parts[1]
+        self.items = parts[3:]
+        self.index = index if 1 <= index <= len(self.items) else 0
+        self.snapshots += 1
+        return True
+
+    def clear(self):
+        """Forget the menu (it was closed)."""
+        self.name = ""
+        self.items = []
+        self.index = 0
+
+    @property
+    def total(self):
+        return len(self.items)
+
+    def text(self, item_id):
+        """Get the text of an item by ID (None if unknown)."""
+        if 1 <= item_id <= len(self.items):
+            return self.items[item_id - 1]
+        return None
+
+    def focus(self, item_id):
+        """Move focus to an item. Returns its text, or None if the ID is unknown."""
+        text = self.text(item_id)
+        if text is not None:
+            self.index = item_id
+        return text
+
+    def apply_focus(self, payload):
+        """
+        Apply a focus delta. Returns (text, item_id, total) to announce,
+        STALE if the model does not hold the snapshot the delta refers to,
+        or None if the payload is invalid or the delta is out of date.
+        """
+        item_id, _, seq = payload.partition('|')
+        try:
+            item_id = int(item_id)
+            seq = int(seq) if seq else self.seq
+        except ValueError:
+            return None
+
+        if self.seq is None or seq > self.seq:
+            return STALE
+        if seq < self.seq:
+            return None  # Superseded by a snapshot that announced its own focus
+        text = self.focus(item_id)
+        if text is None:
+            return STALE
+        return text, item_id, self.total
+
+    @property
+    def focused_text(self):
+        return self.text(self.index)
+
+    def read_all(self):
+        """Describe the whole menu in one utterance."""
+        if not self.items:
+            return "No menu"
+
+        count = len(self.items)
+        noun = "item" if count == 1 else "items"
+        title = f"{self.name}, " if self.name else ""
+        return f"{title}{count} {noun}: " + ", ".join(self.items)
+
+    def find_by_letter(self, letter):
+        """
+        Find the next item after the focused one whose text starts with a
+        letter, wrapping around. Returns its ID, or 0 if there is none.
+        """
+        letter = letter[:1].lower()
+        count = len(self.items)
+        if not letter or not count:
+            return 0
+
+        start = self.index if self.index else 0
+        for offset in range(1, count + 1):
+            item_id = (start + offset - 1) % count + 1
+            if self.items[item_id - 1][:1].lower() == letter:
+                return item_id
+        return 0
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing menu model...")
+    model = MenuModel()
+    assert model.apply_focus("2|1") == STALE  # No snapshot yet
+    assert model.load_snapshot("1|Main Menu|1|Freeroam|Garage|Options|Quit|Scenarios")
+    assert model.focused_text == "Freeroam"
+    assert model.focus(3) == "Options"
+    assert model.find_by_letter("q") == 4
+    assert model.find_by_letter("f") == 1  # Wraps around
+    assert model.find_by_letter("z") == 0
+    assert model.focus(99) is None and model.index == 3
+    assert model.apply_focus("2|1") == ("Garage", 2, 5)
+    assert model.apply_focus("2|2") == STALE  # Snapshot 2 lost
+    assert model.apply_focus("9|1") == STALE  # Item beyond the snapshot
+    assert model.load_snapshot("3|Main Menu|1|Freeroam|Garage|Options|Quit|Scenarios")
+    assert model.apply_focus("4|2") is None  # Late delta for an older snapshot
+    print(model.read_all())
+    print("Menu model OK")
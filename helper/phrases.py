@@ -0,0 +1,190 @@
+"""
+BeamNG Blind Accessibility Helper - Phrase Templates
+
+The mod sends frequent announcements as a phrase ID plus arguments
+instead of formatted text, so no strings are built in the game's frame
+loop and wording (or language) can be changed here without touching the
+mod.
+
+Payload format (PHRASE message):
+    phraseId (1 byte) | arg1 \\x1f arg2 \\x1f ...
+
+Templates are compiled once at import into literal segments and argument
+slots; each argument is converted by its declared type before rendering.
+"""
+
+import string
+from functools import lru_cache
+
+import config
+import lexicon
+
+ARG_SEPARATOR = "\x1f"
+
+# Friendly names for AI modes (sent as raw mode keys by the mod)
+AI_MODE_NAMES = {
+    "disabled": "disabled",
+    "traffic": "traffic mode",
+    "random": "random exploration",
+    "span": "full map exploration",
+    "chase": "chase mode",
+    "flee": "flee mode",
+    "manual": "waypoint mode",
+    "follow": "follow mode",
+    "stopping": "stopping",
+    "script": "scripted path",
+}
+
+
+def ai_mode_name(mode):
+    """Get the spoken name of an AI mode."""
+    return AI_MODE_NAMES.get(mode, mode)
+
+
+def vehicle_list(summary):
+    """
+    Spoken form of a spawn summary from the mod ("5 sunburst, 3 pickup, and
+    4 others"): each "count vehicleId" item gets the vehicle's friendly name.
+    """
+    items = []
+    for item in summary.split(", "):
+        count, sep, vehicle_id = item.partition(" ")
+        if sep and count.isdigit() and vehicle_id != "others":
+            item = f"{count} {lexicon.friendly_vehicle(vehicle_id)}"
+        items.append(item)
+    return ", ".join(items)
+
+
+# Argument converters by type name
+ARG_TYPES = {
+    "str": str,
+    "int": lambda value: str(int(float(value))),
+    "ai_mode": ai_mode_name,
+    "vehicle": lexicon.friendly_vehicle,
+    "vehicle_list": vehicle_list,
+    "level": lexicon.friendly_level,
+}
+
+# Phrase ID -> (name, template, argument types, kind)
+# kind "alert" interrupts and is kept in the alert history; "status" does not interrupt.
+# IDs must match the PHRASE table in blindAccessibility.lua and stay below 0x80
+# so the payload remains valid UTF-8.
+PHRASE_TABLE = {
+    1: ("ai_enabled", "AI enabled, {0}", ("ai_mode",), "alert"),
+    2: ("ai_disabled", "AI disabled, manual control", (), "alert"),
+    3: ("ai_speed_set", "Speed {0} kilometers per hour", ("int",), "alert"),
+    4: ("ai_speed_max", "Maximum speed, {0} kilometers per hour", ("int",), "alert"),
+    5: ("ai_speed_min", "Minimum speed, {0} kilometers per hour", ("int",), "alert"),
+    6: ("ai_no_vehicle", "No vehicle for AI speed", (), "alert"),
+    7: ("ai_speed", "AI speed {0} kilometers per hour", ("int",), "alert"),
+    8: ("level_loaded", "Level loaded: {0}", ("level",), "alert"),
+    9: ("traffic_cleared", "Traffic cleared", (), "alert"),
+    10: ("traffic_spawned", "Traffic spawned, {0} vehicles", ("int",), "alert"),
+    11: ("traffic_spawned_summary", "Traffic spawned, {0} vehicles: {1}", ("int", "vehicle_list"), "alert"),
+    12: ("vehicle_spawned", "Vehicle spawned: {0}", ("vehicle",), "alert"),
+    13: ("vehicles_spawned", "{0} vehicles spawned: {1}", ("int", "vehicle_list"), "alert"),
+    14: ("vehicle_ai", "{0} AI: {1}", ("vehicle", "ai_mode"), "status"),
+    15: ("loading", "Loading {0}", ("str",), "status"),
+    16: ("loading_complete", "Loading complete", (), "status"),
+}
+
+# Short forms used while the helper is shedding load (phrases not listed keep their template)
+TERSE_TEMPLATES = {
+    1: "AI {0}",
+    2: "Manual",
+    3: "{0}",
+    4: "Max {0}",
+    5: "Min {0}",
+    7: "{0}",
+    8: "{0}",
+    10: "Traffic {0}",
+    11: "Traffic {0}",
+    12: "{0}",
+    13: "{0} spawned",
+    15: "Loading",
+    16: "Loaded",
+}
+
+
+def _compile(template):
+    """Split a template into literal strings and argument slot indices."""
+    parts = []
+    for literal, field, _, _ in string.Formatter().parse(template):
+        if literal:
+            parts.append(literal)
+        if field is not None:
+            parts.append(int(field))
+    return tuple(parts)
+
+
+class Phrase:
+    """A compiled template: literal segments interleaved with argument slots."""
+
+    __slots__ = ("name", "parts", "terse_parts", "converters", "kind")
+
+    def __init__(self, name, template, arg_types, kind, terse_template=None):
+        self.name = name
+        self.kind = kind
+        self.converters = tuple(ARG_TYPES[arg_type] for arg_type in arg_types)
+        self.parts = _compile(template)
+        self.terse_parts = _compile(terse_template) if terse_template else self.parts
+
+    def render(self, args, terse=False):
+        """Render the phrase with a list of raw string arguments."""
+        values = []
+        for i, convert in enumerate(self.converters):
+            values.append(convert(args[i]) if i < len(args) else "")
+        parts = self.terse_parts if terse else self.parts
+        return "".join(part if type(part) is str else values[part] for part in parts)
+
+
+PHRASES = {phrase_id: Phrase(*entry, TERSE_TEMPLATES.get(phrase_id))
+           for phrase_id, entry in PHRASE_TABLE.items()}
+
+
+def render(payload, terse=False):
+    """
+    Render a PHRASE payload. Returns (text, kind), or None if the phrase
+    is unknown or its arguments are invalid. Results are cached, since the
+    same announcements repeat; the lexicon switch is part of the cache key
+    and lexicon.reload() clears the cache.
+    """
+    return _render_cached(payload, terse, config.LEXICON_ENABLED)
+
+
+@lru_cache(maxsize=512)
+def _render_cached(payload, terse, lexicon_enabled):
+    if not payload:
+        return None
+
+    phrase = PHRASES.get(ord(payload[0]))
+    if phrase is None:
+        if config.DEBUG_MODE:
+            print(f"[Phrases] Unknown phrase ID: {ord(payload[0])}")
+        return None
+
+    args = payload[1:].split(ARG_SEPARATOR) if len(payload) > 1 else []
+    try:
+        return phrase.render(args, terse), phrase.kind
+    except ValueError as e:
+        if config.DEBUG_MODE:
+            print(f"[Phrases] Invalid arguments for {phrase.name}: {e}")
+        return None
+
+
+def cache_clear():
+    """Drop cached renders (called by lexicon.reload())."""
+    _render_cached.cache_clear()
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing phrase templates...")
+    print(render("\x01traffic"))
+    print(render("\x03" + "72"))
+    print(render("\x0b12\x1f5 sunburst, 3 pickup, and 4 others"))
+    print(render("\x0epickup\x1fchase"))
+    print(render("\x0b12\x1f5 sunburst, 3 pickup, and 4 others", terse=True))
+    print(render("\x63"))
+    config.LEXICON_ENABLED = False
+    print(render("\x0epickup\x1fchase"))
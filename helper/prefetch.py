@@ -0,0 +1,142 @@
+"""
+BeamNG Blind Accessibility Helper - Speculative Menu Pre-synthesis
+
+When the game forwards the full item list of a menu, the next keypress will
+almost always land next to the focused item. This module renders those
+neighbours into the SAPI utterance cache on a low-priority background
+thread, so arrowing through long lists plays from cache with no synthesis
+delay. Pending work is dropped as soon as focus moves elsewhere.
+"""
+
+import sys
+import threading
+from collections import deque
+
+import config
+import lexicon
+import speech
+
+
+def _lower_thread_priority():
+    """Best-effort: run the calling thread below normal priority."""
+    if sys.platform != "win32":
+        return
+    try:
+        import ctypes
+        kernel32 = ctypes.windll.kernel32
+        THREAD_PRIORITY_LOWEST = -2
+        kernel32.SetThreadPriority(kernel32.GetCurrentThread(), THREAD_PRIORITY_LOWEST)
+    except Exception:
+        pass
+
+
+class SpeculativeRenderer:
+    """Pre-renders the neighbours of the focused menu item."""
+
+    def __init__(self, cache, format_item, distance=None):
+        self.cache = cache
+        self.format_item = format_item
+        self.distance = distance if distance is not None else config.PREFETCH_DISTANCE
+        self.items = []
+        self.prefix = ""   # Output route of the session the menu belongs to
+        self.voice = None
+        self.generation = 0
+        self.pending = deque()
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+        self.rendered = 0
+        self.cancelled = 0
+
+    def start(self):
+        """Start the background rendering thread."""
+        self.running = True
+        self.thread = threading.Thread(target=self._worker_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the background rendering thread."""
+        with self.condition:
+            self.running = False
+            self.pending.clear()
+            self.condition.notify()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+
+    def set_items(self, items, route=None):
+        """
+        Replace the known item list of the current menu. route is the output
+        route of its session (the prefix and voice are part of what is spoken).
+        """
+        with self.condition:
+            self.items = [] if route and route["mute"] else list(items)
+            self.prefix = route["prefix"] if route else ""
+            self.voice = route["voice"] if route else None
+            self._cancel_locked()
+
+    def on_focus(self, index, total):
+        """Focus moved to item index (1-based): queue its neighbours."""
+        with self.condition:
+            self._cancel_locked()
+            if not self.items:
+                return
+
+            count = len(self.items)
+            for offset in range(1, self.distance + 1):
+                for neighbour in (index + offset, index - offset):
+                    if 1 <= neighbour <= count:
+                        # Same text as Session.speak produces, so the cache keys match
+                        text = lexicon.normalize(self.format_item(self.items[neighbour - 1], neighbour, total))
+                        self.pending.append((self.generation, self.prefix + text, self.voice))
+            self.condition.notify()
+
+    def _cancel_locked(self):
+        """Drop queued work from the previous focus (condition must be held)."""
+        self.generation += 1
+        self.cancelled += len(self.pending)
+        self.pending.clear()
+
+    def _worker_loop(self):
+        """Render queued neighbours until stopped."""
+        _lower_thread_priority()
+
+        while True:
+            with self.condition:
+                while self.running and not self.pending:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                generation, text, voice = self.pending.popleft()
+                if generation != self.generation:
+                    continue
+
+            voice, rate = speech.get_render_params(voice)
+            if self.cache.contains(text, voice, rate):
+                continue
+
+            try:
+                self.cache.render(text, voice, rate)
+                self.rendered += 1
+            except Exception as e:
+                if config.DEBUG_MODE:
+                    print(f"[Prefetch] Render failed: {e}")
+
+
+def create(format_item):
+    """
+    Create and start a speculative renderer if the speech backend has a cache.
+    format_item(text, index, total) must be the formatter the focused item is
+    spoken with, so prefetched audio matches it.
+    """
+    if not config.PREFETCH_MENU_NEIGHBOURS:
+        return None
+
+    cache = speech.get_audio_cache()
+    if cache is None:
+        return None
+
+    renderer = SpeculativeRenderer(cache, format_item)
+    renderer.start()
+    print("[Prefetch] Speculative menu pre-synthesis enabled")
+    return renderer
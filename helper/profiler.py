@@ -0,0 +1,253 @@
+"""
+BeamNG Blind Accessibility Helper - Profiling Mode
+
+Low-overhead sampling profiler for a live helper (main.py --profile).
+A background thread samples every thread's stack with
+sys._current_frames() at config.PROFILE_INTERVAL, so the hot path runs
+unmodified (no tracing hooks, no debug prints).
+
+Allocation tracking is opt-in (--profile-memory / config.PROFILE_MEMORY):
+tracemalloc adds work to every allocation and would skew the latencies
+being profiled. When on, it keeps config.PROFILE_TRACEMALLOC_FRAMES frames
+per allocation and snapshots are taken every
+config.PROFILE_SNAPSHOT_INTERVAL to track allocation sites and growth.
+
+Reports are written on shutdown and whenever the process receives
+SIGUSR1 (SIGBREAK / Ctrl+Break on Windows), without stopping the helper:
+    profile-<time>-<n>.txt     Top functions (self and total samples) per
+                               thread, top allocation sites and growth
+    profile-<time>-<n>.folded  Collapsed stacks for flame graph tools
+                               (flamegraph.pl, speedscope)
+"""
+
+import os
+import signal
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+
+import config
+
+
+def _code_key(code):
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples thread stacks (and tracemalloc snapshots, if enabled) in the background."""
+
+    def __init__(self, interval=None, snapshot_interval=None, memory=None):
+        self.interval = interval or config.PROFILE_INTERVAL
+        self.memory = config.PROFILE_MEMORY if memory is None else memory
+        self.started_tracing = False  # tracemalloc was started here (and is stopped here)
+        self.snapshot_interval = snapshot_interval or config.PROFILE_SNAPSHOT_INTERVAL
+        self.stacks = Counter()       # (thread name, frames root..leaf) -> samples
+        self.self_counts = Counter()  # (thread name, function) -> samples at the top of the stack
+        self.total_counts = Counter()  # (thread name, function) -> samples anywhere in the stack
+        self.samples = 0
+        self.dumps = 0
+        self.keys = {}  # Code object -> function label, so samples do not build strings
+        self.started = None
+        self.first_snapshot = None
+        self.last_snapshot = None
+        self.lock = threading.Lock()
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        """Start sampling (and tracemalloc if memory profiling is on, unless already tracing)."""
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start(config.PROFILE_TRACEMALLOC_FRAMES)
+            self.started_tracing = True
+        if tracemalloc.is_tracing():
+            self.first_snapshot = tracemalloc.take_snapshot()
+        self.started = time.time()
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, name="profiler", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop sampling and take a final allocation snapshot."""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+        self._snapshot()
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def _loop(self):
+        own = threading.get_ident()
+        next_snapshot = time.time() + self.snapshot_interval
+        while self.running:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            frames = sys._current_frames()
+            with self.lock:
+                for ident, frame in frames.items():
+                    if ident != own:
+                        self._record(names.get(ident, str(ident)), frame)
+                self.samples += 1
+            del frames
+
+            now = time.time()
+            if now >= next_snapshot:
+                self._snapshot()
+                next_snapshot = now + self.snapshot_interval
+            time.sleep(self.interval)
+
+    def _record(self, thread_name, frame):
+        """Add one stack sample (lock must be held)."""
+        stack = []
+        keys = self.keys
+        while frame is not None:
+            code = frame.f_code
+            key = keys.get(code)
+            if key is None:
+                key = keys[code] = _code_key(code)
+            stack.append(key)
+            frame = frame.f_back
+        stack.reverse()
+
+        self.stacks[(thread_name, tuple(stack))] += 1
+        self.self_counts[(thread_name, stack[-1])] += 1
+        for function in set(stack):
+            self.total_counts[(thread_name, function)] += 1
+
+    def _snapshot(self):
+        if tracemalloc.is_tracing():
+            snapshot = tracemalloc.take_snapshot().filter_traces((
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            ))
+            with self.lock:
+                self.last_snapshot = snapshot
+
+    def report(self, top=None):
+        """Text report: hottest functions per thread and top allocation sites."""
+        top = top or config.PROFILE_TOP
+        with self.lock:
+            samples = self.samples
+            self_counts = Counter(self.self_counts)
+            total_counts = Counter(self.total_counts)
+            first, last = self.first_snapshot, self.last_snapshot
+
+        elapsed = time.time() - (self.started or time.time())
+        lines = [f"Profile: {elapsed:.1f}s, {samples} samples every {self.interval * 1000:.0f} ms", ""]
+
+        threads = sorted({thread for thread, _ in total_counts})
+        for thread in threads:
+            lines.append(f"Thread {thread}")
+            lines.append(f"  {'self':>7} {'total':>7}  function")
+            hottest = sorted(((count, function) for (name, function), count in total_counts.items()
+                              if name == thread), reverse=True)[:top]
+            for total, function in hottest:
+                own = self_counts.get((thread, function), 0)
+                lines.append(f"  {100.0 * own / max(samples, 1):6.1f}% {100.0 * total / max(samples, 1):6.1f}%  {function}")
+            lines.append("")
+
+        if last is not None:
+            lines.append("Top allocation sites (current)")
+            for stat in last.statistics("lineno")[:top]:
+                lines.append(f"  {stat.size / 1024:9.1f} KiB {stat.count:8d} blocks  {stat.traceback[0]}")
+            lines.append("")
+            if first is not None:
+                lines.append("Allocation growth since start")
+                for stat in last.compare_to(first, "lineno")[:top]:
+                    if stat.size_diff <= 0:
+                        continue
+                    lines.append(f"  {stat.size_diff / 1024:+9.1f} KiB {stat.count_diff:+8d} blocks  {stat.traceback[0]}")
+                lines.append("")
+        else:
+            lines.append("Allocation tracking off (enable with --profile-memory)")
+            lines.append("")
+
+        return "\n".join(lines)
+
+    def folded(self):
+        """Collapsed stacks ("thread;frame;frame count" per line)."""
+        with self.lock:
+            stacks = list(self.stacks.items())
+        return "\n".join(f"{thread};{';'.join(stack)} {count}"
+                         for (thread, stack), count in sorted(stacks)) + "\n"
+
+    def dump(self, directory):
+        """Write the report and collapsed stacks. Returns the report path."""
+        self._snapshot()
+        os.makedirs(directory, exist_ok=True)
+        self.dumps += 1
+        base = os.path.join(directory, time.strftime("profile-%Y%m%d-%H%M%S") + f"-{self.dumps}")
+        with open(base + ".txt", "w", encoding="utf-8") as f:
+            f.write(self.report())
+        with open(base + ".folded", "w", encoding="utf-8") as f:
+            f.write(self.folded())
+        return base + ".txt"
+
+
+# Singleton profiler (None unless --profile)
+_profiler = None
+_directory = None
+
+
+def _dump_signal(signum, frame):
+    dump()
+
+
+def start(directory="."):
+    """Start profiling; reports go to directory. Installs the dump signal handler."""
+    global _profiler, _directory
+    _directory = directory
+    _profiler = SamplingProfiler()
+    _profiler.start()
+
+    dump_signal = getattr(signal, "SIGUSR1", None) or getattr(signal, "SIGBREAK", None)
+    if dump_signal is not None:
+        signal.signal(dump_signal, _dump_signal)
+        print(f"[Profile] Sampling every {_profiler.interval * 1000:.0f} ms, "
+              f"send {signal.Signals(dump_signal).name} to write a report")
+    return _profiler
+
+
+def dump():
+    """Write a report for the profile so far (keeps profiling)."""
+    if _profiler is None:
+        return None
+    try:
+        path = _profiler.dump(_directory)
+        print(f"[Profile] Report written to {path}")
+        return path
+    except OSError as e:
+        print(f"[Profile] Could not write report: {e}")
+        return None
+
+
+def stop():
+    """Stop profiling and write the final report."""
+    global _profiler
+    if _profiler is None:
+        return
+    _profiler.stop()
+    dump()
+    _profiler = None
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing profiler...")
+
+    def busy(seconds):
+        end = time.time() + seconds
+        data = []
+        while time.time() < end:
+            data.append(str(len(data)))
+        return data
+
+    profiler = SamplingProfiler(interval=0.002, snapshot_interval=0.5, memory=True)
+    profiler.start()
+    worker = threading.Thread(target=busy, args=(1.0,), name="busy")
+    worker.start()
+    worker.join()
+    profiler.stop()
+    print(profiler.report(top=5))
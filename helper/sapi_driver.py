@@ -0,0 +1,277 @@
+"""
+BeamNG Blind Accessibility Helper - SAPI Driver
+
+Runs the pyttsx3 (SAPI) engine from its own event loop on a dedicated
+thread instead of calling runAndWait() per utterance. Callers post
+commands (say, stop, render to file) to the driver and return at once;
+because the loop keeps running while an utterance plays, a stop command
+cuts off speech immediately.
+
+The engine is created on the driver thread (SAPI's COM objects belong
+to the thread that created them), started with startLoop(False) and
+pumped with iterate(). Word-boundary events are forwarded to registered
+callbacks so callers can track how far an utterance has progressed.
+"""
+
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+
+import config
+
+ITERATE_INTERVAL = 0.01   # Seconds between iterate() calls while speaking
+IDLE_INTERVAL = 0.1       # Seconds to wait for a command while idle
+RENDER_TIMEOUT = 30.0     # Seconds to wait for a render to file
+
+
+def estimate_seconds(text, rate):
+    """Rough spoken duration of an utterance at a words-per-minute rate."""
+    return max(1, len(text.split())) * 60.0 / (rate or config.SPEECH_RATE)
+
+
+class SapiDriver:
+    """Owns a pyttsx3 engine and its event loop thread."""
+
+    def __init__(self, rate=None):
+        self.rate = rate or config.SPEECH_RATE
+        self.default_voice = None
+        self.engine = None
+        self.thread = None
+        self.running = False
+        self.ready = threading.Event()
+        self.error = None
+
+        self.commands = deque()
+        self.wake = threading.Event()
+        self.lock = threading.Lock()
+
+        # Driver thread state
+        self.voice = None              # Voice the engine is set to
+        self.engine_rate = None        # Rate the engine is set to
+        self.next_id = 0
+        self.pending = {}              # Utterance name -> (text, estimated seconds)
+        self.renders = {}              # Utterance name -> [done event, ok]
+        self.current = None            # Name of the utterance being spoken
+        self.word_callbacks = []
+
+    def start(self, timeout=5.0):
+        """Start the driver thread. Returns True once the engine is running."""
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, daemon=True)
+        self.thread.start()
+        self.ready.wait(timeout)
+        if self.engine is None:
+            self.running = False
+            if self.error:
+                raise self.error
+            raise RuntimeError("SAPI engine did not start")
+        return True
+
+    def shutdown(self):
+        """Stop speech and end the event loop."""
+        self.running = False
+        self.wake.set()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+
+    # Commands (any thread, return immediately)
+
+    def _post(self, command):
+        with self.lock:
+            self.commands.append(command)
+        self.wake.set()
+
+    def speak(self, text, voice=None, rate=None, interrupt=False):
+        """Queue an utterance. With interrupt, current and queued speech is stopped first."""
+        if interrupt:
+            self.stop()
+        self._post(("say", text, voice, rate))
+
+    def stop(self):
+        """Stop current speech and drop queued utterances."""
+        with self.lock:
+            # Utterances not yet handed to the engine go along with its queue
+            self.commands = deque(c for c in self.commands if c[0] == "render")
+        self._post(("stop",))
+
+    def render(self, text, voice=None, rate=None, timeout=RENDER_TIMEOUT):
+        """Render text to WAV bytes through the engine (blocks the caller, not the driver)."""
+        fd, path = tempfile.mkstemp(suffix=".wav")
+        os.close(fd)
+        state = [threading.Event(), False]
+        try:
+            self._post(("render", text, voice, rate, path, state))
+            if not state[0].wait(timeout):
+                raise TimeoutError("SAPI render timed out")
+            if not state[1]:
+                raise RuntimeError("SAPI render was cancelled")
+            with open(path, "rb") as f:
+                return f.read()
+        finally:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def add_word_callback(self, callback):
+        """
+        Call callback(text, location, length) at each word boundary of spoken
+        utterances (on the driver thread; keep it short).
+        """
+        self.word_callbacks.append(callback)
+
+    def backlog_seconds(self):
+        """Estimated seconds of speech queued in the engine or waiting to be handed to it."""
+        queued = sum(estimate_seconds(c[1], c[3] or self.rate)
+                     for c in list(self.commands) if c[0] == "say")
+        return queued + sum(seconds for _, seconds in list(self.pending.values()))
+
+    def is_speaking(self):
+        """Whether an utterance is playing or queued."""
+        return bool(self.pending)
+
+    # Driver thread
+
+    def _loop(self):
+        try:
+            import pyttsx3
+            engine = pyttsx3.init()
+            engine.setProperty('rate', self.rate)
+            self.engine_rate = self.rate
+            self.default_voice = self.voice = engine.getProperty('voice')
+            engine.connect('started-utterance', self._on_started)
+            engine.connect('started-word', self._on_word)
+            engine.connect('finished-utterance', self._on_finished)
+            engine.startLoop(False)
+        except Exception as e:
+            self.error = e
+            self.ready.set()
+            return
+
+        self.engine = engine
+        self.ready.set()
+
+        try:
+            while self.running:
+                self._run_commands()
+                engine.iterate()
+                self._check_renders()
+                if self.pending or self.renders or self.commands:
+                    time.sleep(ITERATE_INTERVAL)
+                else:
+                    self.wake.wait(IDLE_INTERVAL)
+                    self.wake.clear()
+        finally:
+            try:
+                engine.stop()
+                engine.endLoop()
+            except Exception as e:
+                if config.DEBUG_MODE:
+                    print(f"[SapiDriver] Error ending loop: {e}")
+            self._finish_renders(False)
+            self.engine = None
+
+    def _run_commands(self):
+        """Hand queued commands to the engine."""
+        while True:
+            with self.lock:
+                if not self.commands:
+                    return
+                command = self.commands.popleft()
+            try:
+                self._run(command)
+            except Exception as e:
+                print(f"[SapiDriver] Error running {command[0]}: {e}")
+                if command[0] == "render":
+                    command[5][0].set()
+
+    def _run(self, command):
+        kind = command[0]
+        if kind == "stop":
+            self.engine.stop()
+            self.pending.clear()
+            self.current = None
+            return
+
+        text, voice, rate = command[1:4]
+        self._apply(voice, rate)
+        self.next_id += 1
+        name = f"u{self.next_id}"
+
+        if kind == "say":
+            self.pending[name] = (text, estimate_seconds(text, self.engine_rate))
+            self.engine.say(text, name)
+        elif kind == "render":
+            self.renders[name] = command[5]
+            self.engine.save_to_file(text, command[4], name)
+
+    def _apply(self, voice, rate):
+        """Switch voice and rate only when they change."""
+        voice = voice or self.default_voice
+        if voice and voice != self.voice:
+            self.engine.setProperty('voice', voice)
+            self.voice = voice
+        rate = rate or self.rate
+        if rate != self.engine_rate:
+            self.engine.setProperty('rate', rate)
+            self.engine_rate = rate
+
+    def _check_renders(self):
+        """
+        Renders normally complete on their finished-utterance event; if the
+        engine went idle without one, the file has been written anyway.
+        """
+        if self.renders and not self.engine.isBusy() and not self.commands:
+            self._finish_renders(True)
+
+    def _finish_renders(self, ok):
+        for state in self.renders.values():
+            state[1] = ok
+            state[0].set()
+        self.renders.clear()
+
+    def _on_started(self, name):
+        self.current = name
+
+    def _on_word(self, name, location, length):
+        utterance = self.pending.get(name)
+        if not utterance:
+            return
+        for callback in self.word_callbacks:
+            try:
+                callback(utterance[0], location, length)
+            except Exception as e:
+                print(f"[SapiDriver] Word callback error: {e}")
+
+    def _on_finished(self, name, completed=True):
+        self.pending.pop(name, None)
+        state = self.renders.pop(name, None)
+        if state:
+            state[1] = True
+            state[0].set()
+        if self.current == name:
+            self.current = None
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing SAPI driver...")
+    driver = SapiDriver()
+    try:
+        driver.start()
+    except Exception as e:
+        print(f"SAPI not available: {e}")
+    else:
+        driver.add_word_callback(lambda text, location, length:
+                                 print(f"  word: {text[location:location + length]}"))
+        started = time.time()
+        driver.speak("This sentence is interrupted before it can finish")
+        print(f"speak returned after {time.time() - started:.3f}s")
+        time.sleep(1.0)
+        driver.speak("Interrupted", interrupt=True)
+        time.sleep(2.0)
+        print(f"Rendered {len(driver.render('Cached phrase'))} bytes")
+        driver.shutdown()
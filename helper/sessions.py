@@ -0,0 +1,271 @@
+"""
+BeamNG Blind Accessibility Helper - Source Sessions
+
+Several game instances (e.g. a driver client and a spectator client) can
+send to the same helper. Each sender gets its own session with its own
+rate limiters, packet queue, worker thread and output
+route, so one busy source never stalls or tramples another.
+
+Sessions are keyed by sender address and can be named with a HELLO
+message carrying a session ID; the name selects the output route from
+config.SESSION_OUTPUTS, and senders on the same host using the same
+session ID (the UDP and TCP transports of one game) share a session. Idle sessions are
+evicted.
+"""
+
+import threading
+import time
+from collections import deque
+
+import config
+import lexicon
+import load_shedding
+import menu_model
+import speech
+import tracing
+import world_state
+
+# Output route used when a session has no entry in config.SESSION_OUTPUTS
+DEFAULT_ROUTE = {
+    "voice": None,       # SAPI voice ID (None = current voice)
+    "prefix": "",        # Spoken before every utterance, e.g. "Spectator: "
+    "interrupt": True,   # Whether this session may interrupt speech
+    "mute": False,       # Drop all speech from this session
+}
+
+
+class Session:
+    """Per-source state, packet queue and output route."""
+
+    def __init__(self, key, addr=None, process=None):
+        self.key = key
+        self.addr = addr
+        self.reply_addr = None  # UDP address requests to the game are sent to
+        self.name = None
+        self.route = dict(DEFAULT_ROUTE)
+        self.process = process  # Callable(data, session) run on the worker thread
+        self.created = time.time()
+        self.last_seen = self.created
+
+        # Handler state (previously global to the listener)
+        self.last_telemetry_time = 0
+        self.last_menu_index = 0
+        self.menu_resync_time = 0.0  # Last MENU_RESYNC request sent
+        self.last_surface = None
+        self.last_vehicle_payload = None
+        self.menu = menu_model.MenuModel()
+        self.world = world_state.WorldState()
+        self.guide = None  # guidance.Guide once the level's road graph has arrived
+
+        # Times the packet being processed was received and dequeued (for tracing)
+        self.received = 0.0
+        self.dequeued = 0.0
+
+        # Packet queue
+        self.queue = deque()
+        self.condition = threading.Condition()
+        self.running = False
+        self.thread = None
+        self.packets = 0
+        self.dropped = 0
+
+    @property
+    def label(self):
+        """Human readable session name for logs."""
+        if self.name:
+            return self.name
+        if self.addr:
+            return f"{self.addr[0]}:{self.addr[1]}"
+        return "default"
+
+    def bind(self, name):
+        """Name the session and apply its configured output route."""
+        self.name = name or None
+        route = dict(DEFAULT_ROUTE)
+        route.update(config.SESSION_OUTPUTS.get(self.name, {}))
+        self.route = route
+
+    def start(self):
+        """Start the worker thread."""
+        self.running = True
+        self.thread = threading.Thread(target=self._worker_loop, daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Stop the worker thread."""
+        with self.condition:
+            self.running = False
+            self.queue.clear()
+            self.condition.notify()
+        if self.thread and self.thread is not threading.current_thread():
+            self.thread.join(timeout=2.0)
+        self.thread = None
+
+    def submit(self, data):
+        """Queue a raw packet for this session (called on the receive thread)."""
+        now = time.time()
+        self.last_seen = now
+
+        with self.condition:
+            if len(self.queue) >= config.SESSION_QUEUE_LIMIT:
+                self.queue.popleft()
+                self.dropped += 1
+            self.queue.append((now, data))
+            self.condition.notify()
+
+    def take_queued(self):
+        """Remove and return every queued packet (as (received, data) pairs)."""
+        with self.condition:
+            queued = list(self.queue)
+            self.queue.clear()
+        return queued
+
+    def requeue(self, queued):
+        """Append packets taken from another session, keeping their receive times."""
+        if not queued:
+            return
+        with self.condition:
+            self.queue.extend(queued)
+            self.condition.notify()
+
+    def has_queued(self, predicate):
+        """Check whether any queued packet matches predicate(data)."""
+        with self.condition:
+            return any(predicate(data) for _, data in self.queue)
+
+    def _worker_loop(self):
+        """Process queued packets until stopped."""
+        controller = load_shedding.get_controller()
+        while True:
+            with self.condition:
+                while self.running and not self.queue:
+                    self.condition.wait()
+                if not self.running:
+                    return
+                received, data = self.queue.popleft()
+                backlog = len(self.queue)
+
+            self.received = received
+            self.dequeued = time.time()
+            controller.observe(self.dequeued - received, backlog)
+            self.packets += 1
+            try:
+                self.process(data, self)
+            except Exception as e:
+                print(f"[Session {self.label}] Error processing packet: {e}")
+
+            if not self.queue:
+                controller.observe_idle()
+
+    def speak(self, text, interrupt=None):
+        """Speak text through this session's output route."""
+        route = self.route
+        if not text or route["mute"]:
+            return False
+
+        if interrupt is None:
+            interrupt = config.INTERRUPT_SPEECH
+        if not route["interrupt"]:
+            interrupt = False
+        text = lexicon.normalize(text)
+        if route["prefix"]:
+            text = route["prefix"] + text
+
+        started = time.time()
+        result = speech.speak(text, interrupt=interrupt, voice=route["voice"])
+        ended = time.time()
+        load_shedding.get_controller().observe_speech(speech.estimate_seconds(text))
+        tracing.span("speak enqueue", started, ended, {"text": text})
+        return result
+
+
+class SessionManager:
+    """Creates, looks up and evicts sessions by sender key."""
+
+    def __init__(self, process):
+        self.process = process
+        self.sessions = {}
+        self.lock = threading.Lock()
+        self.last_eviction = time.time()
+
+    def get(self, key, addr=None):
+        """Get the session for a sender, creating it on first contact."""
+        session = self.sessions.get(key)
+        if session is not None:
+            return session
+
+        with self.lock:
+            session = self.sessions.get(key)
+            if session is None:
+                session = Session(key, addr, self.process)
+                session.start()
+                self.sessions[key] = session
+                print(f"[Sessions] New source: {session.label}")
+        return session
+
+    def bind(self, session, name):
+        """
+        Name a session. If another live session from the same host already
+        has that name (the same game instance on another transport), the
+        sender is merged into it so both transports share one session state.
+
+        Returns the session the sender now belongs to.
+        """
+        if name:
+            host = session.addr[0] if session.addr else None
+            with self.lock:
+                existing = next((s for s in self.sessions.values()
+                                 if s is not session and s.name == name
+                                 and (s.addr[0] if s.addr else None) == host), None)
+                if existing is not None:
+                    for key, value in list(self.sessions.items()):
+                        if value is session:
+                            self.sessions[key] = existing
+                    existing.last_seen = session.last_seen
+            if existing is not None:
+                # Packets queued behind the HELLO continue on the merged session
+                existing.requeue(session.take_queued())
+                session.stop()
+                return existing
+
+        session.bind(name)
+        return session
+
+    def evict_idle(self, now=None):
+        """Stop and remove sessions that have been idle too long."""
+        now = now or time.time()
+        self.last_eviction = now
+
+        with self.lock:
+            idle = [key for key, session in self.sessions.items()
+                    if now - session.last_seen > config.SESSION_IDLE_TIMEOUT]
+            evicted = []
+            for key in idle:
+                session = self.sessions.pop(key)
+                if session not in evicted:
+                    evicted.append(session)
+
+        for session in evicted:
+            session.stop()
+            print(f"[Sessions] Evicted idle source: {session.label}")
+        return len(evicted)
+
+    def maybe_evict(self, now):
+        """Run idle eviction at most every SESSION_EVICT_INTERVAL seconds."""
+        if now - self.last_eviction >= config.SESSION_EVICT_INTERVAL:
+            self.evict_idle(now)
+
+    def backlog(self):
+        """Total number of packets queued across all sessions."""
+        return sum(len(session.queue) for session in list(self.sessions.values()))
+
+    def stop_all(self):
+        """Stop every session."""
+        with self.lock:
+            sessions = list({id(s): s for s in self.sessions.values()}.values())
+            self.sessions.clear()
+        for session in sessions:
+            session.stop()
+
+    def __len__(self):
+        return len({id(s) for s in self.sessions.values()})
@@ -2,36 +2,52 @@
 BeamNG Blind Accessibility Helper - Speech Output Module
 
 Handles text-to-speech output via:
-1. cytolk library (NVDA, JAWS, etc.)
-2. Windows SAPI (fallback via pyttsx3)
+1. cytolk library (NVDA, JAWS, etc.), owned by its own thread for the
+   helper's lifetime (see tolk_driver.py)
+2. Windows SAPI (fallback via pyttsx3), driven from its own event loop
+   thread (see sapi_driver.py), optionally through a cache of
+   pre-rendered utterance audio (see audio_cache.py)
+
+speak() and silence() return immediately on every backend.
+
+Backend modules are imported when a backend is initialized, not at module
+import. init_async() initializes the backend on a background thread so
+the rest of the helper starts meanwhile; speech requested before the
+backend is ready is buffered and spoken as soon as it is.
 """
 
+import threading
+
 import config
 
 # Global state
-_tolk = None
-_sapi_engine = None
+_tolk_driver = None
+_sapi_driver = None
 _current_backend = None
+_audio_cache = None
+_playback = None
+_default_voice = None
+_speech_rate = None  # Overrides config.SPEECH_RATE while set (load shedding)
+
+# Background initialization
+_ready = threading.Event()  # Set once init() has finished (with or without a backend)
+_init_thread = None
+_init_result = False
+_pending = []  # (text, interrupt, voice) requested before the backend was ready
+_pending_lock = threading.Lock()
 
 
 def _init_cytolk():
-    """Initialize cytolk for screen reader access."""
-    global _tolk
+    """Initialize cytolk for screen reader access (on the Tolk driver thread)."""
+    global _tolk_driver
 
     try:
-        import cytolk.tolk as tolk
-        tolk.load()
-        tolk.try_sapi(True)  # Enable SAPI fallback
-
-        if tolk.is_loaded():
-            _tolk = tolk
-            screen_reader = tolk.detect_screen_reader() or "SAPI"
-            print(f"[Speech] cytolk initialized, detected: {screen_reader}")
-            return True
-        else:
-            print("[Speech] cytolk loaded but not active")
-            return False
-
+        import tolk_driver
+        driver = tolk_driver.TolkDriver()
+        driver.start()
+        _tolk_driver = driver
+        print(f"[Speech] cytolk initialized, detected: {driver.screen_reader}")
+        return True
     except ImportError:
         print("[Speech] cytolk not available")
         return False
@@ -42,13 +58,18 @@ def _init_cytolk():
 
 def _init_sapi():
     """Initialize Windows SAPI as fallback."""
-    global _sapi_engine
+    global _sapi_driver, _default_voice
 
     try:
-        import pyttsx3
-        _sapi_engine = pyttsx3.init()
-        _sapi_engine.setProperty('rate', config.SPEECH_RATE)
+        import pyttsx3  # noqa: F401 - checked here, the engine is created on the driver thread
+        import sapi_driver
+        driver = sapi_driver.SapiDriver(config.SPEECH_RATE)
+        driver.start()
+        _sapi_driver = driver
+        _default_voice = driver.default_voice
         print("[Speech] SAPI (pyttsx3) initialized")
+        if config.SAPI_AUDIO_CACHE:
+            _init_audio_cache()
         return True
     except ImportError:
         print("[Speech] pyttsx3 not available")
@@ -58,13 +79,100 @@ def _init_sapi():
         return False
 
 
-def init():
-    """Initialize the speech system."""
+def _init_audio_cache(renderer=None, player=None):
+    """Set up the pre-rendered utterance cache for the SAPI path."""
+    global _audio_cache, _playback
+
+    try:
+        import audio_cache
+        player = player or audio_cache.WinsoundPlayer()
+        _audio_cache = audio_cache.UtteranceCache(
+            renderer or audio_cache.SapiRenderer(_sapi_driver),
+            max_bytes=config.AUDIO_CACHE_MAX_BYTES,
+            cache_dir=config.AUDIO_CACHE_DIR,
+        )
+        _playback = audio_cache.PlaybackQueue(_audio_cache, player)
+        print("[Speech] SAPI utterance cache enabled")
+        return True
+    except ImportError:
+        print("[Speech] Audio playback not available, utterance cache disabled")
+    except Exception as e:
+        print(f"[Speech] Utterance cache error: {e}")
+
+    _audio_cache = None
+    _playback = None
+    return False
+
+
+def get_audio_cache():
+    """Get the SAPI utterance cache (None if disabled)."""
+    return _audio_cache
+
+
+def get_render_params(voice=None):
+    """
+    Get the (voice, rate) pair utterances are cached with. The load shedding
+    rate boost is not part of it, so cached audio keeps playing during overload.
+    """
+    return voice or _default_voice, config.SPEECH_RATE
+
+
+def _speaking_rate(text, voice):
+    """Rate to speak an utterance at: boosted while shedding load, unless it is already cached."""
+    if not _speech_rate or _speech_rate == config.SPEECH_RATE:
+        return config.SPEECH_RATE
+    if _audio_cache is not None and _audio_cache.contains(text, voice, config.SPEECH_RATE):
+        return config.SPEECH_RATE
+    return _speech_rate
+
+
+def set_rate(rate=None):
+    """
+    Set the SAPI speech rate (None = config.SPEECH_RATE) for utterances
+    spoken from now on. Screen readers keep their own rate.
+    """
+    global _speech_rate
+    _speech_rate = int(rate) if rate else None
+
+
+def add_word_callback(callback):
+    """
+    Call callback(text, location, length) at each word boundary while SAPI
+    speaks an utterance (not available through screen readers or the
+    utterance cache). Returns False if word events are not available.
+    """
+    if _sapi_driver is None:
+        return False
+    _sapi_driver.add_word_callback(callback)
+    return True
+
+
+def estimate_seconds(text):
+    """Rough spoken duration of an utterance on the active backend."""
+    if _current_backend == "cytolk":
+        rate = config.SCREEN_READER_RATE
+    else:
+        rate = _speech_rate or config.SPEECH_RATE
+    return max(1, len(text.split())) * 60.0 / rate
+
+
+def backlog_seconds():
+    """Estimated seconds of speech queued but not yet spoken (SAPI or screen reader)."""
+    if _current_backend == "cytolk" and _tolk_driver:
+        return _tolk_driver.backlog_seconds()
+    if _playback:
+        return _playback.backlog_seconds()
+    if _sapi_driver:
+        return _sapi_driver.backlog_seconds()
+    return 0.0
+
+
+def _init_backend():
+    """Initialize the first available backend in order of preference."""
     global _current_backend
 
     preferred = config.SCREEN_READER.lower()
 
-    # Try backends in order of preference
     if preferred in ("auto", "nvda", "jaws"):
         if _init_cytolk():
             _current_backend = "cytolk"
@@ -79,13 +187,61 @@ def init():
     return False
 
 
-def speak(text, interrupt=None):
+def init():
+    """Initialize the speech system, then speak anything buffered meanwhile."""
+    global _init_result
+
+    try:
+        _init_result = _init_backend()
+    finally:
+        with _pending_lock:
+            pending = list(_pending)
+            _pending.clear()
+            _ready.set()
+
+    if _init_result:
+        for text, interrupt, voice in pending:
+            speak(text, interrupt, voice)
+    elif pending:
+        print(f"[Speech] Dropped {len(pending)} utterances requested during startup")
+    return _init_result
+
+
+def init_async():
+    """Start initializing the speech system on a background thread (see wait_ready)."""
+    global _init_thread
+    _init_thread = threading.Thread(target=init, name="speech-init", daemon=True)
+    _init_thread.start()
+
+
+def wait_ready(timeout=None):
+    """Wait for initialization to finish. Returns True if a backend is available."""
+    if not _ready.wait(timeout):
+        return False
+    return _init_result
+
+
+def _buffer(text, interrupt, voice):
+    """Keep speech requested before the backend is ready. Returns False once ready."""
+    with _pending_lock:
+        if _ready.is_set():
+            return False
+        if interrupt:
+            _pending.clear()  # Would have been interrupted anyway
+        elif len(_pending) >= config.SPEECH_STARTUP_BUFFER:
+            _pending.pop(0)
+        _pending.append((text, interrupt, voice))
+        return True
+
+
+def speak(text, interrupt=None, voice=None):
     """
     Speak text through the active screen reader.
 
     Args:
         text: The text to speak
         interrupt: Whether to interrupt current speech (default from config)
+        voice: SAPI voice ID to use (ignored by screen readers)
     """
     if not text:
         return False
@@ -93,18 +249,25 @@ def speak(text, interrupt=None):
     if interrupt is None:
         interrupt = config.INTERRUPT_SPEECH
 
+    if not _ready.is_set() and _buffer(text, interrupt, voice):
+        return True
+
     if config.DEBUG_MODE:
         print(f"[Speech] Speaking: {text}")
 
     try:
-        if _current_backend == "cytolk" and _tolk:
-            return _tolk.output(text, interrupt)
-
-        elif _current_backend == "sapi" and _sapi_engine:
-            if interrupt:
-                _sapi_engine.stop()
-            _sapi_engine.say(text)
-            _sapi_engine.runAndWait()
+        if _current_backend == "cytolk" and _tolk_driver:
+            _tolk_driver.speak(text, interrupt)
+            return True
+
+        elif _current_backend == "sapi" and _playback:
+            voice = voice or _default_voice
+            _playback.submit(text, voice, _speaking_rate(text, voice), interrupt)
+            return True
+
+        elif _current_backend == "sapi" and _sapi_driver:
+            voice = voice or _default_voice
+            _sapi_driver.speak(text, voice, _speech_rate or config.SPEECH_RATE, interrupt)
             return True
 
     except Exception as e:
@@ -115,12 +278,19 @@ def speak(text, interrupt=None):
 
 def silence():
     """Stop current speech."""
+    if not _ready.is_set():
+        with _pending_lock:
+            _pending.clear()
+
     try:
-        if _current_backend == "cytolk" and _tolk:
-            return _tolk.silence()
+        if _current_backend == "cytolk" and _tolk_driver:
+            _tolk_driver.silence()
+            return True
 
-        elif _current_backend == "sapi" and _sapi_engine:
-            _sapi_engine.stop()
+        elif _current_backend == "sapi" and _sapi_driver:
+            if _playback:
+                _playback.stop()
+            _sapi_driver.stop()
             return True
 
     except Exception as e:
@@ -132,9 +302,8 @@ def silence():
 def get_screen_reader():
     """Get the name of the active screen reader."""
     try:
-        if _current_backend == "cytolk" and _tolk:
-            sr = _tolk.detect_screen_reader()
-            return sr if sr else "SAPI"
+        if _current_backend == "cytolk" and _tolk_driver:
+            return _tolk_driver.screen_reader
 
         elif _current_backend == "sapi":
             return "SAPI"
@@ -147,18 +316,26 @@ def get_screen_reader():
 
 def cleanup():
     """Clean up speech resources."""
-    global _tolk, _sapi_engine
+    global _tolk_driver, _sapi_driver, _playback
 
     try:
-        if _tolk:
-            _tolk.unload()
-            _tolk = None
+        if _tolk_driver:
+            _tolk_driver.shutdown()
+            _tolk_driver = None
             print("[Speech] cytolk unloaded")
 
-        if _sapi_engine:
-            _sapi_engine.stop()
+        if _playback:
+            _playback.close()
+            _playback = None
+
+        if _sapi_driver:
+            _sapi_driver.shutdown()
+            _sapi_driver = None
             print("[Speech] SAPI stopped")
 
+        if _audio_cache:
+            print(f"[Speech] Utterance cache: {_audio_cache.stats()}")
+
     except Exception as e:
         print(f"[Speech] Cleanup error: {e}")
 
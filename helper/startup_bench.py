@@ -0,0 +1,162 @@
+"""
+BeamNG Blind Accessibility Helper - Startup Benchmark
+
+Measures how quickly the helper (or the launcher) becomes audible: import
+time per module, initialization time per subsystem and time-to-first-speech
+from process start. Each run uses a fresh interpreter, so nothing is
+already imported.
+
+Usage:
+    python main.py --startup-benchmark
+    python startup_bench.py [--launcher] [--json] [--runs N]
+
+Exits with status 1 when time-to-first-speech is over
+config.STARTUP_SPEECH_BUDGET, so a slow import is caught before release,
+and with status 2 when no speech backend loaded (nothing was timed).
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import subprocess
+import sys
+import time
+
+import config
+
+HELPER_DIR = os.path.dirname(os.path.abspath(__file__))
+LAUNCHER_DIR = os.path.join(os.path.dirname(HELPER_DIR), "launcher")
+
+EXIT_CODES = {"OK": 0, "OVER BUDGET": 1, "NO BACKEND": 2}
+
+# Modules imported by main.py, in import order
+HELPER_MODULES = [
+    "config", "speech", "earcons", "udp_listener", "stream_listener",
+    "hotkeys", "load_shedding", "tracing", "profiler", "gc_control",
+]
+
+
+def _timed(results, name, func, *args):
+    """Run func, appending (name, milliseconds) to results."""
+    started = time.perf_counter()
+    value = func(*args)
+    results.append((name, (time.perf_counter() - started) * 1000.0))
+    return value
+
+
+def _measure_helper(result):
+    """Start the helper's subsystems like main.py does."""
+    imports, inits = result["imports"], result["init"]
+    for name in HELPER_MODULES:
+        _timed(imports, name, importlib.import_module, name)
+
+    speech = sys.modules["speech"]
+    earcons = sys.modules["earcons"]
+    started = time.perf_counter()
+    speech.init_async()
+    if config.EARCONS_ENABLED:
+        _timed(inits, "earcons", earcons.init)
+    result["backend"] = speech.wait_ready()
+    inits.append(("speech (background)", (time.perf_counter() - started) * 1000.0))
+
+    speech.speak("BeamNG Blind Accessibility helper started.")
+    result["first_speech"] = time.time()
+
+    earcons.cleanup()
+    speech.cleanup()
+
+
+def _measure_launcher(result):
+    """Create the launcher and wait until its first prompt is spoken."""
+    sys.path.insert(0, LAUNCHER_DIR)
+    imports, inits = result["imports"], result["init"]
+    module = _timed(imports, "accessible_launcher", importlib.import_module, "accessible_launcher")
+
+    launcher = _timed(inits, "AccessibleLauncher", module.AccessibleLauncher)
+    launcher.speak("BeamNG Accessible Launcher - Main Menu")
+    result["first_prompt"] = time.time()
+    _timed(inits, "screen reader (background)", launcher.tolk_ready.wait)
+    result["backend"] = launcher.tolk_initialized
+    result["first_speech"] = time.time()
+    launcher.cleanup()
+
+
+def _child(target, process_start):
+    """Measure one startup in this (fresh) interpreter and print the result as JSON."""
+    result = {"target": target, "interpreter": (time.time() - process_start) * 1000.0,
+              "imports": [], "init": []}
+    with contextlib.redirect_stdout(io.StringIO()):
+        if target == "launcher":
+            _measure_launcher(result)
+        else:
+            _measure_helper(result)
+
+    for key in ("first_prompt", "first_speech"):
+        if key in result:
+            result[key] = (result[key] - process_start) * 1000.0
+    print(json.dumps(result))
+
+
+def measure(target="helper"):
+    """Run one startup in a fresh interpreter and return its timings (milliseconds)."""
+    process_start = time.time()
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", target, repr(process_start)],
+        cwd=HELPER_DIR, capture_output=True, text=True, check=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def verdict(result, budget_ms):
+    """
+    "OK", "OVER BUDGET", or "NO BACKEND" when no speech backend loaded (the
+    first utterance was never really spoken, so its time means nothing).
+    """
+    if not result["backend"]:
+        return "NO BACKEND"
+    return "OK" if result["first_speech"] <= budget_ms else "OVER BUDGET"
+
+
+def format_report(result, budget_ms):
+    """Human readable report for one measurement."""
+    lines = [f"Startup benchmark ({result['target']})",
+             f"  {'Interpreter start':<32} {result['interpreter']:8.1f} ms"]
+    for name, ms in result["imports"]:
+        lines.append(f"  {'import ' + name:<32} {ms:8.1f} ms")
+    for name, ms in result["init"]:
+        lines.append(f"  {'init ' + name:<32} {ms:8.1f} ms")
+    if "first_prompt" in result:
+        lines.append(f"  {'First prompt printed':<32} {result['first_prompt']:8.1f} ms")
+
+    lines.append(f"  {'First speech':<32} {result['first_speech']:8.1f} ms  "
+                 f"budget {budget_ms:.0f} ms: {verdict(result, budget_ms)}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure time-to-first-speech")
+    parser.add_argument("--launcher", action="store_true", help="Benchmark the launcher instead of the helper")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    parser.add_argument("--runs", type=int, default=3, help="Fresh starts to measure (the fastest is reported)")
+    args = parser.parse_args(argv)
+
+    target = "launcher" if args.launcher else "helper"
+    runs = [measure(target) for _ in range(max(args.runs, 1))]
+    best = min(runs, key=lambda run: run["first_speech"])
+    budget_ms = config.STARTUP_SPEECH_BUDGET * 1000.0
+
+    if args.json:
+        print(json.dumps(dict(best, budget=budget_ms, verdict=verdict(best, budget_ms))))
+    else:
+        print(format_report(best, budget_ms))
+    return EXIT_CODES[verdict(best, budget_ms)]
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--child":
+        _child(sys.argv[2], float(sys.argv[3]))
+    else:
+        sys.exit(main())
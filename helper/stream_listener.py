@@ -0,0 +1,190 @@
+"""
+BeamNG Blind Accessibility Helper - TCP Stream Listener Module
+
+Optional TCP transport for payloads too large for a UDP packet (long
+dialogs, full menu lists). Frames use a 32-bit length so payloads larger
+than 64 KiB arrive intact, and TCP provides flow control. Small events
+keep using UDP.
+
+Frame format:
+    "BNBA" | type (1 byte) | length (4 bytes, big-endian) | payload
+
+Frames are reassembled incrementally from the byte stream and handed to
+the UDP listener's sessions, so both transports share one dispatch path.
+"""
+
+import selectors
+import socket
+import struct
+import threading
+
+import config
+
+HEADER = b"BNBA"
+FRAME_PREFIX_SIZE = 4 + 1 + 4
+_LENGTH = struct.Struct(">I")
+
+
+class FrameReassembler:
+    """Incrementally splits a byte stream into (msg_type, payload) frames."""
+
+    def __init__(self, max_frame=None):
+        self.buffer = bytearray()
+        self.max_frame = max_frame if max_frame is not None else config.TCP_MAX_FRAME
+        self.discarded = 0
+
+    def feed(self, data):
+        """Add received bytes and return the list of completed frames."""
+        self.buffer += data
+        frames = []
+        buffer = self.buffer
+
+        while len(buffer) >= FRAME_PREFIX_SIZE:
+            if buffer[:4] != HEADER:
+                # Lost sync: skip ahead to the next header
+                next_header = buffer.find(HEADER, 1)
+                skip = next_header if next_header > 0 else len(buffer) - 3
+                del buffer[:skip]
+                self.discarded += skip
+                continue
+
+            length = _LENGTH.unpack_from(buffer, 5)[0]
+            if length > self.max_frame:
+                if config.DEBUG_MODE:
+                    print(f"[TCP] Frame too large ({length} bytes), resyncing")
+                del buffer[:4]
+                self.discarded += 4
+                continue
+
+            end = FRAME_PREFIX_SIZE + length
+            if len(buffer) < end:
+                break
+
+            frames.append((buffer[4], bytes(buffer[FRAME_PREFIX_SIZE:end])))
+            del buffer[:end]
+
+        return frames
+
+
+def encode_frame(msg_type, payload):
+    """Build a stream frame (used by tests and tools)."""
+    if isinstance(payload, str):
+        payload = payload.encode("utf-8")
+    return HEADER + bytes([msg_type]) + _LENGTH.pack(len(payload)) + payload
+
+
+class StreamListener:
+    """Accepts TCP connections from BeamNG and reassembles framed messages."""
+
+    def __init__(self, sessions, ip=None, port=None):
+        self.sessions = sessions
+        self.ip = ip or config.UDP_IP
+        self.port = port or config.TCP_PORT
+        self.server = None
+        self.selector = None
+        self.running = False
+        self.thread = None
+
+    def start(self):
+        """Start listening for TCP connections."""
+        try:
+            self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.server.bind((self.ip, self.port))
+            self.server.listen(4)
+            self.server.setblocking(False)
+
+            self.selector = selectors.DefaultSelector()
+            self.selector.register(self.server, selectors.EVENT_READ, None)
+
+            self.running = True
+            self.thread = threading.Thread(target=self._listen_loop, daemon=True)
+            self.thread.start()
+
+            print(f"[TCP] Listening on {self.ip}:{self.port}")
+            return True
+
+        except Exception as e:
+            print(f"[TCP] Failed to start listener: {e}")
+            return False
+
+    def stop(self):
+        """Stop listening and close all connections."""
+        self.running = False
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+        if self.selector:
+            for key in list(self.selector.get_map().values()):
+                key.fileobj.close()
+            self.selector.close()
+            self.selector = None
+        self.server = None
+        print("[TCP] Listener stopped")
+
+    def _listen_loop(self):
+        """Main loop: accept connections and read frames."""
+        while self.running:
+            try:
+                events = self.selector.select(timeout=1.0)
+            except Exception as e:
+                if self.running:
+                    print(f"[TCP] Select error: {e}")
+                continue
+
+            for key, _ in events:
+                if key.data is None:
+                    self._accept()
+                else:
+                    self._read(key.fileobj, key.data)
+
+    def _accept(self):
+        """Accept a new connection."""
+        try:
+            conn, addr = self.server.accept()
+        except BlockingIOError:
+            return
+        conn.setblocking(False)
+        self.selector.register(conn, selectors.EVENT_READ, (addr, FrameReassembler()))
+        print(f"[TCP] Connection from {addr[0]}:{addr[1]}")
+
+    def _read(self, conn, state):
+        """Read from a connection and submit completed frames."""
+        addr, reassembler = state
+        try:
+            data = conn.recv(65536)
+        except BlockingIOError:
+            return
+        except OSError:
+            data = b""
+
+        if not data:
+            self.selector.unregister(conn)
+            conn.close()
+            print(f"[TCP] Connection closed: {addr[0]}:{addr[1]}")
+            return
+
+        frames = reassembler.feed(data)
+        if frames:
+            session = self.sessions.get(("tcp",) + addr, addr)
+            for frame in frames:
+                session.submit(frame)
+
+
+# Singleton instance
+_listener = None
+
+
+def start(sessions):
+    """Start the TCP stream listener, sharing the UDP listener's sessions."""
+    global _listener
+    _listener = StreamListener(sessions)
+    return _listener.start()
+
+
+def stop():
+    """Stop the TCP stream listener."""
+    global _listener
+    if _listener:
+        _listener.stop()
+        _listener = None
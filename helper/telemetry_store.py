@@ -0,0 +1,379 @@
+"""
+BeamNG Blind Accessibility Helper - Telemetry Store
+
+Keeps the full vehicle telemetry history of a driving session on disk for
+post-session review, without growing the helper's heap.
+
+Each session is recorded to its own folder with one memory-mapped file
+per column (raw little-endian arrays, grown by config.TELEMETRY_CHUNK_ROWS
+rows at a time) and meta.json holding the row count, column types and the
+surface names. The handler only queues the raw payload; parsing and
+writing happen in batches on a writer thread.
+
+Columns:
+    time      float64  Receive time (seconds since the epoch)
+    speed     float32  km/h
+    rpm       float32
+    gear      int8     Gear number, 0 = neutral, -1 = reverse, -2 = park, -3 = unknown
+    steering  float32
+    surface   uint8    Index into the surface names in meta.json (0 = none)
+
+TelemetryReader opens a recording zero-copy (np.memmap) for vectorized
+queries such as time above a speed or time spent in each gear.
+"""
+
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+
+import config
+
+# numpy is imported by start() / TelemetryReader, not at module import (startup time)
+np = None
+
+COLUMNS = (
+    ("time", "<f8"),
+    ("speed", "<f4"),
+    ("rpm", "<f4"),
+    ("gear", "i1"),
+    ("steering", "<f4"),
+    ("surface", "u1"),
+)
+
+META_FILE = "meta.json"
+
+GEAR_CODES = {"N": 0, "R": -1, "P": -2}
+GEAR_UNKNOWN = -3
+GEAR_LABELS = {0: "N", -1: "R", -2: "P", GEAR_UNKNOWN: "?"}
+
+
+def _load_numpy():
+    """Import numpy on first use. Returns False if it is not installed."""
+    global np
+    if np is None:
+        try:
+            import numpy
+        except ImportError:
+            return False
+        np = numpy
+    return True
+
+
+def gear_code(gear):
+    """Encode a gear string from the mod ("3", "N", "R", "M2", ...) as a small integer."""
+    gear = gear.strip().upper()
+    if gear in GEAR_CODES:
+        return GEAR_CODES[gear]
+    digits = gear.lstrip("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+    if digits.isdigit() and int(digits) < 128:
+        return int(digits)
+    return GEAR_UNKNOWN
+
+
+def gear_label(code):
+    """Spoken/printed name of a gear code."""
+    return GEAR_LABELS.get(code, str(code))
+
+
+def _column_path(folder, name, dtype):
+    return os.path.join(folder, f"{name}.{dtype.lstrip('<')}")
+
+
+class ColumnWriter:
+    """Appends rows to the memory-mapped column files of one recording."""
+
+    def __init__(self, folder, source=None, chunk_rows=None):
+        self.folder = folder
+        self.source = source
+        self.chunk_rows = chunk_rows or config.TELEMETRY_CHUNK_ROWS
+        self.started = time.time()
+        self.rows = 0
+        self.capacity = 0
+        self.maps = {}
+        self.surfaces = {"": 0}  # Surface name -> code
+        os.makedirs(folder, exist_ok=True)
+        self._grow(self.chunk_rows)
+
+    def _grow(self, minimum):
+        """Extend every column file to hold at least minimum rows (whole chunks)."""
+        capacity = self.capacity
+        while capacity < minimum:
+            capacity += self.chunk_rows
+
+        for name, dtype in COLUMNS:
+            # The old map must be released before the file is resized (Windows)
+            old = self.maps.pop(name, None)
+            if old is not None:
+                old.flush()
+                del old
+            path = _column_path(self.folder, name, dtype)
+            with open(path, "ab") as f:
+                f.truncate(capacity * np.dtype(dtype).itemsize)
+            self.maps[name] = np.memmap(path, dtype=dtype, mode="r+", shape=(capacity,))
+        self.capacity = capacity
+
+    def surface_code(self, surface):
+        """Code for a surface name, assigning the next one on first use."""
+        code = self.surfaces.get(surface)
+        if code is None:
+            code = len(self.surfaces)
+            if code > 255:
+                return 0
+            self.surfaces[surface] = code
+        return code
+
+    def parse(self, received, payload):
+        """Parse a "speed|rpm|gear|steering|surface" payload into a row (None if invalid)."""
+        parts = payload.split('|', 5)
+        if len(parts) < 4:
+            return None
+        try:
+            return (received, float(parts[0]), float(parts[1]), gear_code(parts[2]), float(parts[3]),
+                    self.surface_code(parts[4].strip().lower() if len(parts) > 4 else ""))
+        except ValueError:
+            return None
+
+    def append(self, rows):
+        """Write a batch of parsed rows."""
+        if not rows:
+            return
+        start = self.rows
+        end = start + len(rows)
+        if end > self.capacity:
+            self._grow(end)
+        for (name, _), values in zip(COLUMNS, zip(*rows)):
+            self.maps[name][start:end] = values
+        self.rows = end
+
+    def flush(self):
+        """Flush the columns, then publish the row count (readers never see unwritten rows)."""
+        for column in self.maps.values():
+            column.flush()
+        meta = {
+            "version": 1,
+            "source": self.source,
+            "started": self.started,
+            "rows": self.rows,
+            "columns": dict(COLUMNS),
+            "surfaces": sorted(self.surfaces, key=self.surfaces.get),
+        }
+        path = os.path.join(self.folder, META_FILE)
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(meta, f, indent=1)
+        os.replace(path + ".tmp", path)
+
+    def close(self):
+        """Flush and trim the preallocated tail of each column file."""
+        self.flush()
+        self.maps.clear()
+        for name, dtype in COLUMNS:
+            path = _column_path(self.folder, name, dtype)
+            with open(path, "r+b") as f:
+                f.truncate(self.rows * np.dtype(dtype).itemsize)
+
+
+class TelemetryStore:
+    """Queues telemetry payloads per session and writes them on a background thread."""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.queue = deque(maxlen=config.TELEMETRY_QUEUE_LIMIT)
+        self.writers = {}  # Session -> ColumnWriter
+        self.wake = threading.Event()
+        self.running = False
+        self.thread = None
+        self.samples = 0
+
+    def start(self):
+        """Start the writer thread."""
+        os.makedirs(self.directory, exist_ok=True)
+        self.running = True
+        self.thread = threading.Thread(target=self._write_loop, name="telemetry", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        """Write everything queued and close all recordings."""
+        self.running = False
+        self.wake.set()
+        if self.thread:
+            self.thread.join(timeout=5.0)
+            self.thread = None
+        self._write_batch()
+        for writer in self.writers.values():
+            writer.close()
+            print(f"[Telemetry] Recorded {writer.rows} samples to {writer.folder}")
+        self.writers.clear()
+
+    def append(self, session, received, payload):
+        """Queue a telemetry payload (called on the session worker thread)."""
+        self.queue.append((session, received, payload))
+
+    def _writer(self, session, received):
+        writer = self.writers.get(session)
+        if writer is None:
+            label = re.sub(r"[^\w.-]+", "_", session.label) if session is not None else "default"
+            stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(received))
+            folder = os.path.join(self.directory, f"{stamp}-{label}")
+            writer = self.writers[session] = ColumnWriter(folder, session.label if session else None)
+        return writer
+
+    def _write_batch(self):
+        """Parse and write everything queued, grouped by session."""
+        batches = {}
+        queue = self.queue
+        while queue:
+            session, received, payload = queue.popleft()
+            writer = self._writer(session, received)
+            row = writer.parse(received, payload)
+            if row is not None:
+                batches.setdefault(writer, []).append(row)
+
+        for writer, rows in batches.items():
+            writer.append(rows)
+            self.samples += len(rows)
+
+    def _write_loop(self):
+        next_flush = time.time() + config.TELEMETRY_FLUSH_INTERVAL
+        while self.running:
+            self.wake.wait(config.TELEMETRY_WRITE_INTERVAL)
+            try:
+                self._write_batch()
+                now = time.time()
+                if now >= next_flush:
+                    for writer in list(self.writers.values()):
+                        writer.flush()
+                    next_flush = now + config.TELEMETRY_FLUSH_INTERVAL
+            except Exception as e:
+                print(f"[Telemetry] Write error: {e}")
+
+
+class TelemetryReader:
+    """Zero-copy, read-only view of one recording for vectorized queries."""
+
+    def __init__(self, folder):
+        if not _load_numpy():
+            raise ImportError("numpy is required to read telemetry recordings")
+        self.folder = folder
+        with open(os.path.join(folder, META_FILE), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        self.rows = self.meta["rows"]
+        self.surfaces = self.meta["surfaces"]
+        self._columns = {}
+
+    def column(self, name):
+        """The named column as a read-only array mapped from its file."""
+        values = self._columns.get(name)
+        if values is None:
+            dtype = self.meta["columns"][name]
+            if self.rows:
+                values = np.memmap(_column_path(self.folder, name, dtype), dtype=dtype,
+                                   mode="r", shape=(self.rows,))
+            else:
+                values = np.zeros(0, dtype=dtype)
+            self._columns[name] = values
+        return values
+
+    __getitem__ = column
+
+    def durations(self, max_gap=None):
+        """Seconds each sample stands for (until the next one, at most max_gap)."""
+        times = self.column("time")
+        if not self.rows:
+            return np.zeros(0)
+        gaps = np.diff(times, append=times[-1])
+        return np.clip(gaps, 0.0, max_gap or config.TELEMETRY_MAX_GAP)
+
+    def duration(self):
+        """Total recorded driving time in seconds (pauses longer than TELEMETRY_MAX_GAP excluded)."""
+        return float(self.durations().sum())
+
+    def time_above_speed(self, kmh):
+        """Seconds spent above a speed."""
+        return float(self.durations()[self.column("speed") > kmh].sum())
+
+    def gear_histogram(self):
+        """Seconds spent in each gear: {gear label: seconds}."""
+        return self._histogram(self.column("gear").astype(np.int16) - GEAR_UNKNOWN,
+                               lambda index: gear_label(index + GEAR_UNKNOWN))
+
+    def surface_histogram(self):
+        """Seconds spent on each surface: {surface name: seconds}."""
+        return self._histogram(self.column("surface"), lambda index: self.surfaces[index] or "none")
+
+    def _histogram(self, codes, label):
+        if not self.rows:
+            return {}
+        seconds = np.bincount(codes, weights=self.durations())
+        return {label(index): float(total) for index, total in enumerate(seconds) if total > 0}
+
+
+def list_recordings(directory=None):
+    """Folders of all recordings in a directory, oldest first."""
+    directory = directory or config.TELEMETRY_STORE_DIR
+    if not directory or not os.path.isdir(directory):
+        return []
+    return sorted(entry.path for entry in os.scandir(directory)
+                  if entry.is_dir() and os.path.exists(os.path.join(entry.path, META_FILE)))
+
+
+# Singleton store (None unless recording)
+_store = None
+
+
+def get_store():
+    """Get the active store (None if telemetry is not being recorded)."""
+    return _store
+
+
+def start(directory=None):
+    """Start recording telemetry to directory (default config.TELEMETRY_STORE_DIR)."""
+    global _store
+    directory = directory or config.TELEMETRY_STORE_DIR
+    if not _load_numpy():
+        print("[Telemetry] numpy not available, telemetry recording disabled")
+        return False
+    _store = TelemetryStore(directory)
+    _store.start()
+    print(f"[Telemetry] Recording to {os.path.abspath(directory)}")
+    return True
+
+
+def record(session, received, payload):
+    """Queue a vehicle telemetry payload if recording."""
+    if _store is not None:
+        _store.append(session, received, payload)
+
+
+def stop():
+    """Stop recording and close all recordings."""
+    global _store
+    if _store is not None:
+        _store.stop()
+        _store = None
+
+
+# Test function
+if __name__ == "__main__":
+    import tempfile
+
+    print("Testing telemetry store...")
+    with tempfile.TemporaryDirectory() as directory:
+        config.TELEMETRY_CHUNK_ROWS = 1000
+        start(directory)
+        now = time.time()
+        for i in range(5000):
+            speed = 40 + 60 * (i % 100) / 100
+            record(None, now + i * 0.1, f"{speed:.1f}|{1000 + i % 3000}|{1 + i % 4}|0.0|"
+                                        f"{'asphalt' if i % 50 else 'dirt'}")
+        stop()
+
+        folder = list_recordings(directory)[0]
+        reader = TelemetryReader(folder)
+        print(f"{reader.rows} samples, {reader.duration():.1f} s")
+        print(f"Above 80 km/h: {reader.time_above_speed(80):.1f} s")
+        print(f"Gears: {reader.gear_histogram()}")
+        print(f"Surfaces: {reader.surface_histogram()}")
+        del reader
@@ -0,0 +1,149 @@
+"""
+Allocation regression test for the packet hot path
+
+Replays a steady-state packet mix (menu focus moves, state updates,
+phrases, earcons, status, telemetry) through the listener and checks
+that processing a packet neither retains memory nor allocates much on
+the way: the growth in allocated memory blocks (sys.getallocatedblocks,
+with tracemalloc off so its bookkeeping is not counted), the memory
+retained (tracemalloc), and the transient allocations of each packet
+(the tracemalloc peak while it is processed, so objects allocated and
+freed within a handler still count).
+
+Run with pytest or directly: python test_allocations.py
+"""
+
+import gc
+import sys
+import tracemalloc
+
+import config
+import speech
+import udp_listener
+import sessions
+
+ROUNDS = 200
+
+# Upper bounds per replayed packet once caches are warm
+MAX_ALLOCATED_BLOCKS_PER_PACKET = 0.1
+MAX_RETAINED_BYTES_PER_PACKET = 16
+MAX_RETAINED_BLOCKS_PER_PACKET = 0.1
+MAX_TRANSIENT_BYTES_PER_PACKET = 2 * 1024  # Allocated while one packet is processed, freed or not
+MAX_PEAK_BYTES = 4 * 1024  # Largest transient allocation above the baseline
+
+
+def make_packet(msg_type, payload):
+    """Build a UDP packet like the mod does."""
+    payload = payload.encode("utf-8")
+    return b"BNBA" + bytes([msg_type, len(payload) >> 8, len(payload) & 0xFF]) + payload
+
+
+SNAPSHOT = make_packet(config.MSG_TYPE_MENU_ITEMS, "1|Main Menu|1|Freeroam|Garage|Options|Quit|Scenarios")
+
+PACKET_MIX = [
+    make_packet(config.MSG_TYPE_MENU_FOCUS, "2|1"),
+    make_packet(config.MSG_TYPE_MENU_FOCUS, "3|1"),
+    make_packet(config.MSG_TYPE_STATE, "traffic|12"),
+    make_packet(config.MSG_TYPE_STATE, "ai_mode|traffic"),
+    make_packet(config.MSG_TYPE_PHRASE, "\x01traffic"),
+    make_packet(config.MSG_TYPE_PHRASE, "\x0a12"),
+    make_packet(config.MSG_TYPE_PHRASE, "\x0epickup\x1fchase"),
+    make_packet(config.MSG_TYPE_MENU_FOCUS, "4|1"),
+    make_packet(config.MSG_TYPE_EARCON, "list_boundary"),
+    make_packet(config.MSG_TYPE_STATUS, "Loading complete"),
+    make_packet(config.MSG_TYPE_VEHICLE, "72.5|3200|3|0.1|asphalt"),
+    make_packet(config.MSG_TYPE_MENU, "Back|5|5"),
+]
+
+
+def replay(listener, session, rounds, transient=None):
+    """
+    Replay the packet mix. With transient (a list), also record the
+    tracemalloc peak above the starting point of each packet.
+    """
+    process = listener._process_item
+    for _ in range(rounds):
+        for packet in PACKET_MIX:
+            # Each received packet is a new bytes object, as from the socket
+            packet = bytes(packet)
+            if transient is None:
+                process(packet, session)
+                continue
+            start = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            process(packet, session)
+            transient.append(tracemalloc.get_traced_memory()[1] - start)
+
+
+def measure(rounds=ROUNDS):
+    """
+    Replay the packet mix. Returns per packet: allocated blocks, retained
+    bytes and blocks, and the largest transient allocation; plus the peak
+    bytes of the whole run.
+    """
+    original_speak = speech.speak
+    debug = config.DEBUG_MODE
+    speech.speak = lambda text, interrupt=None, voice=None: True
+    config.DEBUG_MODE = False
+    packets = rounds * len(PACKET_MIX)
+    try:
+        listener = udp_listener.UDPListener()
+        session = sessions.Session(None)
+        listener._process_item(SNAPSHOT, session)
+        replay(listener, session, 5)  # Warm caches
+
+        gc.collect()
+        blocks_before = sys.getallocatedblocks()
+        replay(listener, session, rounds)
+        allocated = sys.getallocatedblocks() - blocks_before
+
+        gc.collect()
+        tracemalloc.start(1)
+        try:
+            before = tracemalloc.take_snapshot()
+            baseline = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+            replay(listener, session, rounds)
+            current, peak = tracemalloc.get_traced_memory()
+            after = tracemalloc.take_snapshot()
+
+            transient = []
+            replay(listener, session, rounds, transient)
+        finally:
+            tracemalloc.stop()
+    finally:
+        speech.speak = original_speak
+        config.DEBUG_MODE = debug
+
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "lineno")
+                 if tracemalloc.__file__ not in str(stat.traceback))
+    return {
+        "allocated_blocks": allocated / packets,
+        "retained_bytes": (current - baseline) / packets,
+        "retained_blocks": blocks / packets,
+        "transient_bytes": max(transient),
+        "peak_bytes": peak - baseline,
+    }
+
+
+def test_steady_state_allocations():
+    result = measure()
+    assert result["allocated_blocks"] <= MAX_ALLOCATED_BLOCKS_PER_PACKET, \
+        f"{result['allocated_blocks']:.2f} blocks allocated per packet"
+    assert result["retained_bytes"] <= MAX_RETAINED_BYTES_PER_PACKET, \
+        f"{result['retained_bytes']:.1f} bytes retained per packet"
+    assert result["retained_blocks"] <= MAX_RETAINED_BLOCKS_PER_PACKET, \
+        f"{result['retained_blocks']:.2f} blocks retained per packet"
+    assert result["transient_bytes"] <= MAX_TRANSIENT_BYTES_PER_PACKET, \
+        f"{result['transient_bytes']} bytes allocated while processing one packet"
+    assert result["peak_bytes"] <= MAX_PEAK_BYTES, f"{result['peak_bytes']} bytes peak transient allocation"
+
+
+if __name__ == "__main__":
+    result = measure()
+    print(f"{ROUNDS * len(PACKET_MIX)} packets: {result['allocated_blocks']:.2f} blocks allocated, "
+          f"{result['retained_bytes']:.1f} bytes and {result['retained_blocks']:.2f} blocks retained "
+          f"per packet, {result['transient_bytes']} bytes transient per packet, "
+          f"{result['peak_bytes']} bytes peak")
+    test_steady_state_allocations()
+    print("Allocation test OK")
@@ -0,0 +1,188 @@
+"""
+BeamNG Blind Accessibility Helper - Tolk Driver
+
+Runs cytolk (Tolk: NVDA, JAWS, SAPI fallback) on one dedicated thread for
+the helper's whole lifetime. Tolk talks to screen readers through COM,
+and COM objects belong to the thread that created them, so load, output,
+is_speaking, silence and unload all happen on the driver thread. Callers
+post commands and return at once.
+
+Screen readers keep their own queue and do not report how much of it is
+left, so the driver publishes an estimate for load shedding: the time the
+reader should be done with everything requested so far, corrected by
+polling is_speaking on the driver thread while it is busy.
+"""
+
+import threading
+import time
+from collections import deque
+
+import config
+
+IDLE_INTERVAL = 0.1       # Seconds to wait for a command (and between is_speaking polls)
+
+
+def estimate_seconds(text, rate=None):
+    """Rough time a screen reader takes to say an utterance."""
+    return max(1, len(text.split())) * 60.0 / (rate or config.SCREEN_READER_RATE)
+
+
+class TolkDriver:
+    """Owns cytolk and its thread from load() to unload()."""
+
+    def __init__(self):
+        self.thread = None
+        self.running = False
+        self.ready = threading.Event()
+        self.error = None
+        self.screen_reader = None      # Detected at load ("SAPI" when none)
+
+        self.commands = deque()
+        self.wake = threading.Event()
+        self.lock = threading.Lock()
+
+        # Published by the driver thread and speak(), read by backlog_seconds()
+        self.busy_until = 0.0          # Estimated end of everything requested so far
+        self.speaking = None           # Last is_speaking() answer (None: not reported)
+
+    def start(self, timeout=5.0):
+        """Start the driver thread. Returns True once Tolk is loaded and active."""
+        self.running = True
+        self.thread = threading.Thread(target=self._loop, name="speech-tolk", daemon=True)
+        self.thread.start()
+        self.ready.wait(timeout)
+        if self.screen_reader is None:
+            self.running = False
+            self.wake.set()
+            if self.error:
+                raise self.error
+            raise RuntimeError("Tolk did not start")
+        return True
+
+    def shutdown(self):
+        """Stop the loop; Tolk is unloaded on the driver thread."""
+        self.running = False
+        self.wake.set()
+        if self.thread:
+            self.thread.join(timeout=2.0)
+            self.thread = None
+
+    # Commands (any thread, return immediately)
+
+    def _post(self, command):
+        with self.lock:
+            self.commands.append(command)
+        self.wake.set()
+
+    def speak(self, text, interrupt=False):
+        """
+        Queue an utterance. With interrupt, utterances not yet handed to the
+        reader are dropped. Interrupted speech still counts towards the
+        backlog: requests arriving faster than the reader can say them mean
+        the helper is behind, even if the reader cuts them short.
+        """
+        now = time.time()
+        with self.lock:
+            if interrupt:
+                self.commands = deque(c for c in self.commands if c[0] != "output")
+            self.commands.append(("output", text, interrupt))
+            self.busy_until = max(self.busy_until, now) + estimate_seconds(text)
+        self.wake.set()
+
+    def silence(self):
+        """Stop current speech and drop queued utterances."""
+        with self.lock:
+            self.commands = deque(c for c in self.commands if c[0] != "output")
+            self.commands.append(("silence",))
+            self.busy_until = 0.0
+        self.wake.set()
+
+    def backlog_seconds(self):
+        """Estimated seconds of speech the screen reader has not said yet."""
+        now = time.time()
+        with self.lock:
+            remaining = self.busy_until - now
+            if remaining <= 0.0 and self.speaking:
+                # Still talking past the estimate: the reader is slower than assumed
+                return now - self.busy_until
+            return max(remaining, 0.0)
+
+    # Driver thread
+
+    def _loop(self):
+        try:
+            import cytolk.tolk as tolk
+            tolk.load()
+            tolk.try_sapi(True)  # Enable SAPI fallback
+            if not tolk.is_loaded():
+                tolk.unload()
+                raise RuntimeError("cytolk loaded but not active")
+            self.screen_reader = tolk.detect_screen_reader() or "SAPI"
+        except Exception as e:
+            self.error = e
+            self.ready.set()
+            return
+
+        self.ready.set()
+        try:
+            while self.running:
+                self._run_commands(tolk)
+                self._poll(tolk)
+                self.wake.wait(IDLE_INTERVAL)
+                self.wake.clear()
+        finally:
+            try:
+                tolk.unload()
+            except Exception as e:
+                if config.DEBUG_MODE:
+                    print(f"[TolkDriver] Error unloading: {e}")
+
+    def _run_commands(self, tolk):
+        """Hand queued commands to Tolk."""
+        while True:
+            with self.lock:
+                if not self.commands:
+                    return
+                command = self.commands.popleft()
+            try:
+                if command[0] == "output":
+                    tolk.output(command[1], command[2])
+                elif command[0] == "silence":
+                    tolk.silence()
+            except Exception as e:
+                print(f"[TolkDriver] Error running {command[0]}: {e}")
+
+    def _poll(self, tolk):
+        """Publish whether the reader is still talking while it should be busy."""
+        with self.lock:
+            busy = self.speaking or self.busy_until > time.time()
+        if not busy:
+            return
+        try:
+            speaking = tolk.is_speaking()
+        except Exception:
+            speaking = None  # Not every screen reader reports it
+        with self.lock:
+            self.speaking = speaking
+            if speaking is False:
+                self.busy_until = time.time()  # Caught up
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing Tolk driver...")
+    driver = TolkDriver()
+    try:
+        driver.start()
+    except Exception as e:
+        print(f"Tolk not available: {e}")
+    else:
+        print(f"Screen reader: {driver.screen_reader}")
+        started = time.time()
+        driver.speak("This sentence is interrupted before it can finish")
+        print(f"speak returned after {time.time() - started:.3f}s")
+        time.sleep(1.0)
+        driver.speak("Interrupted", interrupt=True)
+        print(f"Backlog: {driver.backlog_seconds():.2f}s")
+        time.sleep(2.0)
+        driver.shutdown()
@@ -0,0 +1,234 @@
+"""
+BeamNG Blind Accessibility Helper - End-to-End Tracing
+
+Follows each event from the UI app through the game extension to speech
+and exports the spans as Chrome trace-event JSON (open the file in
+chrome://tracing or https://ui.perfetto.dev).
+
+When tracing is enabled in the mod (setConfig({trace = true})), traced
+packets have MSG_FLAG_TRACE set in their type byte and their payload
+starts with a trace header carrying a correlation ID and the times the
+event passed each stage, in milliseconds since the epoch:
+
+    id;stage=ms,stage=ms,...\\x1e<payload>
+
+UI events (IDs "u<n>") carry input/poll, created, sent (debounce fired)
+and flush (engineLua batch) from app.js, then lua (handler entered) and
+send from blindAccessibility.lua. Events raised in Lua (IDs "l<n>")
+carry created and send. The helper adds receive, queue, parse, handler
+and "speak enqueue" spans (speech.speak only queues the utterance; the
+output itself is not timed); packets without a header get a local ID ("h<n>") and
+helper spans only. All stages use the wall clock (Date.now(),
+socket.gettime(), time.time()), so they line up on one machine.
+"""
+
+import json
+import threading
+import time
+from collections import deque
+
+import config
+
+TRACE_SEPARATOR = "\x1e"
+
+GAME_PID = 1
+HELPER_PID = 2
+UI_TID = 1
+LUA_TID = 2
+TRANSPORT_TID = 1
+
+# Span ending at each remote stage, and the game thread it ran on
+STAGE_SPANS = {
+    "created": ("detect", UI_TID),         # Key press / previous poll -> event created
+    "sent": ("debounce", UI_TID),          # Debounce timer
+    "flush": ("batch", UI_TID),            # Waiting for the per-frame engineLua batch
+    "lua": ("engineLua", LUA_TID),         # engineLua compile and GE frame
+    "send": ("lua handler", LUA_TID),      # Lua handler up to the UDP/TCP send
+}
+
+MSG_TYPE_NAMES = {value: name[len("MSG_TYPE_"):].lower()
+                  for name, value in vars(config).items() if name.startswith("MSG_TYPE_")}
+
+_local = threading.local()  # Trace being handled on this thread
+
+
+def parse_header(header):
+    """Parse "id;stage=ms,..." into (id, [(stage, seconds), ...]) in stage order."""
+    trace_id, _, stamps = header.partition(";")
+    parsed = []
+    for stamp in stamps.split(","):
+        stage, sep, ms = stamp.partition("=")
+        if sep:
+            try:
+                parsed.append((stage, float(ms) / 1000.0))
+            except ValueError:
+                pass
+    return trace_id, parsed
+
+
+def _us(seconds):
+    """Trace timestamps are microseconds."""
+    return round(seconds * 1e6, 1)
+
+
+class Tracer:
+    """Collects trace events in memory and writes them as Chrome trace JSON."""
+
+    def __init__(self, max_events=None):
+        self.events = deque(maxlen=max_events or config.TRACE_MAX_EVENTS)
+        self.metadata = []  # Process/thread names, kept outside the ring so they are never evicted
+        self.thread_names = set()
+        self.next_id = 0
+        self.lock = threading.Lock()
+
+        self._name(GAME_PID, None, "BeamNG")
+        self._name(GAME_PID, UI_TID, "UI app")
+        self._name(GAME_PID, LUA_TID, "GE Lua")
+        self._name(HELPER_PID, None, "Helper")
+        self._name(HELPER_PID, TRANSPORT_TID, "Transport")
+
+    def _name(self, pid, tid, name):
+        """Add a process or thread name metadata event."""
+        if tid is None:
+            self.metadata.append({"ph": "M", "name": "process_name", "pid": pid, "tid": 0,
+                                  "args": {"name": name}})
+        else:
+            self.metadata.append({"ph": "M", "name": "thread_name", "pid": pid, "tid": tid,
+                                  "args": {"name": name}})
+
+    def complete(self, name, start, end, pid, tid, trace_id=None, args=None):
+        """Record a complete ("X") span."""
+        event = {"ph": "X", "name": name, "cat": "stage", "pid": pid, "tid": tid,
+                 "ts": _us(start), "dur": _us(max(end - start, 0.0))}
+        if trace_id or args:
+            event["args"] = dict(args or {}, id=trace_id)
+        self.events.append(event)
+
+    def begin(self, header, msg_type, session):
+        """
+        Start handling a packet on this thread: record the remote stages and
+        the helper's receive, queue and parse spans.
+        """
+        now = time.time()
+        if header:
+            trace_id, stamps = parse_header(header)
+        else:
+            trace_id, stamps = None, []
+        if not trace_id:
+            with self.lock:
+                self.next_id += 1
+                trace_id = f"h{self.next_id}"
+
+        tid = threading.get_ident()
+        if tid not in self.thread_names:
+            self.thread_names.add(tid)
+            self._name(HELPER_PID, tid, f"Session {session.label}")
+
+        for (_, start), (stage, end) in zip(stamps, stamps[1:]):
+            name, game_tid = STAGE_SPANS.get(stage, (stage, LUA_TID))
+            self.complete(name, start, end, GAME_PID, game_tid, trace_id)
+
+        received = session.received or now
+        dequeued = session.dequeued or now
+        if stamps:
+            self.complete("receive", stamps[-1][1], received, HELPER_PID, TRANSPORT_TID, trace_id)
+        self.complete("queue", received, dequeued, HELPER_PID, tid, trace_id)
+        self.complete("parse", dequeued, now, HELPER_PID, tid, trace_id)
+
+        name = MSG_TYPE_NAMES.get(msg_type, str(msg_type))
+        started = stamps[0][1] if stamps else received
+        self.events.append({"ph": "b", "name": name, "cat": "event", "id": trace_id,
+                            "pid": HELPER_PID, "tid": tid, "ts": _us(started)})
+        _local.trace = (trace_id, name, tid, now)
+
+    def end(self):
+        """Finish handling the current packet: record the handler span."""
+        trace = getattr(_local, "trace", None)
+        if trace is None:
+            return
+        trace_id, name, tid, started = trace
+        now = time.time()
+        self.complete("handler", started, now, HELPER_PID, tid, trace_id)
+        self.events.append({"ph": "e", "name": name, "cat": "event", "id": trace_id,
+                            "pid": HELPER_PID, "tid": tid, "ts": _us(now)})
+        _local.trace = None
+
+    def span(self, name, start, end, args=None):
+        """Record a span inside the packet being handled on this thread."""
+        trace = getattr(_local, "trace", None)
+        if trace is None:
+            self.complete(name, start, end, HELPER_PID, threading.get_ident(), None, args)
+        else:
+            self.complete(name, start, end, HELPER_PID, trace[2], trace[0], args)
+
+    def export(self, path):
+        """Write all events as Chrome trace JSON."""
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"traceEvents": self.metadata + list(self.events), "displayTimeUnit": "ms"}, f)
+        return len(self.metadata) + len(self.events)
+
+
+# Singleton tracer (None while tracing is off)
+_tracer = None
+_path = None
+
+
+def get_tracer():
+    """Get the active tracer, or None if tracing is off."""
+    return _tracer
+
+
+def start(path):
+    """Start collecting spans; they are written to path by stop()."""
+    global _tracer, _path
+    _tracer = Tracer()
+    _path = path
+    print(f"[Trace] Recording to {path}")
+    return _tracer
+
+
+def span(name, start, end, args=None):
+    """Record a span for the packet being handled on this thread (no-op when off)."""
+    if _tracer is not None:
+        _tracer.span(name, start, end, args)
+
+
+def stop():
+    """Write the trace file and stop tracing."""
+    global _tracer
+    if _tracer is None:
+        return
+    try:
+        count = _tracer.export(_path)
+        print(f"[Trace] Wrote {count} events to {_path}")
+    except OSError as e:
+        print(f"[Trace] Could not write {_path}: {e}")
+    _tracer = None
+
+
+# Test function
+if __name__ == "__main__":
+    import tempfile
+    import os
+
+    class _Session:
+        label = "test"
+        received = dequeued = 0.0
+
+    print("Testing tracing...")
+    tracer = Tracer()
+    now = time.time()
+    session = _Session()
+    session.received, session.dequeued = now - 0.004, now - 0.001
+    ms = now * 1000
+    header = f"u1;input={ms - 180:.1f},created={ms - 120:.1f},sent={ms - 70:.1f}," \
+             f"flush={ms - 60:.1f},lua={ms - 30:.1f},send={ms - 28:.1f}"
+    tracer.begin(header, config.MSG_TYPE_MENU_FOCUS, session)
+    tracer.span("speak enqueue", time.time(), time.time() + 0.002)
+    tracer.end()
+
+    path = os.path.join(tempfile.gettempdir(), "beamng_trace_test.json")
+    print(f"Wrote {tracer.export(path)} events to {path}")
+    for event in tracer.events:
+        if event["ph"] == "X":
+            print(f"  {event['name']:<12} {event['dur'] / 1000:7.2f} ms")
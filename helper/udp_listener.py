@@ -2,14 +2,28 @@
 BeamNG Blind Accessibility Helper - UDP Listener Module
 
 Listens for UDP packets from the BeamNG mod and processes them.
+Packets are demultiplexed by sender into sessions (see sessions.py), so
+several game instances can share one helper.
 """
 
 import socket
 import struct
 import threading
 import time
+from functools import lru_cache
+
 import config
+import gc_control
+import guidance
 import speech
+import prefetch
+import earcons
+import load_shedding
+import menu_model
+import phrases
+import sessions
+import telemetry_store
+import tracing
 
 # Protocol constants
 HEADER = b"BNBA"
@@ -18,6 +32,27 @@ TYPE_SIZE = 1
 LENGTH_SIZE = 2
 
 
+# Menu updates that can be merged (only the newest is spoken) while shedding load
+MERGEABLE_TYPES = (config.MSG_TYPE_MENU, config.MSG_TYPE_MENU_FOCUS)
+
+
+@lru_cache(maxsize=1024)
+def format_menu_item(text, index, total):
+    """Format a menu item announcement with its position (cached: focus moves repeat)."""
+    return f"{text}, {index} of {total}"
+
+
+def packet_type(item):
+    """Message type of a queued session item (raw UDP packet or stream frame)."""
+    if type(item) is tuple:
+        return item[0] & ~config.MSG_FLAG_TRACE
+    return item[HEADER_SIZE] & ~config.MSG_FLAG_TRACE if len(item) > HEADER_SIZE else None
+
+
+def _is_mergeable(item):
+    return packet_type(item) in MERGEABLE_TYPES
+
+
 class UDPListener:
     """Listens for accessibility packets from BeamNG."""
 
@@ -27,13 +62,28 @@ class UDPListener:
         self.socket = None
         self.running = False
         self.thread = None
-        self.last_telemetry_time = 0
+        self.sessions = sessions.SessionManager(self._process_item)
+        self.default_session = sessions.Session(None)
+        self.prefetcher = None
+        self.buffer = bytearray(config.BUFFER_SIZE)  # Reused receive buffer
+        self.view = memoryview(self.buffer)
+        self.payloads = {}  # Packet bytes -> decoded payload, so repeated packets decode once
+        self.shedder = load_shedding.get_controller()
+        self.active_session = None  # Session local status and menu queries are answered from
         self.callbacks = {
             config.MSG_TYPE_MENU: self._handle_menu,
             config.MSG_TYPE_VEHICLE: self._handle_vehicle,
             config.MSG_TYPE_ALERT: self._handle_alert,
             config.MSG_TYPE_DIALOG: self._handle_dialog,
             config.MSG_TYPE_STATUS: self._handle_status,
+            config.MSG_TYPE_MENU_ITEMS: self._handle_menu_snapshot,
+            config.MSG_TYPE_MENU_FOCUS: self._handle_menu_focus,
+            config.MSG_TYPE_EARCON: self._handle_earcon,
+            config.MSG_TYPE_HELLO: self._handle_hello,
+            config.MSG_TYPE_STATE: self._handle_state,
+            config.MSG_TYPE_PHRASE: self._handle_phrase,
+            config.MSG_TYPE_ROAD_GRAPH: self._handle_road_graph,
+            config.MSG_TYPE_POSITION: self._handle_position,
         }
 
     def start(self):
@@ -44,6 +94,8 @@ class UDPListener:
             self.socket.bind((self.ip, self.port))
             self.socket.settimeout(1.0)  # Allow periodic checks for stop signal
 
+            self.prefetcher = prefetch.create(self._menu_item_text)
+
             self.running = True
             self.thread = threading.Thread(target=self._listen_loop, daemon=True)
             self.thread.start()
@@ -63,22 +115,52 @@ class UDPListener:
         if self.socket:
             self.socket.close()
             self.socket = None
+        self.sessions.stop_all()
+        if self.prefetcher:
+            self.prefetcher.stop()
+            self.prefetcher = None
         print("[UDP] Listener stopped")
 
     def _listen_loop(self):
         """Main listening loop."""
         while self.running:
             try:
-                data, addr = self.socket.recvfrom(config.BUFFER_SIZE)
-                self._process_packet(data)
+                # recvfrom() would allocate a full-size buffer per packet
+                nbytes, addr = self.socket.recvfrom_into(self.buffer)
+                session = self.sessions.get(addr, addr)
+                session.reply_addr = addr
+                session.submit(self.view[:nbytes].tobytes())
+                self.sessions.maybe_evict(time.time())
             except socket.timeout:
+                self.sessions.maybe_evict(time.time())
+                if not self.sessions.backlog():
+                    # Let load shedding recover and collect garbage while nothing is arriving
+                    if self.shedder.level:
+                        self.shedder.observe_idle()
+                    gc_control.collect_idle()
                 continue
             except Exception as e:
                 if self.running:
                     print(f"[UDP] Error receiving: {e}")
 
-    def _process_packet(self, data):
-        """Process a received packet."""
+    def _process_item(self, item, session):
+        """Process a queued session item: a raw UDP packet or a (type, payload) stream frame."""
+        # Under load, a menu update superseded by a queued one is not spoken
+        if self.shedder.merges_menus() and _is_mergeable(item) and session.has_queued(_is_mergeable):
+            self.shedder.record_shed("menu_merged")
+            return
+
+        if type(item) is tuple:
+            msg_type, payload = item
+            self._dispatch(msg_type, payload.decode('utf-8', errors='replace'), session)
+        else:
+            self._process_packet(item, session)
+
+    def _process_packet(self, data, session=None):
+        """Process a received packet for a session (default session if None)."""
+        if session is None:
+            session = self.default_session
+
         if len(data) < HEADER_SIZE + TYPE_SIZE + LENGTH_SIZE:
             if config.DEBUG_MODE:
                 print(f"[UDP] Packet too short: {len(data)} bytes")
@@ -95,21 +177,45 @@ class UDPListener:
         msg_type = data[HEADER_SIZE]
         length = (data[HEADER_SIZE + 1] << 8) | data[HEADER_SIZE + 2]
 
-        # Extract payload
-        payload_start = HEADER_SIZE + TYPE_SIZE + LENGTH_SIZE
-        payload = data[payload_start:payload_start + length].decode('utf-8', errors='replace')
+        # Extract payload (repeated packets reuse the payload decoded the first time)
+        payload = self.payloads.get(data)
+        if payload is None:
+            payload_start = HEADER_SIZE + TYPE_SIZE + LENGTH_SIZE
+            payload = data[payload_start:payload_start + length].decode('utf-8', errors='replace')
+            if len(data) <= config.PAYLOAD_CACHE_MAX_PACKET and not msg_type & config.MSG_FLAG_TRACE:
+                if len(self.payloads) >= config.PAYLOAD_CACHE_SIZE:
+                    self.payloads.clear()
+                self.payloads[data] = payload
 
         if config.DEBUG_MODE:
             print(f"[UDP] Received: type={msg_type}, len={length}, payload={payload[:50]}...")
 
-        # Route to handler
+        self._dispatch(msg_type, payload, session)
+
+    def _dispatch(self, msg_type, payload, session):
+        """Route a decoded payload to its handler."""
+        header = None
+        if msg_type & config.MSG_FLAG_TRACE:
+            msg_type &= ~config.MSG_FLAG_TRACE
+            header, _, payload = payload.partition(tracing.TRACE_SEPARATOR)
+
         handler = self.callbacks.get(msg_type)
-        if handler:
-            handler(payload)
-        else:
+        if not handler:
             print(f"[UDP] Unknown message type: {msg_type}")
+            return
+
+        tracer = tracing.get_tracer()
+        if tracer is None:
+            handler(payload, session)
+            return
+
+        tracer.begin(header, msg_type, session)
+        try:
+            handler(payload, session)
+        finally:
+            tracer.end()
 
-    def _handle_menu(self, payload):
+    def _handle_menu(self, payload, session):
         """Handle menu navigation events."""
         # Payload format: "text|index|total" or just "text"
         parts = payload.split('|')
@@ -120,23 +226,124 @@ class UDPListener:
                 index = int(parts[1])
                 total = int(parts[2])
                 if total > 0:
-                    text = f"{text}, {index} of {total}"
+                    self._announce_menu_item(text, index, total, session)
+                    return
             except ValueError:
                 pass
 
         if text:
-            speech.speak(text, interrupt=True)
+            session.speak(text, interrupt=True)
+
+    def _announce_menu_item(self, text, index, total, session):
+        """Speak a focused menu item with its position."""
+        # Jumping between the last and first item means the list wrapped
+        last = session.last_menu_index
+        if total > 2 and ((last == total and index == 1) or (last == 1 and index == total)):
+            earcons.play("menu_wrap")
+        session.last_menu_index = index
+
+        if self.prefetcher:
+            self.prefetcher.on_focus(index, total)
+        session.speak(self._menu_item_text(text, index, total), interrupt=True)
+
+    def _menu_item_text(self, text, index, total):
+        """Spoken form of a focused menu item (without its position while shedding load)."""
+        if self.shedder.terse():
+            return text
+        return format_menu_item(text, index, total)
+
+    def _handle_menu_snapshot(self, payload, session):
+        """Handle a snapshot of the current menu (sent once per menu open, or on request)."""
+        # Payload format: "seq|menuName|focusedId|item1|item2|...|itemN"
+        menu = session.menu
+        held = menu.seq
+        if not menu.load_snapshot(payload):
+            if config.DEBUG_MODE:
+                print(f"[UDP] Invalid menu snapshot: {payload[:50]}")
+            return
+
+        self.active_session = session
+        session.world.update("menu", menu.name)
+        session.last_menu_index = menu.index
+        if self.prefetcher:
+            self.prefetcher.set_items(menu.items, session.route)
+
+        text = menu.focused_text
+        if text and menu.seq != held:  # A resent snapshot arriving twice is spoken once
+            self._announce_menu_item(text, menu.index, menu.total, session)
+
+    def _handle_menu_focus(self, payload, session):
+        """Handle a focus change within the current menu snapshot."""
+        # Payload format: "focusedId|seq"
+        focus = session.menu.apply_focus(payload)
+        if focus is menu_model.STALE:
+            # The snapshot it refers to was missed; its resend announces the focus
+            self._request_menu_resync(session)
+            return
+        if focus is None:
+            if config.DEBUG_MODE:
+                print(f"[UDP] Focus on unknown menu item: {payload[:50]}")
+            return
+
+        text, item_id, total = focus
+        self.active_session = session
+        self._announce_menu_item(text, item_id, total, session)
+
+    def _request_menu_resync(self, session):
+        """Ask the game to resend its menu snapshot (at most every MENU_RESYNC_INTERVAL)."""
+        now = time.time()
+        if now - session.menu_resync_time < config.MENU_RESYNC_INTERVAL:
+            return False
+        if self.socket is None or session.reply_addr is None:
+            return False
+        session.menu_resync_time = now
+        packet = HEADER + bytes((config.MSG_TYPE_MENU_RESYNC, 0, 0))
+        try:
+            self.socket.sendto(packet, session.reply_addr)
+        except OSError as e:
+            print(f"[UDP] Could not request menu snapshot: {e}")
+            return False
+        return True
+
+    def review_menu(self):
+        """Read every item of the current menu from the local model."""
+        session = self.active_session
+        if session is None or not session.menu.items:
+            speech.speak("No menu", interrupt=True)
+            return False
+        return session.speak(session.menu.read_all(), interrupt=True)
+
+    def jump_menu(self, letter):
+        """
+        Announce the next item of the current menu starting with a letter
+        (answered locally; the game's focus is not moved).
+        """
+        session = self.active_session
+        if session is None:
+            return False
+
+        menu = session.menu
+        item_id = menu.find_by_letter(letter)
+        if not item_id:
+            return session.speak(f"No item starting with {letter.upper()}", interrupt=True)
+        return session.speak(format_menu_item(menu.text(item_id), item_id, menu.total), interrupt=True)
 
-    def _handle_vehicle(self, payload):
+    def _handle_vehicle(self, payload, session):
         """Handle vehicle telemetry updates."""
+        telemetry_store.record(session, session.received, payload)
+        self._check_surface(payload, session)
+
         if not config.ANNOUNCE_VEHICLE_TELEMETRY:
             return
+        if self.shedder.drops_status():
+            self.shedder.record_shed("telemetry")
+            return
 
         # Rate limit telemetry announcements
         current_time = time.time()
-        if current_time - self.last_telemetry_time < config.TELEMETRY_INTERVAL:
+        if current_time - session.last_telemetry_time < config.TELEMETRY_INTERVAL:
             return
-        self.last_telemetry_time = current_time
+        session.last_telemetry_time = current_time
 
         # Payload format: "speed|rpm|gear|steering|surface"
         parts = payload.split('|')
@@ -152,22 +359,58 @@ class UDPListener:
                 if gear:
                     announcement += f", gear {gear}"
 
-                speech.speak(announcement, interrupt=False)
+                session.speak(announcement, interrupt=False)
             except ValueError as e:
                 if config.DEBUG_MODE:
                     print(f"[UDP] Invalid telemetry data: {e}")
 
-    def _handle_alert(self, payload):
+    def _check_surface(self, payload, session):
+        """Play an earcon when the surface field of the telemetry changes."""
+        # Identical telemetry packets share one payload object (see _process_packet)
+        if payload is session.last_vehicle_payload:
+            return
+        session.last_vehicle_payload = payload
+
+        # Surface is the fifth field of "speed|rpm|gear|steering|surface"
+        parts = payload.split('|', 5)
+        if len(parts) < 5:
+            return
+
+        surface = parts[4].strip().lower()
+        if surface and surface != session.last_surface:
+            if session.last_surface is not None:
+                name = f"surface_{surface}"
+                earcons.play(name if earcons.has(name) else "surface_change")
+            session.last_surface = surface
+
+    def _handle_alert(self, payload, session):
         """Handle important alerts (always speak, high priority)."""
         # Payload format: "text|priority"
         parts = payload.split('|')
         text = parts[0] if parts else ""
 
         if text:
+            session.world.add_alert(text)
             # Alerts always interrupt
-            speech.speak(text, interrupt=True)
+            session.speak(text, interrupt=True)
 
-    def _handle_dialog(self, payload):
+    def _handle_phrase(self, payload, session):
+        """Handle an announcement sent as a phrase ID plus arguments."""
+        # Payload format: phraseId (1 byte) + args separated by \x1f
+        rendered = phrases.render(payload, terse=self.shedder.terse())
+        if rendered is None:
+            return
+
+        text, kind = rendered
+        if kind == "alert":
+            session.world.add_alert(text)
+            session.speak(text, interrupt=True)
+        elif self.shedder.drops_status():
+            self.shedder.record_shed("status")
+        else:
+            session.speak(text, interrupt=False)
+
+    def _handle_dialog(self, payload, session):
         """Handle dialog box announcements."""
         # Payload format: "title|content|options"
         parts = payload.split('|')
@@ -185,12 +428,81 @@ class UDPListener:
             announcement += f"Options: {options}"
 
         if announcement:
-            speech.speak(announcement.strip(), interrupt=True)
+            session.speak(announcement.strip(), interrupt=True)
+
+    def _handle_earcon(self, payload, session):
+        """Handle non-verbal cue events."""
+        # Payload format: "name"
+        if payload:
+            earcons.play(payload)
+
+    def _handle_hello(self, payload, session):
+        """Handle a source introducing itself with a session ID."""
+        # Payload format: "sessionId" (re-sent as a heartbeat)
+        name = session.name
+        merged = self.sessions.bind(session, payload.strip())
+        if self.active_session is session:
+            self.active_session = merged
+        if merged is not session or merged.name != name:
+            print(f"[UDP] Source {merged.addr} identified as session '{merged.label}'")
+
+    def _handle_state(self, payload, session):
+        """Handle a world state change."""
+        # Payload format: "key|value"
+        changed = session.world.apply(payload)
+        if changed is None:
+            if config.DEBUG_MODE:
+                print(f"[UDP] Invalid state update: {payload[:50]}")
+            return
+        # The heartbeat re-sends unchanged state; only real changes make a source active
+        if changed:
+            self.active_session = session
 
-    def _handle_status(self, payload):
+    def _handle_road_graph(self, payload, session):
+        """Handle the road graph of a newly loaded level (sent once per mission)."""
+        if not config.GUIDANCE_ENABLED:
+            return
+        graph = guidance.load_graph(payload)
+        session.guide = guidance.Guide(graph) if graph is not None else None
+
+    def _handle_position(self, payload, session):
+        """Handle a player position update for route guidance."""
+        # Payload format: "x|y|z|dirX|dirY|speed"
+        guide = session.guide
+        if guide is None:
+            return
+        try:
+            x, y, z, dir_x, dir_y, speed = map(float, payload.split('|'))
+        except ValueError:
+            if config.DEBUG_MODE:
+                print(f"[UDP] Invalid position: {payload[:50]}")
+            return
+
+        text = guide.update(x, y, z, dir_x, dir_y, speed)
+        if text:
+            session.speak(text, interrupt=False)
+
+    def announce_status(self):
+        """Speak the current status from the local world state."""
+        session = self.active_session
+        if session is None:
+            return speech.speak("No game connected", interrupt=True)
+        return session.speak(session.world.describe_status(), interrupt=True)
+
+    def announce_alerts(self):
+        """Repeat the most recent alerts from the local world state."""
+        session = self.active_session
+        if session is None:
+            return speech.speak("No game connected", interrupt=True)
+        return session.speak(session.world.describe_alerts(), interrupt=True)
+
+    def _handle_status(self, payload, session):
         """Handle status updates."""
+        if self.shedder.drops_status():
+            self.shedder.record_shed("status")
+            return
         if payload:
-            speech.speak(payload, interrupt=False)
+            session.speak(payload, interrupt=False)
 
 
 # Singleton instance
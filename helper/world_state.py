@@ -0,0 +1,119 @@
+"""
+BeamNG Blind Accessibility Helper - World State Store
+
+Live model of the game built from the incoming message stream, so status
+queries are answered immediately from memory instead of asking the game.
+
+The mod sends STATE messages ("key|value") whenever a value changes:
+    player     Player vehicle name ("" = on foot / no vehicle)
+    ai_mode    AI mode key of the player vehicle ("disabled", "traffic", ...)
+    ai_speed   AI target speed in km/h
+    traffic    Number of traffic vehicles
+    level      Current level name
+The current menu comes from the menu snapshot and alerts from ALERT
+messages; both are recorded by the listener.
+"""
+
+import threading
+import time
+from collections import deque
+
+import config
+import lexicon
+import phrases
+
+
+class WorldState:
+    """Latest known value of each state key, plus recent alerts."""
+
+    def __init__(self, alert_history=None):
+        self.values = {}
+        self.updated = {}  # Key -> time of last change
+        self.alerts = deque(maxlen=alert_history or config.WORLD_STATE_ALERT_HISTORY)
+        self.lock = threading.Lock()
+
+    def update(self, key, value):
+        """Set a state value. Returns True if it changed."""
+        with self.lock:
+            if self.values.get(key) == value:
+                return False
+            self.values[key] = value
+            self.updated[key] = time.time()
+            return True
+
+    def apply(self, payload):
+        """Apply a STATE payload ("key|value"). Returns True if it changed, False if not, None if invalid."""
+        key, sep, value = payload.partition('|')
+        if not sep or not key:
+            return None
+        return self.update(key, value)
+
+    def get(self, key, default=None):
+        """Get a state value."""
+        return self.values.get(key, default)
+
+    def add_alert(self, text):
+        """Record an alert that was spoken."""
+        with self.lock:
+            self.alerts.append((time.time(), text))
+
+    def snapshot(self):
+        """Copy of all state values."""
+        with self.lock:
+            return dict(self.values)
+
+    def describe_status(self):
+        """One utterance describing the player's situation."""
+        values = self.snapshot()
+        if not values:
+            return "No game state received yet"
+
+        parts = []
+        player = values.get("player")
+        if player:
+            parts.append(f"Vehicle {lexicon.friendly_vehicle(player)}")
+        elif player is not None:
+            parts.append("No vehicle")
+
+        ai_mode = values.get("ai_mode")
+        if ai_mode and ai_mode != "disabled":
+            status = f"AI {phrases.ai_mode_name(ai_mode)}"
+            if values.get("ai_speed"):
+                status += f", {values['ai_speed']} kilometers per hour"
+            parts.append(status)
+        elif ai_mode:
+            parts.append("Manual control")
+
+        traffic = values.get("traffic")
+        if traffic and traffic != "0":
+            parts.append(f"Traffic {traffic} vehicles")
+
+        if values.get("level"):
+            parts.append(f"Level {lexicon.friendly_level(values['level'])}")
+        if values.get("menu"):
+            parts.append(f"Menu {values['menu']}")
+
+        return ". ".join(parts) if parts else "No game state received yet"
+
+    def describe_alerts(self, count=3):
+        """The most recent alerts, newest first."""
+        with self.lock:
+            recent = [text for _, text in list(self.alerts)[-count:]]
+        if not recent:
+            return "No recent alerts"
+        return ". ".join(reversed(recent))
+
+
+# Test function
+if __name__ == "__main__":
+    print("Testing world state...")
+    state = WorldState()
+    print(state.describe_status())
+    for message in ("player|pickup", "ai_mode|traffic", "ai_speed|60",
+                    "traffic|12", "level|west_coast_usa", "bogus"):
+        state.apply(message)
+    state.update("menu", "Main Menu")
+    state.add_alert("Traffic spawned, 12 vehicles")
+    state.add_alert("AI enabled, traffic mode")
+    print(state.describe_status())
+    print(state.describe_alerts())
@@ -8,19 +8,30 @@ import os
 import sys
 import subprocess
 import json
+import queue
+import threading
 from pathlib import Path
 
-# Try to import cytolk for NVDA support
-try:
-    import cytolk
-    from cytolk import tolk
-    TOLK_AVAILABLE = True
-except ImportError:
-    TOLK_AVAILABLE = False
-    print("Warning: cytolk not available. Install with: pip install cytolk")
+from config_index import ConfigIndex, open_member
+
+# cytolk (NVDA support) is imported, loaded, used and unloaded on one
+# speech thread (AccessibleLauncher.speech_loop), so the first menu is shown
+# without waiting and Tolk's COM objects stay on the thread that created them
 
 # Configuration
 CONFIG_FILE = Path(__file__).parent / "launcher_config.json"
+CONFIG_INDEX_FILE = Path(__file__).parent / "config_index.json"
+
+# How long opening a config menu waits for the index to be revalidated
+# before falling back to the cached listing
+CONFIG_INDEX_WAIT = 0.5
+
+# How long the first config menu waits for the initial scan (no index saved yet)
+CONFIG_INDEX_FIRST_WAIT = 60.0
+
+# Unpacked mod (under mods/unpacked) that new configs and tuned copies of
+# configs from zipped mods are saved to
+OVERRIDE_MOD = "blind_accessibility.zip"
 
 # Audio channel settings (maps to BeamNG's game-settings.cs)
 AUDIO_CHANNELS = {
@@ -308,26 +319,69 @@ class AccessibleLauncher:
     def __init__(self):
         self.beamng_path = None
         self.tolk_initialized = False
+        self.tolk_ready = threading.Event()  # Set once the speech thread has tried to load Tolk
+        self.speech_queue = queue.Queue()  # (text, interrupt), or None to unload Tolk and stop
+        self.speech_thread = threading.Thread(target=self.speech_loop, daemon=True)
+        self.speech_thread.start()
+        self.config_index = None
+        self.config_index_lock = threading.Lock()
         self.load_config()
-        self.init_tolk()
+        # Load and revalidate the config index while the user is in the main menu
+        threading.Thread(target=self.get_config_index, daemon=True).start()
 
     def init_tolk(self):
-        """Initialize Tolk for screen reader support."""
-        if TOLK_AVAILABLE:
+        """Import and load Tolk for screen reader support. Returns the module, or None."""
+        try:
+            from cytolk import tolk
+            tolk.load()
+            self.tolk_initialized = True
+            return tolk
+        except ImportError:
+            print("Warning: cytolk not available. Install with: pip install cytolk")
+        except Exception as e:
+            print(f"Warning: Could not initialize Tolk: {e}")
+        return None
+
+    def speech_loop(self):
+        """
+        Speech thread: owns Tolk from load to unload. Speaks queued text in
+        order; anything queued before an interrupting message is dropped.
+        """
+        tolk = self.init_tolk()
+        self.tolk_ready.set()
+        stopping = False
+        while not stopping:
+            batch = [self.speech_queue.get()]
+            while True:
+                try:
+                    batch.append(self.speech_queue.get_nowait())
+                except queue.Empty:
+                    break
+            if None in batch:
+                stopping = True
+                batch = batch[:batch.index(None)]
+            for i in range(len(batch) - 1, -1, -1):
+                if batch[i][1]:
+                    batch = batch[i:]
+                    break
+            if tolk is None:
+                continue
+            for text, interrupt in batch:
+                try:
+                    tolk.speak(text, interrupt=interrupt)
+                except Exception:
+                    pass
+
+        if tolk is not None:
             try:
-                tolk.load()
-                self.tolk_initialized = True
-            except Exception as e:
-                print(f"Warning: Could not initialize Tolk: {e}")
+                tolk.unload()
+            except Exception:
+                pass
 
     def speak(self, text, interrupt=True):
         """Speak text via screen reader."""
         print(text)
-        if self.tolk_initialized:
-            try:
-                tolk.speak(text, interrupt=interrupt)
-            except Exception:
-                pass
+        self.speech_queue.put((text, interrupt))
 
     def load_config(self):
         """Load configuration from file."""
@@ -643,61 +697,72 @@ class AccessibleLauncher:
                         return mods_path
         return None
 
+    def get_config_index(self):
+        """Get the .pc config index, loading it and starting a refresh on first use."""
+        with self.config_index_lock:
+            if self.config_index is None:
+                mods_path = self.get_mods_path()
+                if not mods_path:
+                    return None
+                # Search in unpacked mods and temp folders, and in zipped
+                # mods (installed by hand or from the repository)
+                index = ConfigIndex(CONFIG_INDEX_FILE, [
+                    mods_path / "unpacked",
+                    mods_path / "temp_tuning",
+                ], [
+                    mods_path,
+                    mods_path / "repo",
+                ])
+                index.load()
+                index.refresh_async()
+                self.config_index = index
+            return self.config_index
+
     def find_tunable_configs(self):
         """Find all .pc vehicle configs that can be tuned."""
-        configs = []
-        mods_path = self.get_mods_path()
-
-        if not mods_path:
-            return configs
-
-        # Search in unpacked mods and temp folders
-        search_paths = [
-            mods_path / "unpacked",
-            mods_path / "temp_tuning",
-        ]
-
-        for search_path in search_paths:
-            if not search_path.exists():
-                continue
-
-            # Find all .pc files
-            for pc_file in search_path.rglob("*.pc"):
-                # Get relative path from vehicles folder
-                try:
-                    parts = pc_file.parts
-                    if 'vehicles' in parts:
-                        vehicles_idx = parts.index('vehicles')
-                        rel_path = "/".join(parts[vehicles_idx + 1:])
-                        vehicle_name = parts[vehicles_idx + 1] if vehicles_idx + 1 < len(parts) else "unknown"
-                        config_name = pc_file.stem
-
-                        configs.append({
-                            'path': pc_file,
-                            'rel_path': rel_path,
-                            'vehicle': vehicle_name,
-                            'name': config_name,
-                            'display': f"{vehicle_name} - {config_name}"
-                        })
-                except Exception:
-                    pass
-
-        return sorted(configs, key=lambda x: x['display'])
-
-    def load_pc_config(self, path):
-        """Load a .pc config file."""
+        index = self.get_config_index()
+        if not index:
+            return []
+
+        # Pick up changes since the last refresh if that is quick, otherwise
+        # answer from the cached index (first run: wait for the full scan)
+        index.refresh_async()
+        if index.loaded:
+            index.wait(CONFIG_INDEX_WAIT)
+        elif not index.wait(CONFIG_INDEX_FIRST_WAIT):
+            self.speak("Still scanning mods for vehicle configs. Try again in a moment.")
+            return []
+        return index.configs()
+
+    def load_pc_config(self, path, member=None):
+        """Load a .pc config file, or the member of the zipped mod at path."""
         try:
+            if member:
+                with open_member(path, member) as f:
+                    return json.load(f)
             with open(path, 'r', encoding='utf-8') as f:
                 return json.load(f)
         except Exception as e:
             self.speak(f"Error loading config: {e}")
             return None
 
+    def get_save_path(self, cfg):
+        """Where a tuned config is saved: in place, or in the override mod if it is zipped."""
+        if 'archive' not in cfg:
+            return cfg['path']
+        mods_path = self.get_mods_path()
+        if not mods_path:
+            return None
+        return mods_path / "unpacked" / OVERRIDE_MOD / "vehicles" / cfg['rel_path']
+
     def save_pc_config(self, path, config):
         """Save a .pc config file."""
         try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
             with open(path, 'w', encoding='utf-8') as f:
                 json.dump(config, f, indent=2)
+            if self.config_index:
+                self.config_index.touch(path)
             return True
         except Exception as e:
             self.speak(f"Error saving config: {e}")
@@ -850,10 +915,14 @@ class AccessibleLauncher:
         selected = config_menu[choice][1]
         self.speak(f"Selected: {selected['display']}")
 
-        # Load the config
-        config = self.load_pc_config(selected['path'])
+        # Load the config (configs in zipped mods are read from the archive)
+        if 'archive' in selected:
+            config = self.load_pc_config(selected['archive'], selected['member'])
+        else:
+            config = self.load_pc_config(selected['path'])
         if not config:
             return
+        save_path = self.get_save_path(selected)
 
         # Check if this is a Wydra/ATV vehicle
         is_wydra = config.get('model') == 'atv' or config.get('mainPartName') == 'atv'
@@ -908,9 +977,9 @@ class AccessibleLauncher:
             elif choice == '13' and is_wydra:
                 self.tuning_category_menu(config, "Wydra Transmission", "atv_transmission", WYDRA_TRANSMISSIONS)
             elif choice == 's':
-                if self.save_pc_config(selected['path'], config):
+                if self.save_pc_config(save_path, config):
                     self.speak("Changes saved successfully!")
-                    self.speak(f"Config saved to: {selected['path']}")
+                    self.speak(f"Config saved to: {save_path}")
             elif choice == 'q':
                 return
             else:
@@ -960,7 +1029,7 @@ class AccessibleLauncher:
             return
 
         # Save to blind_accessibility mod folder
-        save_dir = mods_path / "unpacked" / "blind_accessibility.zip" / "vehicles" / vehicle_code
+        save_dir = mods_path / "unpacked" / OVERRIDE_MOD / "vehicles" / vehicle_code
         save_dir.mkdir(parents=True, exist_ok=True)
         save_path = save_dir / f"{config_name}.pc"
 
@@ -1164,12 +1233,9 @@ class AccessibleLauncher:
                 self.speak("Invalid choice.")
 
     def cleanup(self):
-        """Clean up resources."""
-        if self.tolk_initialized:
-            try:
-                tolk.unload()
-            except Exception:
-                pass
+        """Clean up resources: finish speaking and unload Tolk on the speech thread."""
+        self.speech_queue.put(None)
+        self.speech_thread.join(timeout=5.0)
 
 
 def main():
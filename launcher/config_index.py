@@ -0,0 +1,286 @@
+"""
+Persistent index of the .pc vehicle configs in the BeamNG mod folders.
+
+Scanning hundreds of mods with rglob takes seconds, so the launcher keeps
+an index on disk: for every directory under the search roots, its mtime,
+its subdirectories and the .pc files it contains (with mtime and size).
+
+Revalidation walks the cached tree and only re-lists a directory when its
+mtime changed (adding, removing or renaming an entry changes the mtime of
+the directory containing it); unchanged directories cost one stat. It runs
+on a background thread, so menus are built from the cached index at once.
+
+Zipped mods (.zip files directly in the archive roots) are indexed from
+their central directory, which is read once per archive and cached with
+the archive's mtime and size; changed archives are listed in parallel on
+a thread pool. Their configs are read straight from the archive.
+"""
+
+import io
+import json
+import os
+import threading
+import time
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+
+INDEX_VERSION = 2
+
+# Directories modified this recently are listed again on the next refresh,
+# since a change within the same mtime tick would not be noticed
+MTIME_SETTLE_SECONDS = 2.0
+
+# Threads listing changed archives
+ARCHIVE_SCAN_WORKERS = 8
+
+
+def describe_config(pc_file, archive=None):
+    """
+    Menu entry for a .pc file inside a mod's vehicles folder (None if it is elsewhere).
+    For a zipped mod, pc_file is the member name and archive the path of the zip.
+    """
+    parts = PurePosixPath(pc_file).parts if archive else pc_file.parts
+    if 'vehicles' not in parts:
+        return None
+    vehicles_idx = parts.index('vehicles')
+    rel_path = "/".join(parts[vehicles_idx + 1:])
+    vehicle_name = parts[vehicles_idx + 1] if vehicles_idx + 1 < len(parts) else "unknown"
+    config_name = PurePosixPath(pc_file).stem if archive else pc_file.stem
+    config = {
+        'path': Path(archive, pc_file) if archive else pc_file,
+        'rel_path': rel_path,
+        'vehicle': vehicle_name,
+        'name': config_name,
+        'display': f"{vehicle_name} - {config_name}"
+    }
+    if archive:
+        config['archive'] = Path(archive)
+        config['member'] = pc_file
+    return config
+
+
+def _settled(mtime):
+    """The mtime to cache: -1 (list again next time) if it is too recent to trust."""
+    if time.time() - mtime / 1e9 < MTIME_SETTLE_SECONDS:
+        return -1
+    return mtime
+
+
+def list_archive(path):
+    """Names of the .pc members of a zip, from its central directory."""
+    with zipfile.ZipFile(path) as archive:
+        return [name for name in archive.namelist() if name.lower().endswith('.pc')]
+
+
+def open_member(archive, member):
+    """Open one member of a zip for reading as text (decompressed as it is read)."""
+    # The member stream keeps its own reference to the file, so the zip can be closed now
+    with zipfile.ZipFile(archive) as zf:
+        stream = zf.open(member)
+    return io.TextIOWrapper(stream, encoding='utf-8')
+
+
+class ConfigIndex:
+    """Cached listing of the .pc files under a set of root folders and in zipped mods."""
+
+    def __init__(self, index_file, roots, archive_roots=()):
+        self.index_file = Path(index_file)
+        self.roots = [str(root) for root in roots]
+        self.archive_roots = [str(root) for root in archive_roots]
+        self.dirs = {}        # Directory -> {"mtime", "subdirs", "files": {name: [mtime_ns, size]}}
+        self.archives = {}    # Zip -> {"mtime", "size", "members": [.pc member names]}
+        self.loaded = False   # True once there is a listing to answer from (disk or scan)
+        self.rescanned = 0    # Directories listed by the last refresh
+        self.lock = threading.Lock()
+        self.refreshed = threading.Event()
+        self.thread = None
+        self._configs = None
+
+    def load(self):
+        """Load the index saved by a previous run (ignored if stale or unreadable)."""
+        try:
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if (data.get('version') != INDEX_VERSION or data.get('roots') != self.roots
+                or data.get('archive_roots') != self.archive_roots):
+            return False
+        with self.lock:
+            self.dirs = data['dirs']
+            self.archives = data['archives']
+            self._configs = None
+            self.loaded = True
+        return True
+
+    def save(self):
+        """Write the index atomically next to the launcher config."""
+        with self.lock:
+            data = {'version': INDEX_VERSION, 'roots': self.roots, 'archive_roots': self.archive_roots,
+                    'dirs': self.dirs, 'archives': self.archives}
+        try:
+            tmp = self.index_file.with_suffix('.tmp')
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(data, f, separators=(',', ':'))
+            os.replace(tmp, self.index_file)
+        except OSError as e:
+            print(f"Warning: Could not save config index: {e}")
+
+    def _list_dir(self, path, mtime):
+        """List one directory: subdirectories and .pc files with their mtime and size."""
+        subdirs = []
+        files = {}
+        with os.scandir(path) as entries:
+            for entry in entries:
+                try:
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    elif entry.name.lower().endswith('.pc') and entry.is_file():
+                        stat = entry.stat()
+                        files[entry.name] = [stat.st_mtime_ns, stat.st_size]
+                except OSError:
+                    pass
+        return {'mtime': _settled(mtime), 'subdirs': subdirs, 'files': files}
+
+    def _list_archive(self, path, mtime, size):
+        """List one zip (None if it cannot be opened right now)."""
+        try:
+            members = list_archive(path)
+        except OSError as e:
+            print(f"Warning: Could not read mod archive {path}: {e}")
+            return None
+        except Exception as e:
+            # Corrupt or unsupported: cached as empty until the file changes
+            # (a download in progress keeps changing)
+            print(f"Warning: Could not read mod archive {path}: {e}")
+            members = []
+        return {'mtime': _settled(mtime), 'size': size, 'members': members}
+
+    def _refresh_archives(self, old):
+        """Revalidate the zip listings, reading the changed archives on a thread pool."""
+        new = {}
+        changed = []
+        for root in self.archive_roots:
+            try:
+                with os.scandir(root) as entries:
+                    for entry in entries:
+                        if not entry.name.lower().endswith('.zip'):
+                            continue
+                        try:
+                            if not entry.is_file():
+                                continue
+                            stat = entry.stat()
+                        except OSError:
+                            continue
+                        cached = old.get(entry.path)
+                        if (cached is not None and cached['mtime'] == stat.st_mtime_ns
+                                and cached['size'] == stat.st_size):
+                            new[entry.path] = cached
+                        else:
+                            changed.append((entry.path, stat.st_mtime_ns, stat.st_size))
+            except OSError:
+                continue
+
+        if changed:
+            with ThreadPoolExecutor(max_workers=min(ARCHIVE_SCAN_WORKERS, len(changed))) as pool:
+                listings = pool.map(lambda args: self._list_archive(*args), changed)
+                for (path, _, _), listing in zip(changed, listings):
+                    if listing is not None:
+                        new[path] = listing
+        return new, len(changed)
+
+    def refresh(self):
+        """Revalidate the index against the disk. Returns True if anything changed."""
+        try:
+            with self.lock:
+                old = self.dirs
+                old_archives = self.archives
+            new = {}
+            rescanned = 0
+            stack = list(self.roots)
+            while stack:
+                path = stack.pop()
+                try:
+                    mtime = os.stat(path).st_mtime_ns
+                except OSError:
+                    continue
+                cached = old.get(path)
+                if cached is None or cached['mtime'] != mtime:
+                    try:
+                        cached = self._list_dir(path, mtime)
+                    except OSError:
+                        continue
+                    rescanned += 1
+                new[path] = cached
+                stack.extend(os.path.join(path, name) for name in cached['subdirs'])
+
+            archives, relisted = self._refresh_archives(old_archives)
+            rescanned += relisted
+
+            changed = new != old or archives != old_archives
+            with self.lock:
+                self.dirs = new
+                self.archives = archives
+                self.rescanned = rescanned
+                if changed:
+                    self._configs = None
+                self.loaded = True
+            self.refreshed.set()  # Menus need not wait for the save
+            if changed:
+                self.save()
+            return changed
+        finally:
+            # Waiters are released even if the scan fails
+            self.refreshed.set()
+
+    def refresh_async(self):
+        """Start revalidating on a background thread (unless one is already running)."""
+        with self.lock:
+            if self.thread is not None and self.thread.is_alive():
+                return self.thread
+            self.refreshed.clear()
+            self.thread = threading.Thread(target=self.refresh, daemon=True)
+            self.thread.start()
+            return self.thread
+
+    def wait(self, timeout=None):
+        """Wait for the running refresh. Returns False on timeout."""
+        return self.refreshed.wait(timeout)
+
+    def touch(self, path):
+        """Record a .pc file the launcher has just written."""
+        path = Path(path)
+        try:
+            stat = path.stat()
+        except OSError:
+            return
+        with self.lock:
+            entry = self.dirs.get(str(path.parent))
+            if entry is not None:
+                entry['files'][path.name] = [stat.st_mtime_ns, stat.st_size]
+                self._configs = None
+        self.save()
+
+    def configs(self):
+        """
+        Menu entries for every indexed config, sorted by display name.
+        A loose config replaces a zipped one with the same path under vehicles/.
+        """
+        with self.lock:
+            if self._configs is None:
+                configs = []
+                for directory, entry in self.dirs.items():
+                    base = Path(directory)
+                    for name in entry['files']:
+                        config = describe_config(base / name)
+                        if config is not None:
+                            configs.append(config)
+                loose = {config['rel_path'] for config in configs}
+                for archive, entry in self.archives.items():
+                    for member in entry['members']:
+                        config = describe_config(member, archive)
+                        if config is not None and config['rel_path'] not in loose:
+                            configs.append(config)
+                self._configs = sorted(configs, key=lambda x: x['display'])
+            return list(self._configs)
@@ -9,8 +9,14 @@ local config = {
     enabled = true,
     ip = "127.0.0.1",
     port = 4445,
+    tcpPort = 4446,       -- Helper TCP port for large payloads
+    useStream = true,     -- Send large payloads over TCP instead of truncating them
     announcePosition = true,
     verbosity = "normal", -- "minimal", "normal", "verbose"
+    sessionId = "",       -- Identifies this game instance to the helper (e.g. "driver", "spectator"; empty = unique per instance)
+    trace = false,        -- Prefix packets with a correlation ID and stage timestamps (helper --trace)
+    guidance = true,      -- Send the road graph and player position for route guidance
+    guidanceInterval = 0.25,  -- Seconds between position updates
 }
 
 -- Protocol constants
@@ -21,25 +27,122 @@ local MSG_TYPE = {
     ALERT = 0x03,
     DIALOG = 0x04,
     STATUS = 0x05,
+    MENU_ITEMS = 0x06,
+    EARCON = 0x07,
+    HELLO = 0x08,
+    MENU_FOCUS = 0x09,
+    STATE = 0x0A,
+    PHRASE = 0x0B,
+    ROAD_GRAPH = 0x0C,
+    POSITION = 0x0D,
+    MENU_RESYNC = 0x0E,   -- Helper -> game: resend the menu snapshot
 }
 
+-- Phrase IDs - frequent announcements are sent as an ID plus arguments and
+-- rendered from templates in the helper (helper/phrases.py must match)
+local PHRASE = {
+    AI_ENABLED = 1,               -- mode
+    AI_DISABLED = 2,
+    AI_SPEED_SET = 3,             -- km/h
+    AI_SPEED_MAX = 4,             -- km/h
+    AI_SPEED_MIN = 5,             -- km/h
+    AI_NO_VEHICLE = 6,
+    AI_SPEED = 7,                 -- km/h
+    LEVEL_LOADED = 8,             -- level name
+    TRAFFIC_CLEARED = 9,
+    TRAFFIC_SPAWNED = 10,         -- count
+    TRAFFIC_SPAWNED_SUMMARY = 11, -- count, summary
+    VEHICLE_SPAWNED = 12,         -- vehicle name
+    VEHICLES_SPAWNED = 13,        -- count, summary
+    VEHICLE_AI = 14,              -- vehicle name, mode
+    LOADING = 15,                 -- what
+    LOADING_COMPLETE = 16,
+}
+local PHRASE_ARG_SEPARATOR = "\31"
+
+-- Tracing - traced packets set this bit in the type byte and start with
+-- "id;stage=ms,...\30" (see helper/tracing.py)
+local MSG_FLAG_TRACE = 0x80
+local TRACE_SEPARATOR = "\30"
+local TRACE_UI_STAGES = { "input", "poll", "created", "sent", "flush" }
+
+-- Transport limits
+local streamThreshold = 1200    -- Payloads larger than this go over TCP when connected
+local maxUdpPayload = 65000     -- UDP length field is 16 bits; larger payloads are truncated
+local maxStreamPayload = 1048576  -- Largest menu snapshot sent over TCP
+
 -- State tracking
 local udpSocket = nil
+
+-- Session ID sent when config.sessionId is empty. Unique per game instance,
+-- so two default-configured instances get separate sessions in the helper
+local instanceId = string.format("game-%s%04x", (tostring({}):match("(%x%x%x%x)$") or ""),
+    math.floor(os.clock() * 1000000) % 0x10000)
+
+local function getSessionId()
+    if config.sessionId and config.sessionId ~= "" then
+        return config.sessionId
+    end
+    return instanceId
+end
+
+-- TCP stream transport state
+local tcpSocket = nil
+local tcpConnected = false
+local tcpQueue = {}             -- Frames waiting to be sent
+local tcpQueueOffset = 1        -- Next byte of tcpQueue[1] to send
+local tcpTimer = 0
+local tcpReconnectInterval = 2.0
+local tcpConnectTimeout = 5.0
+local maxTcpQueue = 64
+
+-- HELLO (with the world state) is re-sent when the stream reconnects and as a
+-- heartbeat, so a restarted helper catches up
+local helloPending = false
+local helloTimer = 0
+local helloInterval = 30.0
 local currentMenu = ""
 local currentMenuItems = {}
 local currentMenuIndex = 0
+local menuSnapshotSeq = 0        -- Number of the last menu snapshot (focus deltas refer to it)
+local maxHelperPackets = 8       -- Helper requests read per frame
 local lastAnnouncedText = ""
 
+-- Route guidance: the level's road graph is sent once per mission and again
+-- whenever the TCP stream reconnects (it is too large for UDP), then the
+-- player position (helper/guidance.py)
+local GRAPH_SEPARATOR = "\29"
+local guidanceLevel = nil       -- Level of the road graph sent or pending
+local roadGraphPending = false
+local roadGraphSent = false
+local roadGraphWaited = 0       -- Seconds spent waiting for the navgraph or the stream
+local roadGraphMaxWait = 60.0
+local guidanceTimer = 0
+local activeTrace = nil    -- Trace header prefix of the UI event being handled
+local traceCounter = 0     -- Correlation IDs for events raised in Lua
+
+-- World state last sent to the helper (key -> value string); only changes are sent
+local sentState = {}
+local lastPlayerVid = nil
+
 -- AI State tracking
 local aiState = {
     vehicleModes = {},  -- Track AI mode per vehicle ID
     trafficActive = false,
-    lastTrafficCount = 0,
+    trafficRoster = {},    -- Vehicle ID -> true for vehicles managed by gameplay_traffic
+    trafficCount = 0,      -- Number of entries in trafficRoster
     lastPolledModes = {},  -- For polling fallback
+    lastTouched = {},      -- Vehicle ID -> touch counter, for LRU eviction
+    trackedCount = 0,      -- Number of vehicles with tracked state
 }
 
--- Traffic check timing
-local trafficCheckInterval = 1.0
+-- Safety net in case destroy hooks are missed (e.g. long traffic sessions)
+local maxTrackedVehicles = 64
+local vehicleTouchCounter = 0
+
+-- Traffic reconciliation timing (roster is kept current by hooks, this only
+-- catches changes the hooks missed)
+local trafficReconcileInterval = 10.0
 local trafficCheckTimer = 0
 
 -- AI polling fallback (in case hooks don't fire)
@@ -53,18 +156,61 @@ local diagnosticMode = true   -- Set to true to help debug AI detection issues
 local lastDiagnosticAnnounce = 0
 local diagnosticInterval = 3.0  -- Announce diagnostic info every 3 seconds when AI changes
 
+-- Spawn alert aggregation - bursts of spawns are collapsed into one summary
+local spawnAggregateWindow = 0.25   -- Flush after this long without a new spawn
+local spawnAggregateMaxDelay = 1.0  -- Never hold the first spawn longer than this
+local spawnSummaryMaxNames = 4      -- Vehicle names listed in a burst summary
+local spawnBurst = {
+    count = 0,           -- Vehicles spawned in the current burst
+    names = {},          -- Vehicle name -> count
+    order = {},          -- Vehicle names in first-seen order
+    trafficCount = nil,  -- Set when traffic spawned during the burst
+    age = 0,             -- Seconds since the first event of the burst
+    quiet = 0,           -- Seconds since the last event of the burst
+    pending = false,
+}
+
 -- AI Speed control
 local aiCurrentSpeed = 20    -- Current AI speed in m/s (default ~72 km/h)
 local aiSpeedStep = 2.78     -- Speed change step (~10 km/h)
 local aiMinSpeed = 5.56      -- Minimum speed (~20 km/h)
 local aiMaxSpeed = 55.56     -- Maximum speed (~200 km/h)
 
--- Initialize UDP socket
+-- Close the TCP stream socket (pending frames are dropped)
+local function closeStreamSocket()
+    if tcpSocket then
+        tcpSocket:close()
+        tcpSocket = nil
+    end
+    tcpConnected = false
+    tcpQueue = {}
+    tcpQueueOffset = 1
+    tcpTimer = 0
+end
+
+-- Start a non-blocking TCP connect to the helper; completion is checked in onUpdate
+local function initStreamSocket()
+    closeStreamSocket()
+    if not config.useStream then return false end
+
+    tcpSocket = socket.tcp()
+    if not tcpSocket then
+        log('W', 'blindAccessibility', 'Failed to create TCP socket, large payloads will use UDP')
+        return false
+    end
+    tcpSocket:settimeout(0)
+    tcpSocket:setoption('tcp-nodelay', true)
+    tcpSocket:connect(config.ip, config.tcpPort)
+    return true
+end
+
+-- Initialize UDP socket (and start the TCP stream connection)
 local function initSocket()
     if udpSocket then
         udpSocket:close()
         udpSocket = nil
     end
+    initStreamSocket()
 
     udpSocket = socket.udp()
     if udpSocket then
@@ -77,11 +223,134 @@ local function initSocket()
     end
 end
 
--- Build and send packet
+-- Send queued TCP frames until the socket would block
+local function flushStream()
+    while tcpConnected and #tcpQueue > 0 do
+        local frame = tcpQueue[1]
+        local last, err, partial = tcpSocket:send(frame, tcpQueueOffset)
+        if last then
+            table.remove(tcpQueue, 1)
+            tcpQueueOffset = 1
+        elseif err == "timeout" then
+            tcpQueueOffset = (partial or (tcpQueueOffset - 1)) + 1
+            return
+        else
+            log('W', 'blindAccessibility', 'TCP stream lost: ' .. tostring(err))
+            closeStreamSocket()
+            return
+        end
+    end
+end
+
+-- Build and queue a TCP frame: header, type, 32-bit big-endian length, payload
+local function sendFrame(msgType, payload)
+    local length = #payload
+    local frame = HEADER
+        .. string.char(msgType)
+        .. string.char(math.floor(length / 16777216) % 256)
+        .. string.char(math.floor(length / 65536) % 256)
+        .. string.char(math.floor(length / 256) % 256)
+        .. string.char(length % 256)
+        .. payload
+
+    -- Drop the oldest unsent frame if the helper is not keeping up
+    if #tcpQueue >= maxTcpQueue then
+        table.remove(tcpQueue, tcpQueueOffset > 1 and 2 or 1)
+    end
+    table.insert(tcpQueue, frame)
+    flushStream()
+    return true
+end
+
+-- Check whether the pending TCP connect has completed
+local function checkStreamConnect()
+    local ok, err = tcpSocket:connect(config.ip, config.tcpPort)
+    if ok or err == "already connected" then
+        tcpConnected = true
+        tcpTimer = 0
+        log('I', 'blindAccessibility', 'TCP stream connected to helper')
+        -- Introduce ourselves so the helper merges this stream with our UDP session
+        sendFrame(MSG_TYPE.HELLO, getSessionId())
+        -- A new connection often means a restarted helper: resend the state too,
+        -- and the road graph, which is otherwise only sent once per mission
+        helloPending = true
+        if guidanceLevel then
+            roadGraphPending = true
+            roadGraphWaited = 0
+        end
+    elseif err ~= "timeout" and err ~= "Operation already in progress" then
+        closeStreamSocket()
+    end
+end
+
+-- Keep the TCP stream connected and flushed (called every frame)
+local function updateStream(dt)
+    if not config.useStream or not config.enabled then return end
+
+    tcpTimer = tcpTimer + dt
+    if tcpConnected then
+        if #tcpQueue > 0 then
+            flushStream()
+        end
+    elseif tcpSocket then
+        if tcpTimer >= tcpConnectTimeout then
+            closeStreamSocket()
+        else
+            checkStreamConnect()
+        end
+    elseif tcpTimer >= tcpReconnectInterval then
+        initStreamSocket()
+    end
+end
+
+-- Wall clock in milliseconds (same clock as Date.now() in the UI and time.time() in the helper)
+local function traceTime()
+    return string.format("%.1f", socket.gettime() * 1000)
+end
+
+-- Start the trace header for a UI event from the stages stamped by app.js
+local function beginTrace(trace)
+    if not config.trace or type(trace) ~= "table" or not trace.id then
+        activeTrace = nil
+        return
+    end
+    local stamps = {}
+    for _, stage in ipairs(TRACE_UI_STAGES) do
+        if trace[stage] then
+            table.insert(stamps, stage .. "=" .. tostring(trace[stage]))
+        end
+    end
+    table.insert(stamps, "lua=" .. traceTime())
+    activeTrace = tostring(trace.id) .. ";" .. table.concat(stamps, ",")
+end
+
+-- Trace header for an outgoing packet (events raised in Lua get their own ID)
+local function traceHeader()
+    local prefix = activeTrace
+    if not prefix then
+        traceCounter = traceCounter + 1
+        prefix = "l" .. traceCounter .. ";created=" .. traceTime()
+    end
+    return prefix .. ",send=" .. traceTime() .. TRACE_SEPARATOR
+end
+
+-- Build and send packet (large payloads go over the TCP stream when connected)
 local function sendPacket(msgType, payload)
     if not udpSocket or not config.enabled then return false end
 
     local payloadBytes = payload or ""
+    if config.trace then
+        msgType = msgType + MSG_FLAG_TRACE
+        payloadBytes = traceHeader() .. payloadBytes
+    end
+    if #payloadBytes > streamThreshold and tcpConnected then
+        return sendFrame(msgType, payloadBytes)
+    end
+
+    if #payloadBytes > maxUdpPayload then
+        log('W', 'blindAccessibility', 'Payload truncated to ' .. maxUdpPayload .. ' bytes (TCP stream not connected)')
+        payloadBytes = payloadBytes:sub(1, maxUdpPayload)
+    end
     local length = #payloadBytes
 
     local packet = HEADER
@@ -98,6 +367,34 @@ local function sendPacket(msgType, payload)
     return true
 end
 
+-- Send a world state value to the helper if it changed ("key|value")
+local function sendState(key, value)
+    value = tostring(value or "")
+    if sentState[key] == value then return end
+    sentState[key] = value
+    sendPacket(MSG_TYPE.STATE, key .. "|" .. value)
+end
+
+-- Introduce this game instance to the helper so it can route our output
+local function sendHello()
+    helloPending = false
+    helloTimer = 0
+    sendPacket(MSG_TYPE.HELLO, getSessionId())
+    -- A (re)started helper has no world state yet
+    for key, value in pairs(sentState) do
+        sendPacket(MSG_TYPE.STATE, key .. "|" .. value)
+    end
+end
+
+-- Re-send HELLO after a stream reconnect and every helloInterval seconds (called every frame)
+local function updateHello(dt)
+    if not config.enabled then return end
+    helloTimer = helloTimer + dt
+    if helloPending or helloTimer >= helloInterval then
+        sendHello()
+    end
+end
+
 -- Announce text (with deduplication)
 local function announce(text, force)
     if not text or text == "" then return end
@@ -114,12 +411,42 @@ local function announceMenuItem(itemText, index, total)
 
     local announcement = itemText
     if config.announcePosition and total > 0 then
-        announcement = string.format("%s, %d of %d", itemText, index, total)
+        -- Helper formats this as "text, index of total"
+        announcement = string.format("%s|%d|%d", itemText:gsub("|", "/"), index, total)
     end
 
     announce(announcement)
 end
 
+-- Send a snapshot of the current menu, once per menu open or item change.
+-- The helper keeps the menu model; focus changes then only send the item ID
+-- (its 1-based position in the snapshot) and the snapshot number. A resend
+-- (requested by the helper) keeps the number.
+local function sendMenuSnapshot(menuName, items, selectedIndex, resend)
+    if not resend then
+        menuSnapshotSeq = menuSnapshotSeq + 1
+    end
+    local texts = { tostring(menuSnapshotSeq), (menuName:gsub("|", "/")), tostring(selectedIndex or 0) }
+    local size = #texts[1] + #texts[2] + #texts[3] + 3
+    local maxSnapshotPayload = tcpConnected and maxStreamPayload or maxUdpPayload
+    for _, item in ipairs(items) do
+        local text = type(item) == "table" and (item.text or item.label or "") or tostring(item)
+        text = text:gsub("|", "/")
+        size = size + #text + 1
+        if size > maxSnapshotPayload then break end
+        table.insert(texts, text)
+    end
+    sendPacket(MSG_TYPE.MENU_ITEMS, table.concat(texts, "|"))
+    lastAnnouncedText = ""
+end
+
+-- Send a focus change within the current menu snapshot ("itemId|seq"). If
+-- the helper does not hold that snapshot it asks for it (MENU_RESYNC)
+local function sendMenuFocus(itemId)
+    sendPacket(MSG_TYPE.MENU_FOCUS, tostring(itemId) .. "|" .. tostring(menuSnapshotSeq))
+    lastAnnouncedText = ""
+end
+
 -- Announce alert (always speaks, interrupts)
 local function announceAlert(text, priority)
     if not text or text == "" then return end
@@ -130,6 +457,18 @@ local function announceAlert(text, priority)
     log('D', 'blindAccessibility', 'Alert: ' .. text)
 end
 
+-- Send a phrase ID with up to two arguments (rendered by the helper)
+local function sendPhrase(phraseId, arg1, arg2)
+    local payload = string.char(phraseId)
+    if arg2 ~= nil then
+        payload = payload .. tostring(arg1) .. PHRASE_ARG_SEPARATOR .. tostring(arg2)
+    elseif arg1 ~= nil then
+        payload = payload .. tostring(arg1)
+    end
+    sendPacket(MSG_TYPE.PHRASE, payload)
+    lastAnnouncedText = "" -- Allow re-announcement
+end
+
 -- Announce status change
 local function announceStatus(text)
     if not text or text == "" then return end
@@ -137,6 +476,12 @@ local function announceStatus(text)
     log('D', 'blindAccessibility', 'Status: ' .. text)
 end
 
+-- Play a non-verbal cue (earcon) in the helper
+local function sendEarcon(name)
+    if not name or name == "" then return end
+    sendPacket(MSG_TYPE.EARCON, name)
+end
+
 -- Announce dialog
 local function announceDialog(title, content, options)
     if not title then return end
@@ -151,25 +496,136 @@ local function announceDialog(title, content, options)
     log('D', 'blindAccessibility', 'Dialog: ' .. title)
 end
 
+-- =============================================================================
+-- SPAWN ALERT AGGREGATION
+-- =============================================================================
+
+-- Start a new burst or extend the current one
+local function touchSpawnBurst()
+    if not spawnBurst.pending then
+        spawnBurst.pending = true
+        spawnBurst.age = 0
+    end
+    spawnBurst.quiet = 0
+end
+
+-- Queue a "vehicle spawned" alert for aggregation
+local function queueSpawnAlert(vehicleName)
+    touchSpawnBurst()
+    spawnBurst.count = spawnBurst.count + 1
+    if not spawnBurst.names[vehicleName] then
+        spawnBurst.names[vehicleName] = 0
+        table.insert(spawnBurst.order, vehicleName)
+    end
+    spawnBurst.names[vehicleName] = spawnBurst.names[vehicleName] + 1
+end
+
+-- Queue a "traffic spawned" alert so it merges with the vehicle spawns of the burst
+local function queueTrafficSpawnAlert(trafficCount)
+    touchSpawnBurst()
+    spawnBurst.trafficCount = trafficCount
+end
+
+-- Build the burst summary, e.g. "5 sunburst, 3 pickup, and 4 others"
+local function summarizeSpawnBurst()
+    local order = spawnBurst.order
+    local names = spawnBurst.names
+    table.sort(order, function(a, b) return names[a] > names[b] end)
+
+    local parts = {}
+    local listed = 0
+    for i = 1, math.min(#order, spawnSummaryMaxNames) do
+        table.insert(parts, names[order[i]] .. " " .. order[i])
+        listed = listed + names[order[i]]
+    end
+    if spawnBurst.count > listed then
+        table.insert(parts, "and " .. (spawnBurst.count - listed) .. " others")
+    end
+    return table.concat(parts, ", ")
+end
+
+-- Send the aggregated alert for the current burst and reset it
+local function flushSpawnBurst()
+    if not spawnBurst.pending then return end
+
+    if spawnBurst.trafficCount then
+        sendEarcon("traffic_spawned")
+        if spawnBurst.count > 0 then
+            sendPhrase(PHRASE.TRAFFIC_SPAWNED_SUMMARY, spawnBurst.trafficCount, summarizeSpawnBurst())
+        else
+            sendPhrase(PHRASE.TRAFFIC_SPAWNED, spawnBurst.trafficCount)
+        end
+    elseif spawnBurst.count == 1 then
+        sendPhrase(PHRASE.VEHICLE_SPAWNED, spawnBurst.order[1])
+    elseif spawnBurst.count > 1 then
+        sendPhrase(PHRASE.VEHICLES_SPAWNED, spawnBurst.count, summarizeSpawnBurst())
+    end
+
+    spawnBurst.count = 0
+    spawnBurst.names = {}
+    spawnBurst.order = {}
+    spawnBurst.trafficCount = nil
+    spawnBurst.pending = false
+end
+
+-- Advance burst timers; flush once the burst goes quiet or hits its deadline
+local function updateSpawnBurst(dt)
+    if not spawnBurst.pending then return end
+
+    spawnBurst.age = spawnBurst.age + dt
+    spawnBurst.quiet = spawnBurst.quiet + dt
+    if spawnBurst.quiet >= spawnAggregateWindow or spawnBurst.age >= spawnAggregateMaxDelay then
+        flushSpawnBurst()
+    end
+end
+
 -- =============================================================================
 -- AI STATE MONITORING - Uses BeamNG's built-in hooks
 -- =============================================================================
 
--- Get friendly name for AI mode
-local function getAiModeName(mode)
-    local modeNames = {
-        disabled = "disabled",
-        traffic = "traffic mode",
-        random = "random exploration",
-        span = "full map exploration",
-        chase = "chase mode",
-        flee = "flee mode",
-        manual = "waypoint mode",
-        follow = "follow mode",
-        stopping = "stopping",
-        script = "scripted path",
-    }
-    return modeNames[mode] or mode
+-- Drop all tracked AI state for a vehicle
+local function evictVehicleState(vehicleId)
+    if aiState.lastTouched[vehicleId] == nil then return end
+
+    aiState.vehicleModes[vehicleId] = nil
+    aiState.lastPolledModes[vehicleId] = nil
+    aiState.lastTouched[vehicleId] = nil
+    aiState.trackedCount = aiState.trackedCount - 1
+end
+
+-- Mark a vehicle's AI state as recently used (on reads, polls and writes),
+-- evicting the least recently used vehicle if the table grows past
+-- maxTrackedVehicles. The player vehicle is never evicted.
+local function touchVehicleState(vehicleId)
+    vehicleTouchCounter = vehicleTouchCounter + 1
+
+    if aiState.lastTouched[vehicleId] == nil then
+        aiState.trackedCount = aiState.trackedCount + 1
+
+        if aiState.trackedCount > maxTrackedVehicles then
+            local playerVid = be:getPlayerVehicleID(0)
+            local oldestId, oldestTouch = nil, math.huge
+            for vid, touch in pairs(aiState.lastTouched) do
+                if touch < oldestTouch and vid ~= playerVid then
+                    oldestId, oldestTouch = vid, touch
+                end
+            end
+            if oldestId then
+                log('D', 'blindAccessibility', 'AI state table full, evicting vehicle ' .. tostring(oldestId))
+                evictVehicleState(oldestId)
+            end
+        end
+    end
+
+    aiState.lastTouched[vehicleId] = vehicleTouchCounter
+end
+
+-- Reset all per-vehicle AI state
+local function resetVehicleStates()
+    aiState.vehicleModes = {}
+    aiState.lastPolledModes = {}
+    aiState.lastTouched = {}
+    aiState.trackedCount = 0
 end
 
 -- Check if vehicle is the player's vehicle
@@ -178,6 +634,21 @@ local function isPlayerVehicle(vehicleId)
     return playerVid and playerVid == vehicleId
 end
 
+-- Publish the player vehicle and its AI mode when the player switches vehicle
+local function updatePlayerState(playerVid)
+    if playerVid == lastPlayerVid then return end
+    lastPlayerVid = playerVid
+
+    local vehicle = playerVid and playerVid >= 0 and be:getObjectByID(playerVid)
+    if not vehicle then
+        sendState("player", "")
+        return
+    end
+    touchVehicleState(playerVid)
+    sendState("player", vehicle:getJBeamFilename() or "Vehicle")
+    sendState("ai_mode", aiState.vehicleModes[playerVid] or "disabled")
+end
+
 -- Handle AI mode change (called by hook or polling)
 local function handleAiModeChange(vehicleId, newAiMode, source)
     local oldMode = aiState.vehicleModes[vehicleId] or "disabled"
@@ -190,14 +661,18 @@ local function handleAiModeChange(vehicleId, newAiMode, source)
     if normalizedNew == normalizedOld then return end
 
     log('I', 'blindAccessibility', 'AI mode change (' .. source .. '): vehicle ' .. tostring(vehicleId) .. ' ' .. normalizedOld .. ' -> ' .. normalizedNew)
+    touchVehicleState(vehicleId)
     aiState.vehicleModes[vehicleId] = newAiMode
 
     -- Only announce for player vehicle
     if isPlayerVehicle(vehicleId) then
+        sendState("ai_mode", normalizedNew)
         if normalizedNew == "disabled" then
-            announceAlert("AI disabled, manual control", 1)
+            sendEarcon("ai_off")
+            sendPhrase(PHRASE.AI_DISABLED)
         else
-            announceAlert("AI enabled, " .. getAiModeName(newAiMode), 1)
+            sendEarcon("ai_on")
+            sendPhrase(PHRASE.AI_ENABLED, normalizedNew)
         end
     else
         -- Non-player vehicle AI changed (could be traffic, chase vehicle, etc.)
@@ -205,7 +680,7 @@ local function handleAiModeChange(vehicleId, newAiMode, source)
             local vehicle = be:getObjectByID(vehicleId)
             local vehicleName = vehicle and vehicle:getJBeamFilename() or "Vehicle"
             if normalizedNew ~= "disabled" then
-                announceStatus(vehicleName .. " AI: " .. getAiModeName(newAiMode))
+                sendPhrase(PHRASE.VEHICLE_AI, vehicleName, normalizedNew)
             end
         end
     end
@@ -311,6 +786,7 @@ local function onAiModePolled(vehicleId, mode, debugInfo)
     -- Normalize mode for comparison
     local normalizedMode = (mode == nil or mode == "") and "disabled" or mode
 
+    touchVehicleState(vehicleId)
     local lastPolled = aiState.lastPolledModes[vehicleId]
     if lastPolled ~= normalizedMode then
         log('I', 'blindAccessibility', 'AI mode change detected via vehicle poll: ' .. tostring(lastPolled) .. ' -> ' .. normalizedMode)
@@ -323,48 +799,109 @@ local function onAiModePolled(vehicleId, mode, debugInfo)
     end
 end
 
--- Check traffic state (still needs polling as there's no direct hook)
-local function checkTrafficState()
-    local trafficCount = 0
+-- Fetch the traffic vehicle IDs from gameplay_traffic (called through pcall)
+-- Returns a table keyed by vehicle ID, an array of IDs, or a plain count
+local function fetchTrafficVehicles()
+    if gameplay_traffic.getTrafficData then
+        return gameplay_traffic.getTrafficData()
+    elseif gameplay_traffic.getTrafficList then
+        return gameplay_traffic.getTrafficList()
+    elseif gameplay_traffic.getNumOfTraffic then
+        return gameplay_traffic.getNumOfTraffic()
+    end
+    return 0
+end
 
-    -- Try to count traffic vehicles using gameplay_traffic
-    if gameplay_traffic then
-        local success, count = pcall(function()
-            if gameplay_traffic.getNumOfTraffic then
-                return gameplay_traffic.getNumOfTraffic()
-            elseif gameplay_traffic.getTrafficList then
-                local list = gameplay_traffic.getTrafficList()
-                return list and #list or 0
-            end
-            return 0
-        end)
-        if success and count then
-            trafficCount = count
-        end
+-- Check whether gameplay_traffic manages a vehicle (called through pcall)
+local function fetchIsTrafficVehicle(vehicleId)
+    if gameplay_traffic.getTrafficData then
+        local data = gameplay_traffic.getTrafficData()
+        return data ~= nil and data[vehicleId] ~= nil
     end
+    return false
+end
 
-    -- Detect traffic spawning/clearing
-    if trafficCount > 0 and aiState.lastTrafficCount == 0 then
-        aiState.trafficActive = true
-        announceAlert("Traffic spawned, " .. trafficCount .. " vehicles", 1)
-    elseif trafficCount == 0 and aiState.lastTrafficCount > 0 then
+-- Announce traffic appearing/disappearing based on the current roster count
+-- (spawn announcements are left to hooks that see the whole batch)
+local function updateTrafficActive(allowSpawnAnnounce)
+    local trafficCount = aiState.trafficCount
+
+    if trafficCount > 0 and not aiState.trafficActive then
+        if allowSpawnAnnounce then
+            aiState.trafficActive = true
+            queueTrafficSpawnAlert(trafficCount)
+        end
+    elseif trafficCount == 0 and aiState.trafficActive then
         aiState.trafficActive = false
-        announceAlert("Traffic cleared", 1)
+        sendPhrase(PHRASE.TRAFFIC_CLEARED)
     end
+end
+
+-- Add a vehicle to the traffic roster
+local function addTrafficVehicle(vehicleId)
+    if aiState.trafficRoster[vehicleId] then return end
+    aiState.trafficRoster[vehicleId] = true
+    aiState.trafficCount = aiState.trafficCount + 1
+end
 
-    aiState.lastTrafficCount = trafficCount
+-- Remove a vehicle from the traffic roster
+local function removeTrafficVehicle(vehicleId)
+    if not aiState.trafficRoster[vehicleId] then return end
+    aiState.trafficRoster[vehicleId] = nil
+    aiState.trafficCount = aiState.trafficCount - 1
+    updateTrafficActive(false)
+end
+
+-- Rebuild the traffic roster from gameplay_traffic (low-rate safety net)
+local function reconcileTrafficState()
+    if not gameplay_traffic then return end
+
+    local success, result = pcall(fetchTrafficVehicles)
+    if not success or result == nil then return end
+
+    local roster = {}
+    local trafficCount = 0
+    if type(result) == "table" then
+        for k, v in pairs(result) do
+            -- Array of IDs (getTrafficList) or map keyed by ID (getTrafficData)
+            local vehicleId = type(k) == "number" and type(v) == "number" and v or k
+            if not roster[vehicleId] then
+                roster[vehicleId] = true
+                trafficCount = trafficCount + 1
+            end
+        end
+    elseif type(result) == "number" then
+        -- Count-only API: keep the roster, trust the count
+        roster = aiState.trafficRoster
+        trafficCount = result
+    end
+
+    if trafficCount ~= aiState.trafficCount then
+        log('D', 'blindAccessibility', 'Traffic reconciled: ' .. aiState.trafficCount .. ' -> ' .. trafficCount)
+    end
+    aiState.trafficRoster = roster
+    aiState.trafficCount = trafficCount
+    updateTrafficActive(true)
 end
 
 -- Called when traffic system starts (hook name is onTrafficStart, not onTrafficStarted)
 local function onTrafficStart()
     log('I', 'blindAccessibility', 'onTrafficStart HOOK FIRED: Traffic system started')
-    -- Will be picked up by the next traffic check
+    reconcileTrafficState()
 end
 
 -- Keep old name as alias in case some versions use it
 local function onTrafficStarted()
     log('I', 'blindAccessibility', 'onTrafficStarted HOOK FIRED: Traffic system started')
-    -- Will be picked up by the next traffic check
+    reconcileTrafficState()
+end
+
+-- Called when the traffic system is stopped
+local function onTrafficStopped()
+    log('I', 'blindAccessibility', 'onTrafficStopped HOOK FIRED: Traffic system stopped')
+    aiState.trafficRoster = {}
+    aiState.trafficCount = 0
+    updateTrafficActive(false)
 end
 
 -- =============================================================================
@@ -390,7 +927,20 @@ local function onMenuStateChanged(data)
         end
     end
 
-    announceMenuItem(selectedText, selectedIndex, #items)
+    if #items > 0 then
+        -- The helper announces the focused item from the snapshot
+        sendMenuSnapshot(menuName, items, selectedIndex)
+    else
+        announceMenuItem(selectedText, selectedIndex, #items)
+    end
+end
+
+-- Handle focus moving to another item of the current menu snapshot
+local function onMenuFocus(data)
+    if not data or not data.id then return end
+
+    currentMenuIndex = data.id
+    sendMenuFocus(data.id)
 end
 
 -- Handle menu item focus change
@@ -422,11 +972,40 @@ local function onMenuClosed(data)
     if config.verbosity == "verbose" then
         announce("Menu closed", true)
     end
+    -- An empty snapshot clears the helper's menu model
+    if #currentMenuItems > 0 then
+        sendMenuSnapshot("", {}, 0)
+    end
     currentMenu = ""
     currentMenuItems = {}
     currentMenuIndex = 0
 end
 
+-- The helper missed the snapshot a focus delta refers to: send it again
+local function onMenuResync()
+    if #currentMenuItems > 0 then
+        sendMenuSnapshot(currentMenu, currentMenuItems, currentMenuIndex, true)
+    else
+        sendMenuSnapshot("", {}, 0, true)
+    end
+end
+
+-- Read requests the helper sends back over UDP (called every frame)
+local function receiveFromHelper()
+    if not udpSocket or not config.enabled then return end
+    for _ = 1, maxHelperPackets do
+        -- Errors (nothing received, or not bound before the first send) mean no request
+        local data = udpSocket:receivefrom()
+        if not data then return end
+        if #data >= #HEADER + 3 and data:sub(1, #HEADER) == HEADER then
+            local msgType = data:byte(#HEADER + 1)
+            if msgType == MSG_TYPE.MENU_RESYNC then
+                onMenuResync()
+            end
+        end
+    end
+end
+
 -- Handle button/action activation
 local function onActionActivated(data)
     if not data then return end
@@ -442,9 +1021,9 @@ local function onLoadingStateChanged(data)
     if not data then return end
 
     if data.loading then
-        announceStatus("Loading " .. (data.what or ""))
+        sendPhrase(PHRASE.LOADING, data.what or "")
     else
-        announceStatus("Loading complete")
+        sendPhrase(PHRASE.LOADING_COMPLETE)
     end
 end
 
@@ -453,7 +1032,33 @@ local function onVehicleSpawned(vehicleId)
     local vehicle = be:getObjectByID(vehicleId)
     if vehicle then
         local vehicleName = vehicle:getJBeamFilename() or "Vehicle"
-        announceAlert("Vehicle spawned: " .. vehicleName, 1)
+        queueSpawnAlert(vehicleName)
+    end
+
+    if gameplay_traffic then
+        local success, isTraffic = pcall(fetchIsTrafficVehicle, vehicleId)
+        if success and isTraffic then
+            addTrafficVehicle(vehicleId)
+        end
+    end
+end
+
+-- Handle vehicle removal - drop its tracked AI state and traffic entry
+local function onVehicleDestroyed(vehicleId)
+    evictVehicleState(vehicleId)
+    removeTrafficVehicle(vehicleId)
+end
+
+-- Handle vehicle pooling (traffic despawn deactivates instead of destroying)
+local function onVehicleActiveChanged(vehicleId, active)
+    if not active or active == 0 then
+        evictVehicleState(vehicleId)
+        removeTrafficVehicle(vehicleId)
+    elseif gameplay_traffic then
+        local success, isTraffic = pcall(fetchIsTrafficVehicle, vehicleId)
+        if success and isTraffic then
+            addTrafficVehicle(vehicleId)
+        end
     end
 end
 
@@ -461,12 +1066,20 @@ end
 local function onClientStartMission(levelPath)
     local levelName = levelPath or "Level"
     levelName = levelName:match("([^/]+)$") or levelName
-    announceAlert("Level loaded: " .. levelName, 1)
+    sendPhrase(PHRASE.LEVEL_LOADED, levelName)
+    sendState("level", levelName)
+
+    -- Send the new level's road graph for route guidance (see updateGuidance)
+    guidanceLevel = levelName
+    roadGraphPending = true
+    roadGraphSent = false
+    roadGraphWaited = 0
 
     -- Reset AI state tracking
-    aiState.vehicleModes = {}
+    resetVehicleStates()
     aiState.trafficActive = false
-    aiState.lastTrafficCount = 0
+    aiState.trafficRoster = {}
+    aiState.trafficCount = 0
 end
 
 -- =============================================================================
@@ -478,9 +1091,12 @@ local function onAccessibilityEvent(data)
     if not data or not data.type then return end
 
     local eventType = data.type
+    beginTrace(data.trace)
 
     if eventType == "menuState" then
         onMenuStateChanged(data)
+    elseif eventType == "menuFocus" then
+        onMenuFocus(data)
     elseif eventType == "menuItemFocused" then
         onMenuItemFocused(data)
     elseif eventType == "menuOpened" then
@@ -497,6 +1113,18 @@ local function onAccessibilityEvent(data)
         announceStatus(data.text)
     elseif eventType == "custom" then
         announce(data.text, data.force)
+    elseif eventType == "earcon" then
+        sendEarcon(data.name)
+    end
+    activeTrace = nil
+end
+
+-- Called from UI app once per animation frame with all events queued that frame
+local function onAccessibilityEventBatch(events)
+    if not events then return end
+
+    for _, data in ipairs(events) do
+        onAccessibilityEvent(data)
     end
 end
 
@@ -528,13 +1156,14 @@ local function aiSpeedUp()
     local newSpeed = aiCurrentSpeed + aiSpeedStep
     if newSpeed > aiMaxSpeed then
         newSpeed = aiMaxSpeed
-        announceAlert("Maximum speed, " .. msToKmh(newSpeed) .. " kilometers per hour", 1)
+        sendPhrase(PHRASE.AI_SPEED_MAX, msToKmh(newSpeed))
     else
         aiCurrentSpeed = newSpeed
+        sendState("ai_speed", msToKmh(aiCurrentSpeed))
         if applyAiSpeed() then
-            announceAlert("Speed " .. msToKmh(aiCurrentSpeed) .. " kilometers per hour", 1)
+            sendPhrase(PHRASE.AI_SPEED_SET, msToKmh(aiCurrentSpeed))
         else
-            announceAlert("No vehicle for AI speed", 1)
+            sendPhrase(PHRASE.AI_NO_VEHICLE)
         end
     end
 end
@@ -544,20 +1173,21 @@ local function aiSpeedDown()
     local newSpeed = aiCurrentSpeed - aiSpeedStep
     if newSpeed < aiMinSpeed then
         newSpeed = aiMinSpeed
-        announceAlert("Minimum speed, " .. msToKmh(newSpeed) .. " kilometers per hour", 1)
+        sendPhrase(PHRASE.AI_SPEED_MIN, msToKmh(newSpeed))
     else
         aiCurrentSpeed = newSpeed
+        sendState("ai_speed", msToKmh(aiCurrentSpeed))
         if applyAiSpeed() then
-            announceAlert("Speed " .. msToKmh(aiCurrentSpeed) .. " kilometers per hour", 1)
+            sendPhrase(PHRASE.AI_SPEED_SET, msToKmh(aiCurrentSpeed))
         else
-            announceAlert("No vehicle for AI speed", 1)
+            sendPhrase(PHRASE.AI_NO_VEHICLE)
         end
     end
 end
 
 -- Announce current AI speed
 local function aiAnnounceSpeed()
-    announceAlert("AI speed " .. msToKmh(aiCurrentSpeed) .. " kilometers per hour", 1)
+    sendPhrase(PHRASE.AI_SPEED, msToKmh(aiCurrentSpeed))
 end
 
 -- =============================================================================
@@ -615,7 +1245,7 @@ local function diagnoseAiState()
     vehicle:queueLuaCommand(cmd)
 
     -- Also announce what we have tracked
-    announceStatus("Tracked mode: " .. trackedMode .. ", Polled: " .. polledMode)
+    announceStatus("Tracked mode: " .. trackedMode .. ", Polled: " .. polledMode .. ", tracking " .. aiState.trackedCount .. " vehicles")
 end
 
 -- Called when diagnostic result comes back from vehicle
@@ -624,19 +1254,119 @@ local function onDiagnosticResult(result)
     announceAlert("Vehicle reports: " .. tostring(result), 1)
 end
 
+-- =============================================================================
+-- ROUTE GUIDANCE
+-- =============================================================================
+
+-- Serialize the level's road graph:
+--   "level\29x,y,z,radius;x,y,z,radius;...\29a,b,oneWay;..."
+-- Edges refer to nodes by their position in the node list; oneWay is 0 for
+-- two-way roads, 1 if traffic flows from a to b and 2 if from b to a.
+-- Returns nil while the navgraph is not loaded.
+local function buildRoadGraph(levelName)
+    local mapData = map and map.getMap and map.getMap()
+    if not mapData or not mapData.nodes or next(mapData.nodes) == nil then return nil end
+
+    local index = {}
+    local nodes = {}
+    for name, node in pairs(mapData.nodes) do
+        local pos = node.pos
+        nodes[#nodes + 1] = string.format("%.1f,%.1f,%.1f,%.1f", pos.x, pos.y, pos.z, node.radius or 0)
+        index[name] = #nodes - 1
+    end
+
+    local edges = {}
+    for name, node in pairs(mapData.nodes) do
+        local a = index[name]
+        for other, link in pairs(node.links or {}) do
+            local b = index[other]
+            local otherLinks = b and mapData.nodes[other].links
+            -- Links are usually listed on both nodes; send each edge once
+            if b and (a < b or not (otherLinks and otherLinks[name])) then
+                local oneWay = 0
+                if type(link) == "table" and link.oneWay then
+                    oneWay = (link.inNode == name) and 1 or 2
+                    if a > b then oneWay = 3 - oneWay end
+                end
+                edges[#edges + 1] = math.min(a, b) .. "," .. math.max(a, b) .. "," .. oneWay
+            end
+        end
+    end
+
+    return levelName .. GRAPH_SEPARATOR .. table.concat(nodes, ";") .. GRAPH_SEPARATOR .. table.concat(edges, ";")
+end
+
+-- Send the pending road graph once the navgraph is loaded and the stream is up
+local function sendRoadGraph()
+    local payload = buildRoadGraph(guidanceLevel)
+    if not payload then return false end
+    if not tcpConnected and #payload > maxUdpPayload then return false end
+
+    sendPacket(MSG_TYPE.ROAD_GRAPH, payload)
+    log('I', 'blindAccessibility', 'Road graph sent (' .. #payload .. ' bytes)')
+    roadGraphPending = false
+    roadGraphSent = true
+    return true
+end
+
+-- Send the player's position and heading ("x|y|z|dirX|dirY|km/h")
+local function sendPosition()
+    local playerVid = be:getPlayerVehicleID(0)
+    local vehicle = playerVid and playerVid >= 0 and be:getObjectByID(playerVid)
+    if not vehicle then return end
+
+    local pos = vehicle:getPosition()
+    local dir = vehicle:getDirectionVector()
+    local vel = vehicle:getVelocity()
+    local speed = math.sqrt(vel.x * vel.x + vel.y * vel.y + vel.z * vel.z)
+    sendPacket(MSG_TYPE.POSITION, string.format("%.1f|%.1f|%.1f|%.3f|%.3f|%d",
+        pos.x, pos.y, pos.z, dir.x, dir.y, msToKmh(speed)))
+end
+
+-- Road graph retries and position updates (called every frame)
+local function updateGuidance(dt)
+    if not config.guidance then return end
+
+    guidanceTimer = guidanceTimer + dt
+    if guidanceTimer < config.guidanceInterval then return end
+    local elapsed = guidanceTimer
+    guidanceTimer = 0
+
+    if roadGraphPending then
+        roadGraphWaited = roadGraphWaited + elapsed
+        if not sendRoadGraph() and roadGraphWaited >= roadGraphMaxWait then
+            log('W', 'blindAccessibility', 'Road graph not sent (navgraph or TCP stream unavailable)')
+            roadGraphPending = false
+        end
+    end
+    if roadGraphSent then
+        sendPosition()
+    end
+end
+
+-- The navgraph changed (e.g. reloaded by the editor); send it again
+local function onNavgraphReloaded()
+    if guidanceLevel then
+        roadGraphPending = true
+        roadGraphWaited = 0
+    end
+end
+
 -- =============================================================================
 -- EXTENSION LIFECYCLE
 -- =============================================================================
 
 local function onExtensionLoaded()
     log('I', 'blindAccessibility', 'Blind Accessibility extension loading...')
-    log('I', 'blindAccessibility', 'AI hooks registered: onAiModeChange, onVehicleAIStateChanged, onTrafficStart')
+    log('I', 'blindAccessibility', 'AI hooks registered: onAiModeChange, onVehicleAIStateChanged, onTrafficStart, onTrafficStopped')
 
     if not initSocket() then
         log('E', 'blindAccessibility', 'Failed to initialize, extension disabled')
         config.enabled = false
         return
     end
+    sendHello()
+    sendState("ai_speed", msToKmh(aiCurrentSpeed))
 
     -- Input actions are defined in JSON file:
     -- lua/ge/extensions/core/input/actions/blindAccessibility.json
@@ -656,6 +1386,7 @@ local function onExtensionUnloaded()
         udpSocket:close()
         udpSocket = nil
     end
+    closeStreamSocket()
     log('I', 'blindAccessibility', 'Blind Accessibility extension unloaded')
 end
 
@@ -724,6 +1455,7 @@ local function pollAiStateGE()
     -- If we got a mode, process it
     if mode then
         local normalizedMode = (mode == nil or mode == "" or mode == false) and "disabled" or tostring(mode)
+        touchVehicleState(playerVid)
         local lastMode = aiState.lastPolledModes[playerVid]
 
         if lastMode ~= normalizedMode then
@@ -740,11 +1472,29 @@ end
 
 -- Called every frame - monitors traffic and AI state
 local function onUpdate(dtReal, dtSim, dtRaw)
-    -- Traffic monitoring
+    -- TCP stream reconnect and flush
+    updateStream(dtReal)
+
+    -- HELLO heartbeat for restarted helpers
+    updateHello(dtReal)
+
+    -- Menu snapshot requests from the helper
+    receiveFromHelper()
+
+    -- Spawn alert aggregation
+    updateSpawnBurst(dtReal)
+
+    -- Road graph export and position updates for route guidance
+    updateGuidance(dtReal)
+
+    -- Traffic count for the helper's world state (coalesced to one update per frame)
+    sendState("traffic", aiState.trafficCount)
+
+    -- Traffic roster reconciliation (hooks keep it current in between)
     trafficCheckTimer = trafficCheckTimer + dtReal
-    if trafficCheckTimer >= trafficCheckInterval then
+    if trafficCheckTimer >= trafficReconcileInterval then
         trafficCheckTimer = 0
-        checkTrafficState()
+        reconcileTrafficState()
     end
 
     -- AI state polling fallback (in case hooks don't fire)
@@ -753,6 +1503,7 @@ local function onUpdate(dtReal, dtSim, dtRaw)
         aiPollTimer = 0
 
         local playerVid = be:getPlayerVehicleID(0)
+        updatePlayerState(playerVid)
         if playerVid and playerVid >= 0 then
             if debugAiPolling then
                 log('D', 'blindAccessibility', 'Polling AI state for vehicle ' .. tostring(playerVid))
@@ -783,6 +1534,11 @@ local function setConfig(newConfig)
         end
     end
     initSocket()
+    sendHello()
+    -- The UI app only stamps events with trace data while tracing is on
+    if guihooks then
+        guihooks.trigger('BlindAccessibilityTrace', config.trace)
+    end
 end
 
 local function getConfig()
@@ -797,6 +1553,7 @@ local function setEnabled(enabled)
     config.enabled = enabled
     if enabled then
         initSocket()
+        sendHello()
         announceStatus("Blind Accessibility enabled")
     else
         announceStatus("Blind Accessibility disabled")
@@ -817,8 +1574,12 @@ M.onAiModeChange = onAiModeChange              -- Called when any vehicle's AI m
 M.onVehicleAIStateChanged = onVehicleAIStateChanged  -- Alternative AI state hook
 M.onTrafficStart = onTrafficStart              -- Called when traffic system starts (correct name)
 M.onTrafficStarted = onTrafficStarted          -- Alias for compatibility
+M.onTrafficStopped = onTrafficStopped
 M.onVehicleSpawned = onVehicleSpawned
+M.onVehicleDestroyed = onVehicleDestroyed
+M.onVehicleActiveChanged = onVehicleActiveChanged
 M.onClientStartMission = onClientStartMission
+M.onNavgraphReloaded = onNavgraphReloaded
 
 -- Polling callback (for fallback AI detection)
 M.onAiModePolled = onAiModePolled
@@ -836,11 +1597,13 @@ M.onAiPollPing = onAiPollPing
 
 -- Public API for UI app and other extensions
 M.onAccessibilityEvent = onAccessibilityEvent
+M.onAccessibilityEventBatch = onAccessibilityEventBatch
 M.announce = announce
 M.announceAlert = announceAlert
 M.announceStatus = announceStatus
 M.announceDialog = announceDialog
 M.announceMenuItem = announceMenuItem
+M.sendEarcon = sendEarcon
 
 -- Configuration
 M.setConfig = setConfig
@@ -16,8 +16,12 @@ function(bngApi, $timeout, $document) {
             // Configuration
             var config = {
                 enabled: true,
+                trace: false,       // Mirrors the extension's trace option (events are only stamped when on)
                 pollInterval: 100,  // ms between DOM checks
                 debounceTime: 50,   // ms to debounce rapid changes
+                idleTimeout: 500,       // ms before queued nodes are classified even without idle time
+                maxNodesPerSlice: 50,   // max nodes classified per idle callback
+                maxPendingNodes: 2000,  // max queued nodes awaiting classification
             };
 
             // State tracking
@@ -29,13 +33,99 @@ function(bngApi, $timeout, $document) {
             var debounceTimer = null;
             var pollTimer = null;
 
+            // Menu snapshot last sent - focus changes within it only send the item ID
+            var snapshotMenuElement = null;
+            var snapshotSignature = '';
+
+            // Outbound batch - flushed once per animation frame
+            var pendingEvents = [];
+            var flushHandle = null;
+
+            // Tracing - every event carries a correlation ID and stage timestamps,
+            // forwarded to the helper when the extension's trace option is on
+            var traceCounter = 0;
+            var lastInputTime = 0;  // Last navigation key press
+            var lastPollTime = 0;   // End of the previous poll tick
+            var polling = false;    // True while pollUIState runs
+
+            // Mutation pipeline - observer enqueues, idle callback classifies
+            // pendingNodes[pendingHead..] are waiting; consumed slots are compacted away
+            // once half the array is used, so taking a node never copies the queue
+            var pendingNodes = [];
+            var pendingHead = 0;
+            var queuedNodes = new WeakSet();
+            var batchRoots = new WeakSet();  // Dialog/menu roots announced since the queue was last empty
+            var idleHandle = null;
+
+            /**
+             * Send all pending events to the game engine in a single engineLua call,
+             * so the engine compiles one Lua chunk per frame instead of one per event
+             */
+            function flushEvents() {
+                flushHandle = null;
+                if (pendingEvents.length === 0) return;
+
+                var batch = pendingEvents;
+                pendingEvents = [];
+                var now = Date.now();
+                for (var i = 0; i < batch.length; i++) {
+                    if (batch[i].trace) batch[i].trace.flush = now;
+                }
+                bngApi.engineLua('extensions.blindAccessibility.onAccessibilityEventBatch(' +
+                    bngApi.serializeToLua(batch) + ')');
+            }
+
+            /**
+             * Schedule a flush for the next animation frame (if not already scheduled)
+             */
+            function scheduleFlush() {
+                if (flushHandle !== null) return;
+                if (window.requestAnimationFrame) {
+                    flushHandle = window.requestAnimationFrame(flushEvents);
+                } else {
+                    flushHandle = setTimeout(flushEvents, 16);
+                }
+            }
+
+            /**
+             * Cancel a scheduled flush
+             */
+            function cancelFlush() {
+                if (flushHandle === null) return;
+                if (window.cancelAnimationFrame) {
+                    window.cancelAnimationFrame(flushHandle);
+                } else {
+                    clearTimeout(flushHandle);
+                }
+                flushHandle = null;
+            }
+
+            /**
+             * Give an event its correlation ID and creation time. Events found by
+             * polling record the previous poll (the change happened after it),
+             * events following a key press record the key press. Only done while
+             * tracing is on, so normal batches carry no trace data.
+             */
+            function stampEvent(eventData) {
+                if (!config.trace || eventData.trace) return eventData;
+
+                var trace = { id: 'u' + (++traceCounter), created: Date.now() };
+                if (polling) {
+                    if (lastPollTime) trace.poll = lastPollTime;
+                } else if (lastInputTime && trace.created - lastInputTime < 500) {
+                    trace.input = lastInputTime;
+                }
+                eventData.trace = trace;
+                return eventData;
+            }
+
             /**
              * Send accessibility event to game engine extension
              */
             function sendEvent(eventData) {
                 if (!config.enabled) return;
-                bngApi.engineLua('extensions.blindAccessibility.onAccessibilityEvent(' +
-                    bngApi.serializeToLua(eventData) + ')');
+                pendingEvents.push(stampEvent(eventData));
+                scheduleFlush();
             }
 
             /**
@@ -45,7 +135,9 @@ function(bngApi, $timeout, $document) {
                 if (debounceTimer) {
                     $timeout.cancel(debounceTimer);
                 }
+                stampEvent(eventData);
                 debounceTimer = $timeout(function() {
+                    if (eventData.trace) eventData.trace.sent = Date.now();
                     sendEvent(eventData);
                 }, config.debounceTime);
             }
@@ -149,6 +241,44 @@ function(bngApi, $timeout, $document) {
                 return null;
             }
 
+            /**
+             * Send a snapshot of the menu if it opened or its items changed.
+             * Returns true if a snapshot was sent (it carries the focused item).
+             */
+            function syncMenuSnapshot(menuContext, items, selectedIndex) {
+                var texts = items.map(function(item) { return item.text; });
+                var signature = menuContext.name + '\n' + texts.join('\n');
+                if (menuContext.element === snapshotMenuElement && signature === snapshotSignature) {
+                    return false;
+                }
+
+                snapshotMenuElement = menuContext.element;
+                snapshotSignature = signature;
+
+                // A queued focus delta refers to the previous snapshot
+                if (debounceTimer) {
+                    $timeout.cancel(debounceTimer);
+                    debounceTimer = null;
+                }
+
+                sendEvent({
+                    type: 'menuState',
+                    menuName: menuContext.name,
+                    items: texts.map(function(text, i) { return { id: i + 1, text: text }; }),
+                    selectedIndex: selectedIndex + 1,
+                    selectedText: selectedIndex >= 0 ? texts[selectedIndex] : ''
+                });
+                return true;
+            }
+
+            /**
+             * Forget the menu snapshot (menu closed)
+             */
+            function resetMenuSnapshot() {
+                snapshotMenuElement = null;
+                snapshotSignature = '';
+            }
+
             /**
              * Handle focus change
              */
@@ -169,6 +299,14 @@ function(bngApi, $timeout, $document) {
                 var items = menuContext ? getMenuItems(menuContext.element) : [];
                 var selectedIndex = findSelectedItem(items);
 
+                if (menuContext && selectedIndex >= 0) {
+                    currentSelectedIndex = selectedIndex;
+                    if (!syncMenuSnapshot(menuContext, items, selectedIndex)) {
+                        sendEventDebounced({ type: 'menuFocus', id: selectedIndex + 1 });
+                    }
+                    return;
+                }
+
                 sendEventDebounced({
                     type: 'menuItemFocused',
                     text: text,
@@ -183,6 +321,7 @@ function(bngApi, $timeout, $document) {
              */
             function pollUIState() {
                 if (!config.enabled) return;
+                polling = true;
 
                 // Check for active element changes
                 var activeElement = document.activeElement;
@@ -196,28 +335,52 @@ function(bngApi, $timeout, $document) {
                     var items = getMenuItems(menuContext.element);
                     var selectedIndex = findSelectedItem(items);
 
-                    if (selectedIndex !== currentSelectedIndex && selectedIndex >= 0) {
+                    if (items.length > 0 && syncMenuSnapshot(menuContext, items, selectedIndex)) {
+                        currentSelectedIndex = selectedIndex;
+                        if (selectedIndex >= 0) {
+                            lastAnnouncedText = items[selectedIndex].text;
+                        }
+                    } else if (selectedIndex !== currentSelectedIndex && selectedIndex >= 0) {
                         currentSelectedIndex = selectedIndex;
                         var selectedItem = items[selectedIndex];
 
                         if (selectedItem && selectedItem.text !== lastAnnouncedText) {
                             lastAnnouncedText = selectedItem.text;
-
-                            sendEvent({
-                                type: 'menuItemFocused',
-                                text: selectedItem.text,
-                                index: selectedIndex + 1,
-                                total: items.length,
-                                menuName: menuContext.name
-                            });
+                            sendEvent({ type: 'menuFocus', id: selectedIndex + 1 });
                         }
                     }
+                } else if (snapshotMenuElement) {
+                    resetMenuSnapshot();
                 }
 
+                polling = false;
+                lastPollTime = Date.now();
+
                 // Schedule next poll
                 pollTimer = $timeout(pollUIState, config.pollInterval);
             }
 
+            /**
+             * Check whether a key moves through a list
+             */
+            function isListKey(key) {
+                return key === 'ArrowUp' || key === 'ArrowDown' || key === 38 || key === 40;
+            }
+
+            /**
+             * Focus did not move after an arrow key - cue if we are at the end of a list
+             */
+            function checkListBoundary() {
+                var menuContext = detectMenuContext();
+                if (!menuContext) return;
+
+                var items = getMenuItems(menuContext.element);
+                var selectedIndex = findSelectedItem(items);
+                if (items.length > 0 && (selectedIndex === 0 || selectedIndex === items.length - 1)) {
+                    sendEvent({ type: 'earcon', name: 'list_boundary' });
+                }
+            }
+
             /**
              * Handle keyboard navigation
              */
@@ -232,9 +395,15 @@ function(bngApi, $timeout, $document) {
                                38, 40, 37, 39, 9, 13, 27, 36, 35];
 
                 if (navKeys.indexOf(key) !== -1) {
+                    lastInputTime = Date.now();
+                    var focusedBefore = document.activeElement;
+
                     // Small delay to let the UI update first
                     $timeout(function() {
                         var activeElement = document.activeElement;
+                        if (activeElement === focusedBefore && isListKey(key)) {
+                            checkListBoundary();
+                        }
                         handleFocusChange(activeElement);
                     }, 50);
                 }
@@ -244,52 +413,194 @@ function(bngApi, $timeout, $document) {
                     $timeout(function() {
                         var menuContext = detectMenuContext();
                         if (!menuContext) {
+                            resetMenuSnapshot();
                             sendEvent({ type: 'menuClosed' });
                         }
                     }, 100);
                 }
             }
 
+            /**
+             * Cheap pre-filter run inside the observer callback - no selector matching,
+             * just attribute/class presence checks on the node itself
+             */
+            function isCandidateNode(node) {
+                if (node.nodeType !== Node.ELEMENT_NODE) return false;
+                return !!(node.className || node.hasAttribute('role'));
+            }
+
+            /**
+             * Number of queued nodes not yet classified
+             */
+            function pendingCount() {
+                return pendingNodes.length - pendingHead;
+            }
+
+            /**
+             * Remove and return the oldest queued node
+             */
+            function takePendingNode() {
+                var node = pendingNodes[pendingHead];
+                pendingNodes[pendingHead] = null;
+                pendingHead++;
+                if (pendingHead === pendingNodes.length) {
+                    pendingNodes = [];
+                    pendingHead = 0;
+                } else if (pendingHead * 2 >= pendingNodes.length) {
+                    pendingNodes = pendingNodes.slice(pendingHead);
+                    pendingHead = 0;
+                }
+                queuedNodes.delete(node);
+                return node;
+            }
+
+            /**
+             * Returns true if the node sits inside a dialog or menu announced in the same batch.
+             * insideCache (ancestor -> result) is shared by the nodes of one slice, so
+             * siblings under the same subtree do not walk its parent chain again.
+             */
+            function isInsideAnnounced(node, insideCache) {
+                var visited = [];
+                var inside = false;
+                var parent = node.parentElement;
+                while (parent && parent !== document.body) {
+                    var cached = insideCache.get(parent);
+                    if (cached !== undefined) {
+                        inside = cached;
+                        break;
+                    }
+                    if (batchRoots.has(parent)) {
+                        inside = true;
+                        break;
+                    }
+                    visited.push(parent);
+                    parent = parent.parentElement;
+                }
+                for (var i = 0; i < visited.length; i++) {
+                    insideCache.set(visited[i], inside);
+                }
+                return inside;
+            }
+
+            /**
+             * Classify a single candidate node as dialog or menu and send the matching event.
+             * Returns true if it was announced (and is now a batch root).
+             */
+            function classifyNode(node) {
+                if (!node.isConnected || !node.classList) return false;
+                var announced = false;
+
+                // Check if it's a dialog
+                if (node.classList.contains('modal') ||
+                    node.classList.contains('dialog') ||
+                    node.getAttribute('role') === 'dialog') {
+
+                    var title = node.querySelector('.modal-title, .dialog-title, h1, h2');
+                    var content = node.querySelector('.modal-body, .dialog-content, p');
+
+                    batchRoots.add(node);
+                    announced = true;
+                    sendEvent({
+                        type: 'dialog',
+                        title: title ? getElementText(title) : 'Dialog',
+                        content: content ? getElementText(content) : ''
+                    });
+                }
+
+                // Check if it's a menu
+                if (node.classList.contains('menu') ||
+                    node.getAttribute('role') === 'menu') {
+
+                    batchRoots.add(node);
+                    announced = true;
+                    sendEvent({
+                        type: 'menuOpened',
+                        name: getElementText(node) || 'Menu'
+                    });
+                }
+                return announced;
+            }
+
+            /**
+             * Idle-time classification of queued nodes, capped per slice
+             */
+            function processPendingNodes(deadline) {
+                idleHandle = null;
+
+                var processed = 0;
+                var insideCache = new Map();
+                while (pendingCount() > 0 && processed < config.maxNodesPerSlice) {
+                    if (deadline && deadline.timeRemaining && deadline.timeRemaining() <= 1) break;
+
+                    var node = takePendingNode();
+                    processed++;
+
+                    if (batchRoots.has(node) || isInsideAnnounced(node, insideCache)) continue;
+                    if (classifyNode(node)) {
+                        // Cached "not inside" answers below the new root are now wrong
+                        insideCache = new Map();
+                    }
+                }
+
+                if (pendingCount() > 0) {
+                    scheduleIdleProcessing();
+                } else {
+                    // Batch done - later insertions are checked on their own again
+                    batchRoots = new WeakSet();
+                }
+            }
+
+            /**
+             * Schedule classification for the next idle period
+             */
+            function scheduleIdleProcessing() {
+                if (idleHandle !== null) return;
+                if (window.requestIdleCallback) {
+                    idleHandle = window.requestIdleCallback(processPendingNodes, { timeout: config.idleTimeout });
+                } else {
+                    idleHandle = setTimeout(processPendingNodes, config.debounceTime);
+                }
+            }
+
+            /**
+             * Cancel scheduled idle classification
+             */
+            function cancelIdleProcessing() {
+                if (idleHandle === null) return;
+                if (window.cancelIdleCallback) {
+                    window.cancelIdleCallback(idleHandle);
+                } else {
+                    clearTimeout(idleHandle);
+                }
+                idleHandle = null;
+            }
+
             /**
              * Set up mutation observer for dynamic content
+             *
+             * The callback only enqueues candidate nodes; classification happens
+             * in processPendingNodes when the UI thread is idle.
              */
             function setupMutationObserver() {
                 var observer = new MutationObserver(function(mutations) {
-                    mutations.forEach(function(mutation) {
-                        // Check for dialog/modal appearances
-                        if (mutation.type === 'childList') {
-                            mutation.addedNodes.forEach(function(node) {
-                                if (node.nodeType === Node.ELEMENT_NODE) {
-                                    // Check if it's a dialog
-                                    if (node.classList &&
-                                        (node.classList.contains('modal') ||
-                                         node.classList.contains('dialog') ||
-                                         node.getAttribute('role') === 'dialog')) {
-
-                                        var title = node.querySelector('.modal-title, .dialog-title, h1, h2');
-                                        var content = node.querySelector('.modal-body, .dialog-content, p');
-
-                                        sendEvent({
-                                            type: 'dialog',
-                                            title: title ? getElementText(title) : 'Dialog',
-                                            content: content ? getElementText(content) : ''
-                                        });
-                                    }
-
-                                    // Check if it's a menu
-                                    if (node.classList &&
-                                        (node.classList.contains('menu') ||
-                                         node.getAttribute('role') === 'menu')) {
-
-                                        sendEvent({
-                                            type: 'menuOpened',
-                                            name: getElementText(node) || 'Menu'
-                                        });
-                                    }
-                                }
-                            });
+                    for (var i = 0; i < mutations.length; i++) {
+                        var addedNodes = mutations[i].addedNodes;
+                        for (var j = 0; j < addedNodes.length; j++) {
+                            var node = addedNodes[j];
+                            if (queuedNodes.has(node) || !isCandidateNode(node)) continue;
+
+                            // Drop the oldest entries if a level load floods the queue
+                            if (pendingCount() >= config.maxPendingNodes) {
+                                takePendingNode();
+                            }
+                            pendingNodes.push(node);
+                            queuedNodes.add(node);
                         }
-                    });
+                    }
+
+                    if (pendingCount() > 0) {
+                        scheduleIdleProcessing();
+                    }
                 });
 
                 observer.observe(document.body, {
@@ -315,6 +626,14 @@ function(bngApi, $timeout, $document) {
                 // Set up mutation observer
                 var observer = setupMutationObserver();
 
+                // Follow the extension's trace option
+                bngApi.engineLua('extensions.blindAccessibility.getConfig().trace', function(trace) {
+                    config.trace = !!trace;
+                });
+                scope.$on('BlindAccessibilityTrace', function(event, trace) {
+                    config.trace = !!trace;
+                });
+
                 // Start polling
                 pollUIState();
 
@@ -328,6 +647,10 @@ function(bngApi, $timeout, $document) {
 
                 // Cleanup on scope destroy
                 scope.$on('$destroy', function() {
+                    // Deliver anything still queued before shutting down
+                    cancelFlush();
+                    flushEvents();
+                    cancelIdleProcessing();
                     config.enabled = false;
                     document.removeEventListener('keydown', handleKeydown, true);
                     if (pollTimer) {